@@ -1 +1,2 @@
 from .user import UserSerializer
+from .token import LastLoginTokenObtainPairSerializer
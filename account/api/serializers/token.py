@@ -0,0 +1,16 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from account.repository.business_layer.manager import last_login_buffer
+
+
+class LastLoginTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Records the login in the `last_login` buffer instead of writing
+    it synchronously when `LAST_LOGIN_BUFFER['ENABLED']` is set.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if last_login_buffer.enabled:
+            last_login_buffer.record(self.user)
+        return data
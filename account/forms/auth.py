@@ -14,7 +14,7 @@ from painless.middlewares import get_request_ip
 
 
 User = get_user_model()
-logger = logging.getLogger('main')
+logger = logging.getLogger('auth')
 
 
 class CustomRegisterForm(forms.ModelForm):
@@ -58,7 +58,9 @@ class CustomRegisterForm(forms.ModelForm):
                 self.add_error('password', e)
 
         self._post_clean()
-        logger.debug(f'Registration failed for:{[*self.errors.keys()]} by {self.data.get("phone_number")}')
+        if self.errors:
+            logger.debug('Registration failed for: %s by %s',
+                         list(self.errors), self.data.get('phone_number'))
 
         return cleaned_data
 
@@ -69,8 +71,9 @@ class CustomRegisterForm(forms.ModelForm):
             self.instance.validate_unique(exclude=exclude)
 
         except ValidationError as e:
-            logger.info(
-                f'{self.data.get("phone_number")} tried to register again with ip address {get_request_ip(self.request)}')
+            logger.info('%s tried to register again with ip address %s',
+                        self.data.get('phone_number'),
+                        get_request_ip(self.request))
             self._update_errors(e)
 
     def save(self, commit=True):
@@ -79,7 +82,7 @@ class CustomRegisterForm(forms.ModelForm):
         user.set_password(self.cleaned_data["password"])
         if commit:
             user.save()
-            logger.info(f'{self.data.get("phone_number")} has been registered')
+            logger.info('%s has been registered', self.data.get('phone_number'))
 
         return user
 
@@ -98,16 +101,22 @@ class CustomAuthenticationForm(AuthenticationForm):
             self.user_cache = authenticate(self.request, username=username, password=password)
 
             if self.user_cache is None:
-                logger.warning(f'{self.data.get("username")} with ip of {get_request_ip(self.request)} failed to log in because of invalid password or username')
+                logger.warning('%s with ip of %s failed to log in because of '
+                               'invalid password or username',
+                               self.data.get('username'),
+                               get_request_ip(self.request))
                 raise self.get_invalid_login_error()
 
             elif not self.user_cache.is_active:
-                logger.warning(f'{self.data.get("username")} with ip of {get_request_ip(self.request)} failed to log in because of not being an ACTIVE user')
+                logger.warning('%s with ip of %s failed to log in because of '
+                               'not being an ACTIVE user',
+                               self.data.get('username'),
+                               get_request_ip(self.request))
                 raise self.get_invalid_login_error()
 
             else:
                 self.confirm_login_allowed(self.user_cache)
 
-            logger.info(f'{self.data.get("username")} logged in successfully')
+            logger.info('%s logged in successfully', self.data.get('username'))
 
         return self.cleaned_data
@@ -1,11 +1,25 @@
 import logging
+import secrets
+from functools import partial
 
 from django.core.management.base import BaseCommand
+from django.db import models
 
-from account.repository.generator_layer import AccountDataGenerator
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import generate_account_shard
+from painless.repository.passwords import get_password_pool
+from painless.repository.permutation import existing_phone_numbers
+from painless.repository.reset import reset_sequences
+from painless.repository.snapshot import dump_snapshot
+from painless.repository.shard import (
+    plan_shards,
+    run_shards
+)
 
 logger = logging.getLogger(__name__)
-DGL = AccountDataGenerator()
 
 
 class Command(BaseCommand):
@@ -13,6 +27,17 @@ class Command(BaseCommand):
 
     Generate data for Account app. It is usable
     for automatic and manual tests.
+
+    The users are split into shards of `--shard-size`, each generated from
+    a seed derived from `--seed` and loaded by one of `--workers`
+    processes. Rerunning with the same seed on the same starting data
+    gives the same rows, ids and `created` / `modified` timestamps
+    included, whatever the number of workers.
+
+    With `--passwords` the users get the hashes of a small pool of known
+    passwords (`GENERATED_PASSWORDS`), hashed once before the shards start,
+    so they can log in during load tests. The hashes are salted from the
+    seed, so they are reproducible too.
     """
     help = 'Generate data for Basket'
 
@@ -22,17 +47,86 @@ class Command(BaseCommand):
                             default=300,
                             help='Specify number of users to generate.'
                             )
+        parser.add_argument('--workers',
+                            type=int,
+                            default=1,
+                            help='Processes generating and loading shards '
+                                 'concurrently.'
+                            )
+        parser.add_argument('--seed',
+                            type=int,
+                            default=None,
+                            help='Seed of the dataset, random when omitted.'
+                            )
+        parser.add_argument('--shard-size',
+                            type=int,
+                            default=50000,
+                            help='Users per shard.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=5000,
+                            help='Rows per COPY / INSERT.'
+                            )
+        parser.add_argument('--passwords',
+                            action='store_true',
+                            help='Give the users usable passwords from the '
+                                 'pool of known test passwords.'
+                            )
+        parser.add_argument('--snapshot',
+                            default=None,
+                            help='Also dump the users and profiles to this '
+                                 'named snapshot.'
+                            )
 
     def handle(self, *args, **kwargs):
         total_users = kwargs['total_users']
-        self.stdout.write(self.style.WARNING('Prepare to generate data...'))
+        seed = kwargs['seed']
+        if seed is None:
+            seed = secrets.randbits(32)
+        self.stdout.write(self.style.WARNING(
+            f'Prepare to generate data with --seed {seed}...'
+        ))
+
+        password_pool = None
+        if kwargs['passwords']:
+            password_pool = get_password_pool(workers=kwargs['workers'],
+                                              seed=seed)
+            self.stdout.write(self.style.WARNING(
+                f'{len(password_pool.passwords)} passwords hashed, '
+                f'e.g. `{password_pool.passwords[0]}`.')
+            )
+
+        shards = plan_shards(total_users, kwargs['shard_size'], seed)
+        generate = partial(
+            generate_account_shard,
+            seed=seed,
+            # A shard skips the numbers already stored, so it may use up to
+            # that many permutation indexes beyond its size.
+            stride=kwargs['shard_size'] + len(existing_phone_numbers(User)),
+            user_first_id=self.next_id(User),
+            profile_first_id=self.next_id(Profile),
+            batch_size=kwargs['batch_size'],
+            password_pool=password_pool,
+        )
+        for shard in run_shards(generate, shards, kwargs['workers']):
+            logger.debug(f'Shard {shard.index} with {shard.count} users loaded.')
+        reset_sequences(User, Profile)
 
-        DGL.create_user(total_users)
         self.stdout.write(self.style.HTTP_NOT_MODIFIED(
             f'{total_users} Users have been generated by machine.')
         )
-        DGL.create_profile()
         self.stdout.write(self.style.HTTP_NOT_MODIFIED(
             f'{total_users} Profiles have been generated by machine.')
         )
+        if kwargs['snapshot']:
+            dump_snapshot(kwargs['snapshot'], [User, Profile], seed=seed)
+            self.stdout.write(self.style.HTTP_NOT_MODIFIED(
+                f'Snapshot `{kwargs["snapshot"]}` has been written.')
+            )
         self.stdout.write(self.style.SUCCESS('Data Generation finished'))
+
+    @staticmethod
+    def next_id(model):
+        last = model._base_manager.aggregate(last=models.Max('pk'))['last']
+        return (last or 0) + 1
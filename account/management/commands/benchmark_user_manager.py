@@ -0,0 +1,253 @@
+import inspect
+import io
+import json
+import os
+import subprocess
+
+from django.core.management import call_command
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import (
+    connections,
+    router
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.manager.base_manager import UserManager
+from painless.helper.benchmark import (
+    PeakMemory,
+    Stopwatch,
+    human_bytes
+)
+from painless.repository.orders import (
+    OrderHistoryGenerator,
+    OrderModels
+)
+from painless.repository.reset import reset_tables
+from painless.repository.snapshot import (
+    dump_snapshot,
+    load_snapshot,
+    snapshot_path
+)
+
+# Manager methods that write or build querysets rather than analyse users.
+SKIPPED_METHODS = ('create_user', 'create_superuser', 'get_queryset')
+
+
+def analytics_methods():
+    """Names of the analytics methods `UserManager` defines, in source order."""
+    return [
+        name for name, member in vars(UserManager).items()
+        if inspect.isfunction(member) and not name.startswith('_')
+        and name not in SKIPPED_METHODS
+    ]
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """UserManager Benchmark
+
+    For every dataset size, wipe the account (and order) tables, load a
+    seeded dataset (generated with `account_data_generator` and, when the
+    order apps are installed, `OrderHistoryGenerator`, or restored from a
+    snapshot with `--snapshots`), then run every analytics method of
+    `UserManager` and evaluate its queryset. Each method reports the best
+    wall time of `--repeat` runs, the queries issued, the rows returned and
+    the peak Python heap (measured in a separate run, since `tracemalloc`
+    slows the code down). Methods failing, e.g. because the order apps are
+    missing, are reported with their error.
+
+    The report is written as JSON to `--output`, with the commit and
+    database it was measured on, so two commits can be compared. The
+    tables are emptied first, so the command refuses to run without
+    `--yes`.
+    """
+    help = 'Benchmark every UserManager analytics method on generated datasets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes',
+                            type=int,
+                            nargs='+',
+                            default=[10000, 100000, 1000000],
+                            help='Users in each benchmarked dataset.'
+                            )
+        parser.add_argument('--seed',
+                            type=int,
+                            default=0,
+                            help='Seed of the datasets.'
+                            )
+        parser.add_argument('--workers',
+                            type=int,
+                            default=1,
+                            help='Processes generating the datasets.'
+                            )
+        parser.add_argument('--repeat',
+                            type=int,
+                            default=3,
+                            help='Timed runs per method; the best is reported.'
+                            )
+        parser.add_argument('--methods',
+                            nargs='+',
+                            default=None,
+                            help='Benchmark only these methods.'
+                            )
+        parser.add_argument('--brand',
+                            default='brand',
+                            help='Brand title passed to '
+                                 'get_users_who_bought_from_a_specific_brand.'
+                            )
+        parser.add_argument('--color',
+                            default='red',
+                            help='Color title passed to '
+                                 'get_users_who_have_made_several_purchases_'
+                                 'of_a_certain_color.'
+                            )
+        parser.add_argument('--status',
+                            default='delivered',
+                            help='Order status passed to get_order_status.'
+                            )
+        parser.add_argument('--snapshots',
+                            action='store_true',
+                            help='Restore each dataset from a snapshot, '
+                                 'dumping it on first use.'
+                            )
+        parser.add_argument('--output',
+                            default='user_manager_benchmark.json',
+                            help='Path of the JSON report.'
+                            )
+        parser.add_argument('--yes',
+                            action='store_true',
+                            help='Confirm that the account and order tables '
+                                 'may be emptied.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        if not kwargs['yes']:
+            raise CommandError('This benchmark empties the account and order '
+                               'tables, pass --yes.')
+        methods = kwargs['methods'] or analytics_methods()
+        unknown = set(methods) - set(analytics_methods())
+        if unknown:
+            raise CommandError(f'UserManager has no analytics method '
+                               f'{", ".join(sorted(unknown))}.')
+        arguments = {
+            'get_users_who_bought_from_a_specific_brand': {
+                'brand_title': kwargs['brand']
+            },
+            'get_users_who_have_made_several_purchases_of_a_certain_color': {
+                'color_title': kwargs['color']
+            },
+            'get_order_status': {'order_status': kwargs['status']},
+        }
+        try:
+            order_models = OrderModels.resolve(User)
+        except LookupError:
+            order_models = None
+            self.stdout.write(self.style.WARNING(
+                'Order apps are not installed; datasets hold users only.'
+            ))
+
+        report = {
+            'created': timezone.now().isoformat(),
+            'commit': current_commit(),
+            'database': connections[router.db_for_read(User)].vendor,
+            'seed': kwargs['seed'],
+            'repeat': kwargs['repeat'],
+            'results': list(),
+        }
+        for size in kwargs['sizes']:
+            with Stopwatch() as watch:
+                self.load_dataset(size, kwargs['seed'], kwargs['workers'],
+                                  order_models, kwargs['snapshots'])
+            self.stdout.write(self.style.WARNING(
+                f'{size} users loaded in {watch.elapsed:.1f}s'
+            ))
+            for name in methods:
+                result = self.measure(name, arguments.get(name, dict()),
+                                      kwargs['repeat'])
+                result['users'] = size
+                report['results'].append(result)
+                if 'error' in result:
+                    self.stdout.write(f'{size:>9} {name:<64} {result["error"]}')
+                else:
+                    self.stdout.write(
+                        f'{size:>9} {name:<64}'
+                        f' {result["seconds"] * 1000:10.1f} ms'
+                        f' {result["queries"]:>4} queries'
+                        f' {result["rows"]:>9} rows'
+                        f' {human_bytes(result["peak_memory"]):>9}'
+                    )
+
+        with open(kwargs['output'], 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+        self.stdout.write(self.style.SUCCESS(
+            f'Report written to {os.path.abspath(kwargs["output"])}.'
+        ))
+
+    @staticmethod
+    def dataset_models(order_models):
+        models = [User, Profile]
+        if order_models is not None:
+            models += [order_models.order, order_models.line,
+                       order_models.through]
+        return models
+
+    def load_dataset(self, size, seed, workers, order_models, snapshots):
+        models = self.dataset_models(order_models)
+        name = f'user-manager-{size}-{seed}'
+        if snapshots and os.path.exists(snapshot_path(name)):
+            load_snapshot(name, replace=True, cascade=True)
+            return
+        reset_tables(*models)
+        call_command(
+            'account_data_generator', total_users=size, seed=seed,
+            workers=workers, stdout=io.StringIO()
+        )
+        if order_models is not None:
+            OrderHistoryGenerator(seed=seed).create_order_history(
+                disable_progress_bar=True, models=order_models
+            )
+        if snapshots:
+            dump_snapshot(name, models, seed=seed)
+
+    @staticmethod
+    def measure(name, arguments, repeat):
+        method = getattr(User.objects, name)
+        connection = connections[router.db_for_read(User)]
+        result = {'method': name}
+        try:
+            timings = list()
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries, \
+                        Stopwatch() as watch:
+                    rows = len(list(method(**arguments)))
+                timings.append(watch.elapsed)
+            with PeakMemory() as memory:
+                list(method(**arguments))
+        except Exception as error:  # noqa: any failure is part of the report
+            result['error'] = f'{type(error).__name__}: {error}'
+            return result
+        result.update({
+            'seconds': min(timings),
+            'queries': len(queries),
+            'rows': rows,
+            'peak_memory': memory.peak,
+        })
+        return result
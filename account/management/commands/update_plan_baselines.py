@@ -0,0 +1,71 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import (
+    connections,
+    router
+)
+
+from account.models import User
+from account.repository.queryset.plans import (
+    PLAN_BASELINES_DIR,
+    load_plan_dataset,
+    plan_dataset_models,
+    user_queryset_plans
+)
+from painless.repository.explain import PlanBaselines
+from painless.repository.reset import reset_tables
+
+
+class Command(BaseCommand):
+    """Update Plan Baselines
+
+    Load the seeded plan dataset (the one `test_user_plans` loads) into
+    emptied tables and write the `EXPLAIN (FORMAT JSON)` plan shape of
+    every `UserQuerySet` method to `account/tests/querysets/plans`. Run it
+    on PostgreSQL after a deliberate query change and commit the
+    baselines. The account and order tables are emptied, so the command
+    refuses to run without `--yes`.
+    """
+    help = 'Rewrite the checked-in EXPLAIN plan baselines of UserQuerySet.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--methods',
+                            nargs='+',
+                            default=None,
+                            help='Update only these methods.'
+                            )
+        parser.add_argument('--yes',
+                            action='store_true',
+                            help='Confirm that the account and order tables '
+                                 'may be emptied.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        if connections[router.db_for_read(User)].vendor != 'postgresql':
+            raise CommandError('Plan baselines are taken on PostgreSQL only.')
+        if not kwargs['yes']:
+            raise CommandError('This command empties the account and order '
+                               'tables, pass --yes.')
+        self.stdout.write(self.style.WARNING('Loading the plan dataset...'))
+        models, _ = plan_dataset_models()
+        reset_tables(*models)
+        load_plan_dataset()
+
+        querysets, unavailable = user_queryset_plans(User.objects.all())
+        if kwargs['methods']:
+            unknown = set(kwargs['methods']) - set(querysets) - set(unavailable)
+            if unknown:
+                raise CommandError(f'UserQuerySet has no method '
+                                   f'{", ".join(sorted(unknown))}.')
+            querysets = {name: querysets[name] for name in kwargs['methods']
+                         if name in querysets}
+        for name in PlanBaselines(PLAN_BASELINES_DIR).update(querysets):
+            self.stdout.write(f'{name:<64} updated')
+        for name in unavailable:
+            self.stdout.write(f'{name:<64} skipped, its relations are not '
+                              f'installed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Baselines written to {PLAN_BASELINES_DIR}.'
+        ))
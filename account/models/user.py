@@ -2,6 +2,7 @@ import uuid
 from typing import List
 
 from django.db import models
+from django.core.mail import EmailMultiAlternatives
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import (
@@ -11,8 +12,12 @@ from django.core.validators import (
 )
 
 from account.repository.manager import UserManager
-from account.repository.business_layer.manager import AccountBusinessLogicLayer
+from account.repository.business_layer.manager import (
+    AccountBusinessLogicLayer,
+    otp_service
+)
 from painless.helper.enums import RegexPatternEnum
+from painless.services import queue_mail
 from painless.models import (
     TimeStampMixin,
     TruncateMixin
@@ -28,6 +33,8 @@ class User(AbstractUser, TimeStampMixin, TruncateMixin):
     username = None
     USERNAME_FIELD = 'phone_number'
     REQUIRED_FIELDS = list()
+    # Unique fields whose `get()` is served from the row cache.
+    CACHED_LOOKUPS = ('phone_number',)
     secret = models.UUIDField(
         default=uuid.uuid4,
         editable=False,
@@ -74,13 +81,35 @@ class User(AbstractUser, TimeStampMixin, TruncateMixin):
     def email_user(self, subject, message, from_email=None, **kwargs):
         '''
         Sends an email to this User.
+
+        The message is queued and delivered in the background over a
+        pooled connection. `html_message` adds an HTML alternative, other
+        keyword arguments go to `EmailMultiAlternatives`.
         '''
+        html_message = kwargs.pop('html_message', None)
+        mail = EmailMultiAlternatives(
+            subject, message, from_email, [self.email], **kwargs
+        )
+        if html_message:
+            mail.attach_alternative(html_message, 'text/html')
+        return queue_mail(mail)
 
-    def send_otp(self, subject, message, from_number, **kwargs):
+    def send_otp(self, ip_address=None):
         '''
-        Sends an sms to this User
+        Sends a one-time password by sms to this User.
+
+        The sms is queued and sent in the background; raises `BadRequest`
+        when too many codes were requested for this number or `ip_address`.
         '''
-        ...
+        otp_service.issue(self.phone_number, ip_address=ip_address)
+
+    def verify_otp(self, code):
+        '''
+        Checks and consumes a one-time password sent to this User.
+        '''
+        return otp_service.verify(self.phone_number, code)
+
+    objects = UserManager()
     dal = UserManager()
     bll = AccountBusinessLogicLayer()
 
@@ -1 +1,10 @@
 from .account import AccountBusinessLogicLayer
+from .last_login import (
+    LastLoginBuffer,
+    last_login_buffer,
+    buffer_last_login
+)
+from .otp import (
+    OTPService,
+    otp_service
+)
@@ -1,3 +1,6 @@
+from painless.middlewares import ip_blocklist
+
+
 class AccountBusinessLogicLayer:
     def is_logged_in(self) -> bool:
         """
@@ -34,11 +37,22 @@ class AccountBusinessLogicLayer:
         ...
 
     def block_ip(self,
-                 block_time: int = None):
+                 ip_address: str,
+                 block_time: int = None) -> None:
         """
         block IP for the `block_time` period
+
+        PARAMS
+        ------
+        `ip_address` : str
+            A single address or a CIDR network, e.g. `5.5.5.0/24`.
+        `block_time` : int
+            Seconds to keep the block, `None` keeps it until the cache is cleared.
+
+        The block is shared with the other worker processes through the
+        cache and checked by `GetIPMiddleware` in memory.
         """
-        ...
+        ip_blocklist.block(ip_address, ttl=block_time)
 
     def is_active(self,
                   user: 'User') -> bool:
@@ -0,0 +1,233 @@
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import (
+    connections,
+    router,
+    transaction
+)
+from django.db.models import (
+    Case,
+    When,
+    Value,
+    F,
+    Q,
+    DateTimeField
+)
+from django.utils import timezone
+
+from painless.repository.cache import invalidate_rows
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """
+    Collects `last_login` timestamps in memory and writes them to the
+    database in one bulk UPDATE per flush, instead of one UPDATE (and one
+    profile `post_save`) per login.
+
+    The buffer lives in the worker process. A daemon thread, started on the
+    first recorded login, flushes it every `FLUSH_INTERVAL` seconds, or
+    earlier when `MAX_PENDING` users are waiting. Pending timestamps are
+    flushed on interpreter shutdown, so the staleness window is at most
+    `FLUSH_INTERVAL` seconds.
+
+    Configured with the `LAST_LOGIN_BUFFER` setting:
+        ENABLED: bool
+            Route `user_logged_in` and JWT obtain through the buffer.
+        FLUSH_INTERVAL: int
+            Maximum seconds a timestamp stays in memory.
+        MAX_PENDING: int
+            Number of pending users that triggers an early flush.
+        BATCH_SIZE: int
+            Rows per UPDATE statement.
+    """
+
+    def __init__(self, flush_interval=None, max_pending=None, batch_size=None):
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._batch_size = batch_size
+        self._pending: Dict[int, datetime] = dict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'LAST_LOGIN_BUFFER', dict())
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.get('ENABLED', False)
+
+    @property
+    def flush_interval(self) -> float:
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return self.config.get('FLUSH_INTERVAL', 30)
+
+    @property
+    def max_pending(self) -> int:
+        if self._max_pending is not None:
+            return self._max_pending
+        return self.config.get('MAX_PENDING', 5000)
+
+    @property
+    def batch_size(self) -> int:
+        if self._batch_size is not None:
+            return self._batch_size
+        return self.config.get('BATCH_SIZE', 1000)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def record(self, user, timestamp: datetime = None) -> None:
+        """
+        Remember that `user` logged in at `timestamp` (default: now).
+
+        The in-memory `user.last_login` is updated immediately, the same way
+        Django's `update_last_login` does, so the current request sees the
+        new value.
+        """
+        timestamp = timestamp or timezone.now()
+        user.last_login = timestamp
+        with self._lock:
+            previous = self._pending.get(user.pk)
+            if previous is None or previous < timestamp:
+                self._pending[user.pk] = timestamp
+            size = len(self._pending)
+        self._ensure_worker()
+        if size >= self.max_pending:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write every pending timestamp and return the number of users updated.
+
+        On failure the timestamps are put back into the buffer, keeping the
+        newest value per user, so the next flush retries them.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, dict()
+        if not pending:
+            return 0
+        try:
+            self._write(pending)
+        except Exception:
+            logger.exception('Flushing %d last_login timestamps failed.',
+                             len(pending))
+            with self._lock:
+                for pk, timestamp in pending.items():
+                    current = self._pending.get(pk)
+                    if current is None or current < timestamp:
+                        self._pending[pk] = timestamp
+            return 0
+        logger.debug('Flushed %d last_login timestamps.', len(pending))
+        return len(pending)
+
+    def shutdown(self) -> None:
+        """Stop the flusher thread and write whatever is still pending."""
+        self._stopped.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval)
+        self._thread = None
+        self.flush()
+
+    def _ensure_worker(self) -> None:
+        # Started lazily and per process: a thread started before a
+        # pre-forking server forks its workers would not survive the fork.
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                name='last-login-flusher',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            self.flush()
+            # Only closes the connections opened by this thread.
+            connections.close_all()
+
+    def _write(self, pending: Dict[int, datetime]) -> None:
+        User = get_user_model()
+        using = router.db_for_write(User)
+        connection = connections[using]
+        rows = sorted(pending.items())
+        with transaction.atomic(using=using, savepoint=False):
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                if connection.vendor == 'postgresql':
+                    self._write_values(connection, User, batch)
+                else:
+                    self._write_case(using, User, batch)
+            invalidate_rows(User, pending)
+
+    @staticmethod
+    def _write_values(connection, User, batch) -> None:
+        """UPDATE ... FROM (VALUES ...) in a single statement."""
+        qn = connection.ops.quote_name
+        table = qn(User._meta.db_table)
+        pk = qn(User._meta.pk.column)
+        last_login = qn(User._meta.get_field('last_login').column)
+        values = ', '.join(['(%s, %s::timestamptz)'] * len(batch))
+        sql = (
+            f'UPDATE {table} AS t SET {last_login} = v.last_login '
+            f'FROM (VALUES {values}) AS v(pk, last_login) '
+            f'WHERE t.{pk} = v.pk '
+            f'AND (t.{last_login} IS NULL OR t.{last_login} < v.last_login)'
+        )
+        params = [value for row in batch for value in row]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    @staticmethod
+    def _write_case(using, User, batch) -> None:
+        """
+        Portable fallback: one UPDATE with a CASE over the primary keys,
+        keeping a newer `last_login` already stored.
+        """
+        User._base_manager.using(using) \
+            .filter(pk__in=[pk for pk, _ in batch]) \
+            .update(last_login=Case(
+                *[When(Q(pk=pk) & (Q(last_login__isnull=True) |
+                                   Q(last_login__lt=timestamp)),
+                       then=Value(timestamp))
+                  for pk, timestamp in batch],
+                default=F('last_login'),
+                output_field=DateTimeField()
+            ))
+
+
+last_login_buffer = LastLoginBuffer()
+atexit.register(last_login_buffer.shutdown)
+
+
+def buffer_last_login(sender, user, **kwargs):
+    """
+    `user_logged_in` receiver that replaces Django's `update_last_login`
+    when `LAST_LOGIN_BUFFER['ENABLED']` is set.
+    """
+    last_login_buffer.record(user)
@@ -0,0 +1,172 @@
+import hashlib
+import hmac
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from painless.api.exceptions import BadRequest
+from painless.services import send_sms
+
+# Counts a check of the code stored in hash KEYS[1] and consumes it when
+# its digest is ARGV[1]; deletes it after ARGV[2] failed checks. Returns 1
+# when the code matched.
+_VERIFY_SCRIPT = """
+local digest = redis.call('HGET', KEYS[1], 'digest')
+if not digest then
+    return 0
+end
+if digest == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return 1
+end
+if redis.call('HINCRBY', KEYS[1], 'attempts', 1) >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class OTPService:
+    """
+    Issue and verify one-time passwords sent by SMS.
+
+    Only an HMAC of the code is stored, in the cache, for `TTL` seconds,
+    together with the number of checks made, under one key. Issuance is
+    rate limited per phone number and per IP address, and a code is deleted
+    after `MAX_ATTEMPTS` failed checks. The SMS is queued for the
+    background sender, so `issue` never waits on the SMS provider.
+
+    Configured with the `OTP` setting:
+        LENGTH: int
+            Number of digits in a code.
+        TTL: int
+            Seconds a code stays valid.
+        NUMBER_RATE: (int, int)
+            At most `n` codes per phone number every `s` seconds.
+        IP_RATE: (int, int)
+            At most `n` codes per IP address every `s` seconds.
+        MAX_ATTEMPTS: int
+            Checks allowed per issued code.
+        MESSAGE: str
+            SMS body, formatted with `code`.
+        CACHE: str
+            Cache alias holding codes and counters.
+    """
+    key_prefix = 'otp'
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'OTP', dict())
+
+    @property
+    def cache(self):
+        return caches[self.config.get('CACHE', 'default')]
+
+    def issue(self, phone_number: str, ip_address: str = None) -> None:
+        """
+        Generate a code for `phone_number` and queue the SMS.
+
+        Raises `BadRequest` when the number or the IP address has asked for
+        too many codes.
+        """
+        number_rate = self.config.get('NUMBER_RATE', (3, 600))
+        self._throttle('number', phone_number, *number_rate)
+        if ip_address:
+            ip_rate = self.config.get('IP_RATE', (20, 3600))
+            self._throttle('ip', ip_address, *ip_rate)
+
+        length = self.config.get('LENGTH', 6)
+        code = f'{secrets.randbelow(10 ** length):0{length}d}'
+        key = self._code_key(phone_number)
+        digest = self._digest(phone_number, code)
+        ttl = self.config.get('TTL', 120)
+        client = self._redis_client()
+        if client is None:
+            self.cache.set(key, (digest, 0, time.time() + ttl), ttl)
+        else:
+            with client.pipeline() as pipeline:
+                key = self.cache.make_key(key)
+                pipeline.delete(key)
+                pipeline.hset(key, mapping={'digest': digest, 'attempts': 0})
+                pipeline.expire(key, ttl)
+                pipeline.execute()
+        message = self.config.get('MESSAGE', 'Your verification code is {code}')
+        send_sms(phone_number, message.format(code=code))
+
+    def verify(self, phone_number: str, code: str) -> bool:
+        """
+        Check `code` for `phone_number` and consume it when it matches.
+
+        Failed checks are counted; after `MAX_ATTEMPTS` of them the code is
+        deleted, so it cannot be guessed within its TTL. A matching code is
+        consumed by deleting it.
+
+        On Redis (django-redis) the count, the comparison and the delete
+        run in one Lua script: one round trip, and two concurrent checks
+        can neither both pass nor both be counted as one. The digests are
+        HMACs keyed with `SECRET_KEY`, so comparing them with `==` inside
+        the script reveals nothing about the code.
+
+        Other cache backends have no atomic read-modify-write: the stored
+        record is read, then rewritten with the new count or deleted, two
+        round trips. Only the call whose delete removed the code succeeds,
+        so a code is still consumed once, but concurrent failed checks may
+        be counted as one.
+        """
+        key = self._code_key(phone_number)
+        expected = self._digest(phone_number, str(code))
+        max_attempts = self.config.get('MAX_ATTEMPTS', 5)
+        client = self._redis_client()
+        if client is not None:
+            script = client.register_script(_VERIFY_SCRIPT)
+            return bool(script(keys=[self.cache.make_key(key)],
+                               args=[expected, max_attempts]))
+
+        stored = self.cache.get(key)
+        if stored is None:
+            return False
+        digest, attempts, expires_at = stored
+        if hmac.compare_digest(digest, expected):
+            return bool(self.cache.delete(key))
+        attempts += 1
+        if attempts >= max_attempts:
+            self.cache.delete(key)
+        else:
+            ttl = expires_at - time.time()
+            if ttl > 0:
+                self.cache.set(key, (digest, attempts, expires_at), ttl)
+        return False
+
+    def _increment(self, key: str, window: int) -> int:
+        self.cache.add(key, 0, window)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # The counter expired between `add` and `incr`.
+            self.cache.set(key, 1, window)
+            return 1
+
+    def _throttle(self, scope: str, value: str, limit: int, window: int) -> None:
+        count = self._increment(f'{self.key_prefix}:rate:{scope}:{value}', window)
+        if count > limit:
+            raise BadRequest(wait=window)
+
+    def _redis_client(self):
+        """Raw client of the OTP cache when it is django-redis, else None."""
+        if not type(self.cache).__module__.startswith('django_redis'):
+            return None
+        return self.cache.client.get_client(write=True)
+
+    def _code_key(self, phone_number: str) -> str:
+        return f'{self.key_prefix}:code:{phone_number}'
+
+    @staticmethod
+    def _digest(phone_number: str, code: str) -> str:
+        message = f'{phone_number}:{code}'.encode()
+        key = settings.SECRET_KEY.encode()
+        return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+otp_service = OTPService()
@@ -1,2 +1,5 @@
-from .account_data_generator import AccountDataGenerator
+from .account_data_generator import (
+    AccountDataGenerator,
+    generate_account_shard
+)
 from .demo_user_generator import UserDataGenerator
@@ -1,76 +1,266 @@
 import logging
+from datetime import (
+    datetime,
+    timedelta
+)
 
+from django.db import connections
+from django.utils import timezone
 from django.utils.text import slugify  # noqa
 
 from tqdm import tqdm
 
 from painless.repository.base import BaseDataGenerator
+from painless.repository.loader import BulkLoader
 from account.models import (User,
                             Profile, )
 
 logger = logging.getLogger(__name__)
 
+DATE_JOINED_RANGE = (
+    datetime(2020, 1, 1, tzinfo=timezone.utc),
+    datetime(2023, 1, 1, tzinfo=timezone.utc),
+)
+# Generated rows are last modified up to this long after they are created.
+MODIFIED_WITHIN = timedelta(days=30)
+
 
 class AccountDataGenerator(BaseDataGenerator):
     """
     Generates mock data for account.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, password_pool=None, **kwargs):
         super().__init__(*args, **kwargs)
+        # `PasswordPool` of the generated users' passwords; without one they
+        # get an unusable plain text password.
+        self.password_pool = password_pool
 
-    def create_user(self, total, batch_size=500, disable_progress_bar=True):
+    def load_users(self, total, batch_size=5000, disable_progress_bar=True,
+                   first_id=None):
         """
-        Generates users using fake data.
+        Generates users using fake data and streams them into the database
+        with `BulkLoader`, one batch of `batch_size` rows at a time.
+        Yields the ids of every written batch; nothing is written until the
+        result is iterated.
 
         PARAMS
         ------
         `total` : int
-            The number of Packs to create.
+            The number of Users to create.
         `batch_size` : int
             The number of objects to be added to the database in a batch.
+        `first_id` : int
+            Explicit id of the first user, the following users get the next
+            ids; by default ids come from the database sequence.
+
+        With a `password_pool` every user gets one of its hashes, picked by
+        phone number, and can log in with `password_pool.password_for`.
+        Users are `created` when they joined; `created` and `modified` are
+        drawn from the seed like every other column.
         """
-        phone_number_set = self.get_unique_phone_number_set(total, digits=13)
-        objs = (
-            User(
-                phone_number=phone_number_set.pop(),
-                email=self.get_random_email(),
-                first_name=self.get_random_first_name(),
-                last_name=self.get_random_last_name(),
-                # date_joined=self.get_random_time(),
-                is_active=self.get_random_boolean(),
-                is_staff=False,
-                is_superuser=False,
-                password=1,
-            ) for _ in tqdm(range(total), disable=disable_progress_bar)
+        loader = BulkLoader(User, batch_size=batch_size,
+                            keep=('created', 'modified'))
+        progress = tqdm(total=total, disable=disable_progress_bar)
+        created = 0
+        chunks = self.iter_unique_phone_numbers(
+            total, model=User, chunk_size=batch_size
         )
-        users = User.objects.bulk_create(objs=objs, batch_size=batch_size)
+        for phone_numbers in chunks:
+            count = len(phone_numbers)
+            ids = self._ids(first_id, created, count)
+            passwords = self._passwords(phone_numbers)
+            emails = self.get_random_email_batch(count)
+            first_names = self.get_random_first_name_batch(count)
+            last_names = self.get_random_last_name_batch(count)
+            actives = self.get_random_boolean_batch(count)
+            dates_joined = self.get_random_time_between_batch(
+                count, *DATE_JOINED_RANGE
+            )
+            secret_keys = self.get_random_uuid_batch(count)
+            columns = zip(
+                ids, phone_numbers, passwords, emails, first_names, last_names,
+                actives, dates_joined, secret_keys,
+                self._modified(dates_joined),
+            )
+            objs = (
+                User(
+                    pk=pk,
+                    phone_number=phone_number,
+                    email=email,
+                    first_name=first_name,
+                    last_name=last_name,
+                    date_joined=date_joined,
+                    is_active=is_active,
+                    is_staff=False,
+                    is_superuser=False,
+                    password=password,
+                    secret=secret,
+                    created=date_joined,
+                    modified=modified,
+                ) for (pk, phone_number, password, email, first_name,
+                       last_name, is_active, date_joined, secret, modified)
+                in columns
+            )
+            created += count
+            for pks in loader.load(objs):
+                progress.update(len(pks))
+                yield pks
+        progress.close()
         logger.debug(f'{total} User objects created successfully.')
+
+    def create_user(self, total, batch_size=5000, disable_progress_bar=True):
+        """
+        Generates users using fake data.
+
+        PARAMS
+        ------
+        `total` : int
+            The number of Users to create.
+        `batch_size` : int
+            The number of objects to be added to the database in a batch.
+        """
+        for _ in self.load_users(total, batch_size, disable_progress_bar):
+            pass
         users = User.objects.all()
         return users
 
-    def create_profile(self, batch_size=500, disable_progress_bar=False):
+    def create_profile(self, user_ids=None, batch_size=5000,
+                       disable_progress_bar=False, first_id=None):
         """
         Generates user profile using fake data, one for each user.
 
         PARAMS
         ------
+        `user_ids` : Iterable[int]
+            Ids of the users to create profiles for, by default every user
+            without a profile, streamed from the database.
         `batch_size` : int
             The number of objects to be added to the database in a batch.
+        `first_id` : int
+            Explicit id of the first profile, as in `load_users`.
+
+        `created` and `modified` are drawn from the seed, as in
+        `load_users`.
         """
-        users = tuple(User.objects.
-                      difference(User.objects.filter(profile__isnull=False)))
-        objs = (
-            Profile(
-                user=user,
-                national_code=self.get_random_number(1000000000, 9999999999),
-                nickname=self.get_random_first_name()[:10],
-                job=self.get_random_job(),
-                is_complete=self.get_random_boolean(),
-                gender=self.get_random_gender(),
-                birth_date=self.get_random_datetime(1980,2022),
-            ) for user in tqdm(users, disable=disable_progress_bar)
+        if user_ids is None:
+            user_ids = (
+                User.objects.filter(profile__isnull=True)
+                .values_list('pk', flat=True)
+                .iterator(chunk_size=batch_size)
+            )
+        loader = BulkLoader(Profile, batch_size=batch_size,
+                            keep=('created', 'modified'))
+        loader.write(
+            self._profiles(user_ids, batch_size, disable_progress_bar, first_id)
         )
-        profiles = Profile.objects.bulk_create(objs=objs, batch_size=batch_size)
         profiles = Profile.objects.all()
         return profiles
+
+    @staticmethod
+    def _ids(first_id, offset, count):
+        if first_id is None:
+            return [None] * count
+        return range(first_id + offset, first_id + offset + count)
+
+    def _modified(self, created):
+        seconds = self.get_random_number_batch(
+            len(created), 0, int(MODIFIED_WITHIN.total_seconds())
+        )
+        return [
+            when + timedelta(seconds=offset)
+            for when, offset in zip(created, seconds)
+        ]
+
+    def _passwords(self, phone_numbers):
+        if self.password_pool is None:
+            return [1] * len(phone_numbers)
+        return self.password_pool.hashes_for(phone_numbers)
+
+    def _profiles(self, user_ids, batch_size, disable_progress_bar, first_id):
+        user_ids = iter(user_ids)
+        created = 0
+        with tqdm(disable=disable_progress_bar) as progress:
+            while True:
+                batch = [
+                    user_id for _, user_id in zip(range(batch_size), user_ids)
+                ]
+                if not batch:
+                    return
+                total = len(batch)
+                created_at = self.get_random_time_between_batch(
+                    total, *DATE_JOINED_RANGE
+                )
+                columns = zip(
+                    self._ids(first_id, created, total),
+                    batch,
+                    self.get_random_number_batch(total, 1000000000, 9999999999),
+                    self.get_random_first_name_batch(total),
+                    self.get_random_job_batch(total),
+                    self.get_random_boolean_batch(total),
+                    self.get_random_gender_batch(total),
+                    self.get_random_datetime_batch(total, 1980, 2022),
+                    created_at,
+                    self._modified(created_at),
+                )
+                for (pk, user_id, national_code, nickname, job, is_complete,
+                     gender, birth_date, created_at, modified) in columns:
+                    yield Profile(
+                        pk=pk,
+                        user_id=user_id,
+                        national_code=national_code,
+                        nickname=nickname[:10],
+                        job=job,
+                        is_complete=is_complete,
+                        gender=gender,
+                        birth_date=birth_date,
+                        created=created_at,
+                        modified=modified,
+                    )
+                created += total
+                progress.update(total)
+
+
+def generate_account_shard(shard, seed, stride, user_first_id,
+                           profile_first_id, batch_size=5000,
+                           password_pool=None):
+    """
+    Generate and load the users and profiles of one `Shard` of a seeded
+    dataset; run by `account_data_generator --workers` in its own process.
+
+    Every shard draws its columns from its own seed, its phone numbers from
+    the dataset's permutation at index `shard.index * stride`, and its ids
+    from `first_id + shard.start`, so the rows do not depend on which
+    process runs the shard or when.
+
+    PARAMS
+    ------
+    shard: Shard
+        the slice of the dataset to generate.
+    seed: int
+        seed of the whole dataset, the phone number permutation key.
+    stride: int
+        permutation indexes reserved per shard.
+    user_first_id: int
+        id of the dataset's first user.
+    profile_first_id: int
+        id of the dataset's first profile.
+    password_pool: PasswordPool = None
+        hashed once by the caller and passed to every shard.
+    """
+    generator = AccountDataGenerator(seed=shard.seed, password_pool=password_pool)
+    generator.phone_number_key = seed
+    generator.phone_number_index = shard.index * stride
+    profile_id = profile_first_id + shard.start
+    try:
+        user_ids_batches = generator.load_users(
+            shard.count, batch_size, first_id=user_first_id + shard.start
+        )
+        for user_ids in user_ids_batches:
+            generator.create_profile(user_ids, batch_size,
+                                     disable_progress_bar=True,
+                                     first_id=profile_id)
+            profile_id += len(user_ids)
+    finally:
+        connections.close_all()
+    return shard
@@ -2,9 +2,10 @@ from django.contrib.auth.base_user import BaseUserManager
 from django.utils.translation import gettext_lazy as _
 
 from account.repository.queryset import UserQuerySet
+from painless.repository.cache import CachedManager
 
 
-class UserManager(BaseUserManager):
+class UserManager(CachedManager, BaseUserManager):
     use_in_migrations = True
 
     def _create_user(self, phone_number, password, **extra_fields):
@@ -0,0 +1,108 @@
+import inspect
+import os
+
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    FieldError
+)
+from django.db.models.constants import LOOKUP_SEP
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import AccountDataGenerator
+from account.repository.queryset.user import UserQuerySet
+from painless.repository.explain import analyze_tables
+from painless.repository.orders import (
+    OrderHistoryGenerator,
+    OrderModels
+)
+
+# Checked-in plan shapes of the `UserQuerySet` methods.
+PLAN_BASELINES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)
+    ))),
+    'tests', 'querysets', 'plans'
+)
+# Seeded dataset the plans are taken on; large enough for the planner to
+# prefer indexes on the user table.
+PLAN_DATASET_USERS = 20000
+PLAN_DATASET_SEED = 0
+PLAN_ARGUMENTS = {
+    'get_users_who_bought_from_a_specific_brand': {'brand_title': 'brand'},
+    'get_users_who_have_made_several_purchases_of_a_certain_color': {
+        'color_title': 'red'
+    },
+    'get_order_status': {'order_status': 'delivered'},
+}
+
+
+def plan_dataset_models():
+    """
+    The models of the plan dataset: users, profiles and, when installed,
+    orders.
+    """
+    models = [User, Profile]
+    try:
+        order_models = OrderModels.resolve(User)
+    except LookupError:
+        return models, None
+    models += [order_models.order, order_models.line, order_models.through]
+    return models, order_models
+
+
+def load_plan_dataset(
+        users: int = PLAN_DATASET_USERS, seed: int = PLAN_DATASET_SEED
+):
+    """
+    Generate the seeded users, profiles and, when the order apps are
+    installed, order history the plans are taken on into empty tables,
+    then refresh the planner statistics.
+    """
+    models, order_models = plan_dataset_models()
+    generator = AccountDataGenerator(seed=seed)
+    generator.create_user(users)
+    generator.create_profile(disable_progress_bar=True)
+    if order_models is not None:
+        OrderHistoryGenerator(seed=seed).create_order_history(
+            disable_progress_bar=True, models=order_models
+        )
+    analyze_tables(*models)
+
+
+def check_prefetches(queryset):
+    """
+    Raise `FieldDoesNotExist` when a `prefetch_related` lookup of
+    `queryset` crosses a relation that is not installed; Django only
+    notices once the queryset is evaluated.
+    """
+    for lookup in queryset._prefetch_related_lookups:
+        model = queryset.model
+        path = getattr(lookup, 'prefetch_through', lookup)
+        for name in path.split(LOOKUP_SEP):
+            model = model._meta.get_field(name).related_model
+            if model is None:
+                break
+
+
+def user_queryset_plans(queryset: UserQuerySet):
+    """
+    `{method name: queryset}` of every `UserQuerySet` method applied to
+    `queryset`, and the names of the methods whose relations are not
+    installed.
+    """
+    querysets = dict()
+    unavailable = list()
+    for name, member in vars(UserQuerySet).items():
+        if not inspect.isfunction(member) or name.startswith('_'):
+            continue
+        try:
+            arguments = PLAN_ARGUMENTS.get(name, dict())
+            querysets[name] = getattr(queryset, name)(**arguments)
+            check_prefetches(querysets[name])
+        except (FieldDoesNotExist, FieldError, LookupError):
+            querysets.pop(name, None)
+            unavailable.append(name)
+    return querysets, unavailable
@@ -13,8 +13,10 @@ from django.db.models import (
 
 from django.db.models.functions import Coalesce
 
+from painless.repository.cache import CachedQuerySet
 
-class UserQuerySet(QuerySet):
+
+class UserQuerySet(CachedQuerySet):
     def get_normal_users(self):
         """get normal users"""
         qs = self.filter(
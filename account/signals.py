@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
 from django.dispatch import receiver
 from django.db.models.signals import post_save
 
 from account.models import Profile
+from account.repository.business_layer.manager import buffer_last_login
 
 User = get_user_model()
 
@@ -13,3 +16,7 @@ def save_or_update_profile(sender, instance, **kwargs):
     instance.profile.save()
 
 
+if getattr(settings, 'LAST_LOGIN_BUFFER', dict()).get('ENABLED', False):
+    # Replace the synchronous UPDATE connected by `django.contrib.auth`.
+    user_logged_in.disconnect(dispatch_uid='update_last_login')
+    user_logged_in.connect(buffer_last_login, dispatch_uid='buffer_last_login')
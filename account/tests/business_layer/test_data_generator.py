@@ -0,0 +1,156 @@
+from datetime import datetime
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from painless.repository.base import (
+    STATUSES,
+    BaseDataGenerator
+)
+
+PROFITS = {
+    'rial_profit': (1.1, 1.2),
+    'toman_profit': (1.3, 1.4),
+    'usd_profit': (1.5, 1.6),
+}
+
+
+def _columns(generator):
+    """one call of every batch method the generators rely on"""
+    return (
+        generator.get_random_number_batch(5, 0, 9),
+        generator.get_random_choice_batch(5, 'abc', weights=(1, 2, 3)),
+        generator.get_random_float_batch(5, 1.0, 2.0),
+        generator.get_random_status_batch(5),
+        generator.get_currency_exchange_batch(
+            ['R', 'T', 'U'], [100, 200, 300], **PROFITS
+        ),
+        generator.get_random_time_between_batch(
+            5, datetime(2020, 1, 1, tzinfo=timezone.utc),
+            datetime(2021, 1, 1, tzinfo=timezone.utc)
+        ),
+        generator.get_random_uuid_batch(2),
+    )
+
+
+def _values(generator):
+    """one call of every single-value method drawn from `rng`"""
+    return (
+        generator.get_random_boolean(),
+        generator.get_random_float(1.0, 2.0),
+        generator.get_random_status(),
+        generator.get_random_gender(),
+        generator.get_voucher_kind(),
+        generator.get_voucher_type(),
+        generator.get_random_percentage(),
+        generator.get_currency_exchange('U', 100, **PROFITS),
+        sorted(generator.get_random_population(list(range(10)), 3)[0]),
+        generator.get_random_time_between_two_datetime_objects(
+            datetime(2020, 1, 1, tzinfo=timezone.utc),
+            datetime(2021, 1, 1, tzinfo=timezone.utc)
+        ),
+    )
+
+
+@override_settings(LANGUAGE_CODE='en')
+class BaseDataGeneratorTest(SimpleTestCase):
+    """
+    Test whether `BaseDataGenerator` draws reproducible values in range.
+    ------
+
+    - testing that the same seed gives the same batch columns
+    - testing that single values are drawn from the seeded generator too
+    - testing that `get_random_number_batch` includes both endpoints
+    - testing that `get_random_choice_batch` follows its weights
+    - testing that `get_currency_exchange_batch` applies the profit ranges
+    """
+
+    def test_seeded_batches(self):
+        """testing the batch columns of two generators of one seed"""
+
+        columns = _columns(BaseDataGenerator(seed=3))
+        actual = (
+            _columns(BaseDataGenerator(seed=3)) == columns,
+            _columns(BaseDataGenerator(seed=4)) == columns,
+        )
+        expected = (True, False)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (same seed, other seed) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_seeded_values(self):
+        """testing the single values of two generators of one seed"""
+
+        values = _values(BaseDataGenerator(seed=3))
+        actual = (
+            _values(BaseDataGenerator(seed=3)) == values,
+            values[2] in STATUSES,
+        )
+        expected = (True, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (same seed, status known) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_number_batch_endpoints(self):
+        """testing that start and stop are both drawn"""
+
+        generator = BaseDataGenerator(seed=0)
+        percentages = generator.get_random_percentage_batch(5000)
+        actual = (
+            set(generator.get_random_number_batch(1000, 0, 1)),
+            generator.get_random_number_batch(3, 5, 5),
+            set(percentages) == set(range(1, 101)),
+        )
+        expected = ({0, 1}, [5, 5, 5], True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (0-1 values, 5-5 values, every percentage) is "
+            f"`{actual}` but expected is `{expected}`"
+            )
+
+    def test_choice_batch_weights(self):
+        """testing that a weight of zero is never drawn and ratios hold"""
+
+        values = BaseDataGenerator(seed=0).get_random_choice_batch(
+            4000, ('a', 'b', 'c'), weights=(0, 1, 3)
+        )
+        ratio = values.count('c') / values.count('b')
+        actual = (values.count('a'), 2.7 < ratio < 3.3)
+        expected = (0, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (a drawn, c/b near 3) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_currency_exchange_batch(self):
+        """testing the range and type of every currency"""
+
+        targets = BaseDataGenerator(seed=0).get_currency_exchange_batch(
+            ['R', 'T', 'U'] * 100, [100, 200, '300'] * 100, **PROFITS
+        )
+        rial, toman, usd = targets[0::3], targets[1::3], targets[2::3]
+        actual = (
+            all(isinstance(value, int) and 110 <= value <= 120
+                for value in rial),
+            all(isinstance(value, int) and 260 <= value <= 280
+                for value in toman),
+            all(isinstance(value, float) and 450 <= value <= 480
+                and round(value, 2) == value for value in usd),
+        )
+        expected = (True, True, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (rial, toman, usd in range) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
@@ -0,0 +1,146 @@
+import io
+import struct
+
+from PIL import Image
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from painless.helper.image import (
+    ImageHeader,
+    read_image_header
+)
+
+
+def encode(fmt, size=(37, 21), mode='RGB', **params):
+    """A real `fmt` file of `size` written by Pillow."""
+    buffer = io.BytesIO()
+    Image.new(mode, size).save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def os2_bmp(width, height):
+    """A BMP with the 12 bytes OS/2 core header, which Pillow does not write."""
+    info = struct.pack('<IHHHH', 12, width, height, 1, 24)
+    return b'BM' + struct.pack('<IHHI', 26 + 3, 0, 0, 26) + info + b'\x00\x00\x00'
+
+
+def read(data):
+    return read_image_header(io.BytesIO(data))
+
+
+@override_settings(LANGUAGE_CODE='en')
+class ReadImageHeaderTest(SimpleTestCase):
+    """
+    Test read_image_header that should identify images from their first bytes
+    ------
+
+    - testing every supported format and header variant
+    - testing truncated headers
+    - testing corrupt and unknown input
+    - testing that the file position is restored
+    """
+
+    def test_formats(self):
+        """testing the format and dimensions of every supported header"""
+        fixtures = {
+            'PNG': encode('PNG'),
+            'GIF': encode('GIF'),
+            'JPEG': encode('JPEG'),
+            'progressive JPEG': encode('JPEG', progressive=True),
+            'JPEG with a large EXIF segment': encode(
+                'JPEG', exif=b'Exif\x00\x00' + b'\x00' * 60000
+            ),
+            'lossy WebP (VP8)': encode('WEBP'),
+            'lossless WebP (VP8L)': encode('WEBP', lossless=True),
+            'extended WebP (VP8X)': encode(
+                'WEBP', mode='RGBA', exif=b'Exif\x00\x00'
+            ),
+            'BMP': encode('BMP'),
+            'top-down BMP': (
+                encode('BMP')[:22] + struct.pack('<i', -21) + encode('BMP')[26:]
+            ),
+        }
+        actual = {name: read(data) for name, data in fixtures.items()}
+        actual['OS/2 BMP'] = read(os2_bmp(37, 21))
+        expected = {
+            'PNG': ImageHeader('PNG', 37, 21),
+            'GIF': ImageHeader('GIF', 37, 21),
+            'JPEG': ImageHeader('JPEG', 37, 21),
+            'progressive JPEG': ImageHeader('JPEG', 37, 21),
+            'JPEG with a large EXIF segment': ImageHeader('JPEG', 37, 21),
+            'lossy WebP (VP8)': ImageHeader('WEBP', 37, 21),
+            'lossless WebP (VP8L)': ImageHeader('WEBP', 37, 21),
+            'extended WebP (VP8X)': ImageHeader('WEBP', 37, 21),
+            'BMP': ImageHeader('BMP', 37, 21),
+            'top-down BMP': ImageHeader('BMP', 37, 21),
+            'OS/2 BMP': ImageHeader('BMP', 37, 21),
+        }
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual headers are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_truncated(self):
+        """testing that every format cut inside its header is not recognised"""
+        fixtures = {
+            'PNG': encode('PNG')[:20],
+            'GIF': encode('GIF')[:8],
+            'JPEG': encode('JPEG')[:100],
+            'JPEG inside a marker': b'\xff\xd8\xff',
+            'lossy WebP (VP8)': encode('WEBP')[:28],
+            'lossless WebP (VP8L)': encode('WEBP', lossless=True)[:22],
+            'extended WebP (VP8X)': encode(
+                'WEBP', mode='RGBA', exif=b'Exif\x00\x00'
+            )[:28],
+            'BMP': encode('BMP')[:24],
+            'empty': b'',
+        }
+        actual = {name: read(data) for name, data in fixtures.items()}
+        expected = dict.fromkeys(fixtures)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual headers are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_corrupt(self):
+        """testing corrupt headers and formats that are not supported"""
+        jpeg = encode('JPEG')
+        png = encode('PNG')
+        fixtures = {
+            'JPEG with garbage after SOI': b'\xff\xd8' + b'\x00' * 64,
+            'JPEG without a frame header': b'\xff\xd8\xff\xd9',
+            'PNG without IHDR': png[:12] + b'IDAT' + png[16:],
+            'WebP with an unknown chunk': (
+                b'RIFF\x00\x00\x00\x00WEBPVP9 ' + b'\x00' * 16
+            ),
+            'WebP VP8 without its start code': (
+                encode('WEBP')[:23] + b'\x00\x00\x00' + encode('WEBP')[26:]
+            ),
+            'TIFF': encode('TIFF'),
+            'text': b'not an image at all, just some text',
+            'JPEG tail only': jpeg[2:],
+        }
+        actual = {name: read(data) for name, data in fixtures.items()}
+        expected = dict.fromkeys(fixtures)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual headers are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_position_is_restored(self):
+        """testing that reading the header does not move the file"""
+        file = io.BytesIO(encode('JPEG'))
+        file.seek(7)
+        header = read_image_header(file)
+
+        actual = (header, file.tell())
+        expected = (ImageHeader('JPEG', 37, 21), 7)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (header, position) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
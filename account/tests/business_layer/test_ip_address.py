@@ -0,0 +1,187 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase
+)
+from django.test.utils import override_settings
+
+from painless.helper.cidr import CIDRTrie
+from painless.middlewares import (
+    GetIPMiddleware,
+    get_request_ip,
+    trusted_proxies
+)
+from painless.middlewares.ip_address import _SharedCIDRTrie
+
+
+class CIDRTrieTest(SimpleTestCase):
+    """
+    Test CIDRTrie that should match addresses against stored networks
+    ------
+
+    - testing prefix matching for IPv4 and IPv6
+    - testing that IPv4-mapped IPv6 addresses match IPv4 networks
+    - testing that expired networks stop matching
+    """
+
+    def test_prefix_matching(self):
+        """testing addresses inside and outside the stored networks"""
+        trie = CIDRTrie()
+        trie.add('10.0.0.0/8')
+        trie.add('192.168.1.7')
+        trie.add('2001:db8::/32')
+
+        actual = [
+            trie.match(address) for address in (
+                '10.255.0.1', '11.0.0.1', '192.168.1.7', '192.168.1.8',
+                '2001:db8::1', '2001:db9::1', 'not an address',
+            )
+        ]
+        expected = [True, False, True, False, True, False, False]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual matches are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_ipv4_mapped_ipv6(self):
+        """testing that ::ffff:a.b.c.d is looked up as a.b.c.d"""
+        trie = CIDRTrie()
+        trie.add('5.5.5.0/24')
+
+        actual = (trie.match('::ffff:5.5.5.9'), trie.match('::ffff:5.5.6.9'))
+        expected = (True, False)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual matches are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_expiry(self):
+        """testing that a network stops matching once its ttl passed"""
+        trie = CIDRTrie()
+        with mock.patch('painless.helper.cidr.time.time', return_value=1000.0):
+            trie.add('5.5.5.5', ttl=60)
+            trie.add('6.6.6.6')
+        with mock.patch('painless.helper.cidr.time.time', return_value=1059.0):
+            before = (trie.match('5.5.5.5'), trie.match('6.6.6.6'))
+        with mock.patch('painless.helper.cidr.time.time', return_value=1061.0):
+            after = (trie.match('5.5.5.5'), trie.match('6.6.6.6'))
+
+        actual = (before, after)
+        expected = ((True, True), (False, True))
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (before, after) matches are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    },
+)
+class GetIPMiddlewareTest(SimpleTestCase):
+    """
+    Test GetIPMiddleware that should resolve the client IP and refuse blocked
+    networks
+    ------
+
+    - testing that X-Forwarded-For is walked through trusted proxies only
+    - testing that headers sent by untrusted peers are ignored
+    - testing that a block reaches the other worker processes
+    - testing that a cache outage keeps the last blocklist
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        trusted_proxies.load().add('10.0.0.0/8')
+
+    def tearDown(self):
+        trusted_proxies.remove('10.0.0.0/8')
+
+    def resolve(self, remote_addr, forwarded_for=None):
+        extra = {'REMOTE_ADDR': remote_addr}
+        if forwarded_for is not None:
+            extra['HTTP_X_FORWARDED_FOR'] = forwarded_for
+        return get_request_ip(self.factory.get('/', **extra))
+
+    def test_trusted_proxies_are_walked(self):
+        """testing that the first untrusted hop from the right is the client"""
+        actual = (
+            self.resolve('127.0.0.1', '7.7.7.7'),
+            self.resolve('127.0.0.1', '7.7.7.7, 10.0.0.2, 10.0.0.3'),
+            self.resolve('127.0.0.1', '1.1.1.1, 7.7.7.7, 10.0.0.2'),
+            self.resolve('127.0.0.1', 'garbage, 10.0.0.2'),
+        )
+        expected = ('7.7.7.7', '7.7.7.7', '7.7.7.7', '10.0.0.2')
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual client addresses are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_spoofed_header_is_ignored(self):
+        """testing that an untrusted peer cannot choose its address"""
+        actual = (
+            self.resolve('8.8.8.8', '1.2.3.4'),
+            self.resolve('8.8.8.8', '1.2.3.4, 10.0.0.2'),
+            self.resolve('8.8.8.8'),
+        )
+        expected = ('8.8.8.8', '8.8.8.8', '8.8.8.8')
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual client addresses are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_block_reaches_other_workers(self):
+        """testing that a block made in one process is refused by another"""
+        worker_one = _SharedCIDRTrie('IP_BLOCKLIST', sync_interval=0)
+        worker_two = _SharedCIDRTrie('IP_BLOCKLIST', sync_interval=0)
+        worker_one.block('9.9.9.0/24', ttl=60)
+        worker_two.sync()
+
+        with mock.patch('painless.middlewares.ip_address.ip_blocklist',
+                        worker_two):
+            middleware = GetIPMiddleware(lambda request: HttpResponse())
+            blocked = middleware(self.factory.get('/', REMOTE_ADDR='9.9.9.9'))
+            allowed = middleware(self.factory.get('/', REMOTE_ADDR='9.9.8.9'))
+
+        actual = (blocked.status_code, allowed.status_code)
+        expected = (403, 200)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual status codes are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_cache_outage(self):
+        """testing that a failing cache read keeps the trie and the request"""
+        worker = _SharedCIDRTrie('IP_BLOCKLIST', sync_interval=0)
+        worker.block('9.9.9.0/24', ttl=60)
+
+        with mock.patch('painless.middlewares.ip_address.ip_blocklist',
+                        worker), \
+                mock.patch.object(cache, 'get',
+                                  side_effect=ConnectionError('down')), \
+                self.assertLogs('painless.middlewares.ip_address', 'ERROR'):
+            middleware = GetIPMiddleware(lambda request: HttpResponse())
+            blocked = middleware(self.factory.get('/', REMOTE_ADDR='9.9.9.9'))
+            allowed = middleware(self.factory.get('/', REMOTE_ADDR='9.9.8.9'))
+
+        actual = (blocked.status_code, allowed.status_code)
+        expected = (403, 200)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual status codes are `{actual}` but expected is `{expected}`"
+        )
@@ -0,0 +1,180 @@
+from datetime import (
+    date,
+    datetime
+)
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from khayyam import JalaliDatetime
+
+from painless.helper.jalali import (
+    SolarCache,
+    to_solar,
+    to_solar_batch
+)
+
+
+def khayyam(value, fmt='%d %B %Y'):
+    return JalaliDatetime(value).strftime(fmt)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class SolarCacheTest(SimpleTestCase):
+    """
+    Test SolarCache that should render each calendar day once per format
+    ------
+
+    - testing that the output is the one of khayyam
+    - testing that the datetimes of a day share one entry
+    - testing that formats with time directives are not cached
+    - testing that the least recently used entry is evicted
+    """
+
+    def setUp(self):
+        self.cache = SolarCache(maxsize=2)
+
+    def test_output(self):
+        """testing dates and datetimes against khayyam"""
+        values = (
+            date(2023, 3, 21), datetime(2020, 12, 31, 23, 59), date(1999, 1, 1)
+        )
+
+        actual = [self.cache.render(value, '%d %B %Y') for value in values]
+        expected = [khayyam(value) for value in values]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual rendered dates are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_same_day(self):
+        """testing that the times of one day are rendered once"""
+        for hour in (0, 12, 23):
+            self.cache.render(datetime(2023, 3, 21, hour), '%Y/%m/%d')
+        self.cache.render(date(2023, 3, 21), '%Y/%m/%d')
+
+        actual = (self.cache.stats(), self.cache.is_cacheable('%Y/%m/%d'))
+        expected = ({'size': 1, 'hits': 3, 'misses': 1}, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (stats, cacheable) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_time_format(self):
+        """testing that a format with time directives is not cached"""
+        morning = datetime(2023, 3, 21, 8, 30)
+        evening = datetime(2023, 3, 21, 20, 15)
+        fmt = '%Y/%m/%d %H:%M'
+
+        actual = (
+            self.cache.render(morning, fmt),
+            self.cache.render(evening, fmt),
+            self.cache.is_cacheable(fmt),
+            len(self.cache),
+        )
+        expected = (khayyam(morning, fmt), khayyam(evening, fmt), False, 0)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (morning, evening, cacheable, size) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_eviction(self):
+        """testing that the cache keeps the most recently used days"""
+        first, second, third = (date(2023, 1, day) for day in (1, 2, 3))
+        for value in (first, second, first, third, first):
+            self.cache.render(value, '%d %B %Y')
+
+        actual = (len(self.cache), self.cache.stats())
+        expected = (2, {'size': 2, 'hits': 2, 'misses': 3})
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (size, stats) is `{actual}` but expected is `{expected}`"
+        )
+        self.cache.render(second, '%d %B %Y')
+        actual = self.cache.stats()['misses']
+        expected = 4
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual misses are `{actual}` but expected is `{expected}`"
+        )
+
+
+@override_settings(LANGUAGE_CODE='en')
+class ToSolarTest(SimpleTestCase):
+    """
+    Test to_solar and to_solar_batch that should render dates as Jalali strings
+    ------
+
+    - testing that `None` is returned as `None`
+    - testing that a column is rendered like row by row
+    - testing that a column converts each day once
+    """
+
+    def setUp(self):
+        patcher = mock.patch('painless.helper.jalali.solar_cache', SolarCache())
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_none(self):
+        """testing that None stays None with cached and uncached formats"""
+        actual = (
+            to_solar(None),
+            to_solar(None, '%H:%M'),
+            to_solar_batch([None, None]),
+            to_solar_batch([None], '%H:%M'),
+            to_solar_batch([]),
+        )
+        expected = (None, None, [None, None], [None], [])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual results are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_batch(self):
+        """testing a column with None against rendering every row"""
+        values = [
+            datetime(2023, 3, 21, 8), None, date(2023, 3, 21),
+            datetime(2022, 6, 1, 17, 45), None,
+        ]
+
+        actual = (
+            to_solar_batch(values),
+            to_solar_batch(values, '%Y/%m/%d %H:%M'),
+            to_solar_batch(iter(values), '%A %d %B'),
+        )
+        expected = (
+            [to_solar(value) for value in values],
+            [None if value is None else khayyam(value, '%Y/%m/%d %H:%M')
+             for value in values],
+            [None if value is None else khayyam(value, '%A %d %B')
+             for value in values],
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual columns are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_batch_converts_each_day_once(self):
+        """testing that the rows of one day reach the cache once"""
+        values = [datetime(2023, 3, 21, hour) for hour in range(24)]
+        values += [date(2023, 3, 22)] * 10 + [None] * 5
+
+        to_solar_batch(values)
+        actual = self.cache.stats()
+        expected = {'size': 2, 'hits': 0, 'misses': 2}
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual cache stats are `{actual}` "
+            f"but expected is `{expected}`"
+        )
@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from account.models import User
+from account.repository.business_layer.manager import LastLoginBuffer
+
+
+@override_settings(LANGUAGE_CODE='en')
+class LastLoginBufferTest(TestCase):
+    """
+    Test LastLoginBuffer that should defer `last_login` writes
+    ------
+
+    - testing that nothing is written before `flush`
+    - testing that one flush writes every pending user
+    - testing that the newest timestamp wins
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(LastLoginBufferTest, cls).setUpClass()
+
+        cls.user_one = User.objects.create(phone_number='09120000001')
+        cls.user_two = User.objects.create(phone_number='09120000002')
+
+    def setUp(self):
+        # A long interval keeps the background thread from flushing
+        # while the test inspects the buffer.
+        self.buffer = LastLoginBuffer(flush_interval=3600)
+
+    def tearDown(self):
+        self.buffer.shutdown()
+
+    def test_record_is_deferred(self):
+        """testing that recording a login does not touch the database"""
+        self.buffer.record(self.user_one)
+
+        actual = User.objects.get(pk=self.user_one.pk).last_login
+        expected = None
+        self.assertIs(
+            actual,
+            expected,
+            msg=f"Actual last_login is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+        self.assertEqual(len(self.buffer), 1)
+
+    def test_flush_writes_all_pending(self):
+        """testing that one flush writes every pending user"""
+        now = timezone.now()
+        self.buffer.record(self.user_one, now)
+        self.buffer.record(self.user_two, now)
+
+        with self.assertNumQueries(1):
+            flushed = self.buffer.flush()
+
+        self.assertEqual(flushed, 2)
+        self.assertEqual(len(self.buffer), 0)
+        actual = list(
+            User.objects.filter(pk__in=[self.user_one.pk, self.user_two.pk])
+            .values_list('last_login', flat=True)
+        )
+        expected = [now, now]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual last_login values are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_newest_timestamp_wins(self):
+        """testing that an older login does not overwrite a newer one"""
+        now = timezone.now()
+        self.buffer.record(self.user_one, now)
+        self.buffer.record(self.user_one, now - timedelta(minutes=5))
+        self.buffer.flush()
+
+        actual = User.objects.get(pk=self.user_one.pk).last_login
+        expected = now
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual last_login is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_stored_newer_timestamp_wins(self):
+        """testing that a flush does not overwrite a newer stored last_login"""
+        now = timezone.now()
+        User.objects.filter(pk=self.user_two.pk).update(last_login=now)
+        self.buffer.record(self.user_two, now - timedelta(minutes=5))
+        self.buffer.flush()
+
+        actual = User.objects.get(pk=self.user_two.pk).last_login
+        expected = now
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual last_login is `{actual}` "
+            f"but expected is `{expected}`"
+        )
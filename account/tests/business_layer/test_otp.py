@@ -0,0 +1,101 @@
+import re
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import User
+from account.repository.business_layer.manager import otp_service
+from painless.api.exceptions import BadRequest
+from painless.services import sms
+from painless.services import sms_sender
+
+
+@override_settings(
+    LANGUAGE_CODE='en',
+    SMS_TRANSPORT='painless.services.sms.LocMemSMSTransport',
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    },
+    OTP={'NUMBER_RATE': (2, 600), 'IP_RATE': (3, 600), 'MAX_ATTEMPTS': 3},
+)
+class OTPServiceTest(TestCase):
+    """
+    Test OTP issuance and verification that should work properly
+    ------
+
+    - testing that the code is sent by sms and verified once
+    - testing that only a hash of the code is stored
+    - testing the per-number and per-ip rate limits
+    - testing that failed checks are limited and a code is consumed once
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(OTPServiceTest, cls).setUpClass()
+
+        cls.user_one = User.objects.create(phone_number='09120000011')
+        cls.user_two = User.objects.create(phone_number='09120000012')
+
+    def setUp(self):
+        cache.clear()
+        sms.outbox.clear()
+
+    def get_sent_code(self):
+        sms_sender.flush()
+        return re.search(r'\d{6}', sms.outbox[-1].body).group()
+
+    def test_send_and_verify(self):
+        """testing that a sent code verifies exactly once"""
+        self.user_one.send_otp()
+        code = self.get_sent_code()
+
+        self.assertEqual(sms.outbox[-1].to, self.user_one.phone_number)
+        self.assertFalse(self.user_two.verify_otp(code))
+        self.assertTrue(self.user_one.verify_otp(code))
+        self.assertFalse(self.user_one.verify_otp(code))
+
+    def test_code_is_not_stored_in_clear(self):
+        """testing that the cache holds a digest, not the code"""
+        self.user_one.send_otp()
+        code = self.get_sent_code()
+
+        stored = cache.get(f'otp:code:{self.user_one.phone_number}')
+        self.assertNotIn(code, str(stored))
+
+    def test_number_rate_limit(self):
+        """testing that a number cannot request more than its rate"""
+        self.user_one.send_otp()
+        self.user_one.send_otp()
+        with self.assertRaises(BadRequest):
+            self.user_one.send_otp()
+
+    def test_ip_rate_limit(self):
+        """testing that an ip cannot request more than its rate"""
+        self.user_one.send_otp(ip_address='5.5.5.5')
+        self.user_one.send_otp(ip_address='5.5.5.5')
+        self.user_two.send_otp(ip_address='5.5.5.5')
+        with self.assertRaises(BadRequest):
+            self.user_two.send_otp(ip_address='5.5.5.5')
+
+    def test_attempts_are_limited(self):
+        """testing that the code is deleted after too many failed checks"""
+        self.user_one.send_otp()
+        code = self.get_sent_code()
+        wrong = f'{(int(code) + 1) % 10 ** 6:06d}'
+
+        for _ in range(3):
+            self.assertFalse(self.user_one.verify_otp(wrong))
+        self.assertFalse(self.user_one.verify_otp(code))
+        self.assertIsNone(cache.get(f'otp:code:{self.user_one.phone_number}'))
+
+    def test_code_is_consumed_once(self):
+        """testing that a code deleted by a concurrent check is not verified"""
+        self.user_one.send_otp()
+        code = self.get_sent_code()
+        stored = cache.get(f'otp:code:{self.user_one.phone_number}')
+
+        self.assertTrue(self.user_one.verify_otp(code))
+        # A second check that read the digest before the first deleted it.
+        with mock.patch.object(otp_service.cache, 'get', return_value=stored):
+            self.assertFalse(self.user_one.verify_otp(code))
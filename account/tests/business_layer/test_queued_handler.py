@@ -0,0 +1,177 @@
+import io
+import logging
+import logging.handlers
+import os
+import tempfile
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from painless.log import QueuedHandler
+
+
+def make_record(message, *args):
+    return logging.makeLogRecord({
+        'msg': message, 'args': args,
+        'levelno': logging.INFO, 'levelname': 'INFO',
+    })
+
+
+@override_settings(LANGUAGE_CODE='en')
+class QueuedHandlerTest(SimpleTestCase):
+    """
+    Test QueuedHandler that should write records from a background thread
+    ------
+
+    - testing that records past the capacity are dropped and counted
+    - testing that the writer formats and writes records in batches
+    - testing that batches roll the target file over by size
+    - testing that `flush` and `close` drain the buffer
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+    def queue(self, handler, count, message='record %d'):
+        # The writer is kept from starting, so the records stay buffered
+        # until `_start_writer` is called.
+        with mock.patch.object(QueuedHandler, '_start_writer'):
+            for index in range(count):
+                handler.handle(make_record(message, index))
+
+    def test_dropped(self):
+        """testing the dropped count, with records from many threads"""
+        handler = QueuedHandler(logging.StreamHandler(io.StringIO()),
+                                capacity=3)
+        self.queue(handler, 5)
+        crowded = QueuedHandler(logging.StreamHandler(io.StringIO()),
+                                capacity=0)
+        threads = [
+            threading.Thread(target=lambda: [
+                crowded.handle(make_record('record')) for _ in range(1000)
+            ])
+            for _ in range(8)
+        ]
+        with mock.patch.object(QueuedHandler, '_start_writer'):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        actual = (handler.stats(), crowded.dropped)
+        expected = (
+            {'buffered': 3, 'written': 0, 'dropped': 2, 'batches': 0}, 8000
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (stats, dropped from threads) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_batches(self):
+        """testing that ten records are written in order in three batches"""
+        stream = io.StringIO()
+        handler = QueuedHandler(logging.StreamHandler(stream), batch_size=4)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        self.queue(handler, 10)
+        handler._start_writer()
+        handler.flush()
+        handler.close()
+
+        actual = (stream.getvalue().splitlines(), handler.stats())
+        expected = (
+            [f'INFO record {index}' for index in range(10)],
+            {'buffered': 0, 'written': 10, 'dropped': 0, 'batches': 3},
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (lines, stats) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_rollover(self):
+        """testing that a batch that would pass maxBytes starts a new file"""
+        path = os.path.join(self.temp_dir, 'app.log')
+        target = logging.handlers.RotatingFileHandler(
+            path, maxBytes=100, backupCount=2
+        )
+        handler = QueuedHandler(target, batch_size=4)
+        # 21 bytes per record, 84 per full batch
+        self.queue(handler, 10, 'record %02d ' + 'x' * 10)
+        handler._start_writer()
+        handler.close()
+
+        actual = [
+            os.path.getsize(f'{path}{suffix}') for suffix in ('', '.1', '.2')
+        ]
+        expected = [42, 84, 84]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual file sizes are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_should_rollover(self):
+        """testing the size check and the other rotating handlers"""
+        rotating = logging.handlers.RotatingFileHandler(
+            os.path.join(self.temp_dir, 'size.log'), maxBytes=100
+        )
+        unlimited = logging.handlers.RotatingFileHandler(
+            os.path.join(self.temp_dir, 'unlimited.log'), maxBytes=0
+        )
+        timed = logging.handlers.TimedRotatingFileHandler(
+            os.path.join(self.temp_dir, 'timed.log')
+        )
+        self.addCleanup(rotating.close)
+        self.addCleanup(unlimited.close)
+        self.addCleanup(timed.close)
+        rotating.stream.write('x' * 40)
+        record = make_record('record')
+
+        actual = (
+            QueuedHandler._should_rollover(rotating, record, 59),
+            QueuedHandler._should_rollover(rotating, record, 60),
+            QueuedHandler._should_rollover(unlimited, record, 10 ** 9),
+            QueuedHandler._should_rollover(timed, record, 10 ** 9),
+            QueuedHandler._should_rollover(
+                logging.StreamHandler(io.StringIO()), record, 10 ** 9
+            ),
+        )
+        expected = (False, True, False, bool(timed.shouldRollover(record)),
+                    False)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual rollover decisions are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_flush_and_close(self):
+        """testing that buffered records are written before returning"""
+        path = os.path.join(self.temp_dir, 'app.log')
+        handler = QueuedHandler('logging.FileHandler', batch_size=7,
+                                filename=path)
+        for index in range(1000):
+            handler.handle(make_record('record %d', index))
+        handler.flush()
+        flushed = handler.stats()
+        self.queue(handler, 500)
+        handler.close()
+        with open(path) as log_file:
+            lines = log_file.read().splitlines()
+
+        actual = (flushed['buffered'], flushed['written'], len(lines),
+                  handler.stats()['buffered'], handler.target.stream)
+        expected = (0, 1000, 1500, 0, None)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (buffered, written, lines, left, stream) is "
+            f"`{actual}` but expected is `{expected}`"
+        )
@@ -0,0 +1,170 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import models
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import (
+    isolate_apps,
+    override_settings
+)
+
+from painless.models.mixins import UploadSorlThumbnailPictureMixin
+from painless.services import thumbnail
+from painless.services.thumbnail import (
+    ThumbnailPipeline,
+    ThumbnailSpec,
+    get_thumbnail_url,
+    manifest_key,
+    queue_thumbnails
+)
+
+
+def fake_thumbnail(picture, geometry, crop, quality, format):
+    name = f'{picture.name}-{geometry}-{quality}.{format.lower()}'
+    return SimpleNamespace(url=f'/cache/{name}')
+
+
+@override_settings(
+    LANGUAGE_CODE='en',
+    THUMBNAIL_FORMAT='JPEG',
+    THUMBNAIL_PIPELINE={
+        'ENABLED': True, 'WORKERS': 1, 'CACHE': 'default', 'TIMEOUT': None
+    },
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    },
+)
+@isolate_apps('painless')
+class ThumbnailPipelineTest(TestCase):
+    """
+    Test the thumbnail pipeline that should render declared thumbnails on save
+    ------
+
+    - testing that only models declaring `thumbnail_specs` are connected
+    - testing that a save queues the picture once the transaction commits
+    - testing that a batch renders every variant into one manifest
+    - testing that `get_thumbnail_url` reads the manifest or renders
+    """
+
+    def setUp(self):
+        cache.clear()
+
+        class Picture(UploadSorlThumbnailPictureMixin):
+            thumbnail_specs = (
+                ThumbnailSpec('small', '50x50'),
+                ThumbnailSpec('large', '400x400', quality=90, webp_quality=None),
+            )
+
+            class Meta:
+                app_label = 'painless'
+
+        class Plain(models.Model):
+            class Meta:
+                app_label = 'painless'
+
+        self.picture_model, self.plain_model = Picture, Plain
+        patcher = mock.patch.object(
+            thumbnail, 'get_thumbnail', side_effect=fake_thumbnail
+        )
+        self.get_thumbnail = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def picture(self, name='photos/a.jpg'):
+        return self.picture_model(
+            pk=1, picture=name, width_field=800, height_field=600
+        )
+
+    def test_receiver_is_connected_per_model(self):
+        """testing that saving a model without thumbnails skips the receiver"""
+        actual = (
+            queue_thumbnails in post_save._live_receivers(self.picture_model),
+            queue_thumbnails in post_save._live_receivers(self.plain_model),
+        )
+        expected = (True, False)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (picture, plain) connections are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_save_queues_on_commit(self):
+        """testing that a saved picture is queued after commit only"""
+        instance = self.picture()
+        with mock.patch.object(thumbnail.thumbnail_pipeline, 'queue') as queue:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                post_save.send(sender=self.picture_model, instance=instance,
+                               created=True)
+                post_save.send(sender=self.picture_model, instance=instance,
+                               created=False, raw=True)
+                queued_before_commit = queue.call_count
+
+        actual = (queued_before_commit, len(callbacks), queue.call_args_list)
+        expected = (0, 1, [mock.call(instance)])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (before commit, callbacks, queued) are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_batch_renders_manifest(self):
+        """testing that a picture saved twice in a batch is rendered once"""
+        instance = self.picture()
+        job = (manifest_key(instance), instance.picture, instance.thumbnail_specs)
+        pipeline = ThumbnailPipeline()
+        try:
+            pipeline.process([job, job])
+        finally:
+            pipeline.shutdown()
+
+        actual = (
+            self.get_thumbnail.call_count, cache.get(manifest_key(instance))
+        )
+        expected = (3, {
+            'small': {
+                'JPEG': '/cache/photos/a.jpg-50x50-85.jpeg',
+                'WEBP': '/cache/photos/a.jpg-50x50-80.webp',
+            },
+            'large': {'JPEG': '/cache/photos/a.jpg-400x400-90.jpeg'},
+        })
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (renders, manifest) are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_get_thumbnail_url(self):
+        """testing manifest reads, the synchronous fallback and unknown specs"""
+        instance = self.picture()
+        cache.set(
+            manifest_key(instance), {'small': {'JPEG': '/from-manifest.jpeg'}}
+        )
+
+        actual = (
+            get_thumbnail_url(instance, 'small'),
+            get_thumbnail_url(instance, 'small', 'WEBP'),
+            get_thumbnail_url(self.picture('photos/b.jpg'), 'small'),
+            get_thumbnail_url(self.picture(''), 'small'),
+            self.get_thumbnail.call_count,
+        )
+        expected = (
+            '/from-manifest.jpeg',
+            '/cache/photos/a.jpg-50x50-80.webp',
+            '/cache/photos/b.jpg-50x50-85.jpeg',
+            None,
+            2,
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual urls and renders are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+        with self.assertRaises(KeyError):
+            get_thumbnail_url(instance, 'missing')
+        with self.assertRaises(KeyError):
+            get_thumbnail_url(instance, 'large', 'WEBP')
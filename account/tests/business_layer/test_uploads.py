@@ -0,0 +1,177 @@
+import hashlib
+import os
+import tempfile
+
+from django import forms
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import (
+    RequestFactory,
+    SimpleTestCase
+)
+from django.test.utils import override_settings
+from rest_framework import serializers
+
+from painless.files import (
+    DeduplicatingFileSystemStorage,
+    HashingTemporaryFileUploadHandler,
+    UploadErrorsFormMixin,
+    UploadErrorsSerializerMixin,
+    file_sha256,
+    upload_errors
+)
+
+
+class UploadForm(UploadErrorsFormMixin, forms.Form):
+    title = forms.CharField()
+    document = forms.FileField()
+
+
+class UploadSerializer(UploadErrorsSerializerMixin, serializers.Serializer):
+    title = serializers.CharField()
+    document = serializers.FileField()
+
+
+@override_settings(LANGUAGE_CODE='en', MAX_UPLOAD_SIZE=1000)
+class HashingUploadHandlerTest(SimpleTestCase):
+    """
+    Test HashingTemporaryFileUploadHandler that should hash uploads and
+    enforce the size limit
+    ------
+
+    - testing that an upload is written to disk with its SHA-256
+    - testing that an upload past the limit is discarded, not the other fields
+    - testing that forms and serializers report the limit, not a missing file,
+      along with the errors of the other fields
+    """
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        patcher = override_settings(FILE_UPLOAD_TEMP_DIR=self.temp_dir)
+        patcher.enable()
+        self.addCleanup(patcher.disable)
+
+    def parse(self, content):
+        upload = SimpleUploadedFile('report.pdf', content,
+                                    content_type='application/pdf')
+        # The title comes after the file, so it is only read if the file is.
+        request = RequestFactory().post(
+            '/', data={'document': upload, 'title': 'report'}
+        )
+        request.upload_handlers = [HashingTemporaryFileUploadHandler(request)]
+        return request, request.POST, request.FILES
+
+    def test_hash(self):
+        """testing that the digest is taken while the upload is written"""
+        content = os.urandom(900)
+        request, _, files = self.parse(content)
+        document = files['document']
+
+        digest = hashlib.sha256(content).hexdigest()
+        actual = (document.sha256, file_sha256(document), document.read(),
+                  document.size, upload_errors(request))
+        expected = (digest, digest, content, 900, dict())
+        document.close()
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (digest, file_sha256, content, size, rejected) is "
+            f"`{actual}` but expected is `{expected}`"
+        )
+
+    def test_limit(self):
+        """testing that an oversized upload is dropped, not the other fields"""
+        with self.assertLogs('painless.files.uploadhandler', 'WARNING'):
+            request, post, files = self.parse(os.urandom(5000))
+
+        errors = upload_errors(request)
+        actual = ('document' in files, post.get('title'), list(errors),
+                  errors['document'].code, os.listdir(self.temp_dir))
+        expected = (False, 'report', ['document'], 'file_too_large', [])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (file, title, rejected, code, temp files) is "
+            f"`{actual}` but expected is `{expected}`"
+        )
+
+    def test_validation_error(self):
+        """testing that forms and serializers reject the upload with the limit"""
+        with self.assertLogs('painless.files.uploadhandler', 'WARNING'):
+            request, post, files = self.parse(os.urandom(5000))
+        form = UploadForm(post, files, upload_errors=upload_errors(request))
+        serializer = UploadSerializer(data=dict(), context={'request': request})
+        message = 'Ensure report.pdf is at most 1000\xa0bytes.'
+
+        actual = (
+            form.is_valid(),
+            form.errors.as_data()['document'][0].code,
+            form.errors['document'],
+            serializer.is_valid(),
+            serializer.errors['document'],
+            serializer.errors['document'][0].code,
+            sorted(serializer.errors),
+        )
+        expected = (
+            False,
+            'file_too_large',
+            [message],
+            False,
+            [message],
+            'file_too_large',
+            ['document', 'title'],
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual form and serializer results are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+
+class DeduplicatingStorageTest(SimpleTestCase):
+    """
+    Test DeduplicatingFileSystemStorage that should store each content once
+    ------
+
+    - testing that the same bytes get the same name and are written once
+    - testing that different bytes get different names
+    """
+
+    def setUp(self):
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        self.location = location.name
+        self.storage = DeduplicatingFileSystemStorage(location=self.location)
+
+    def stored_files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.location)
+            for root, _, names in os.walk(self.location) for name in names
+        )
+
+    def test_deduplication(self):
+        """testing names and files written for repeated and new content"""
+        digest = hashlib.sha256(b'same bytes').hexdigest()
+        other = hashlib.sha256(b'other bytes').hexdigest()
+        names = (
+            self.storage.save('docs/a.PDF', ContentFile(b'same bytes')),
+            self.storage.save('docs/b.pdf', ContentFile(b'same bytes')),
+            self.storage.save('docs/c.pdf', ContentFile(b'other bytes')),
+        )
+
+        actual = (names, self.stored_files())
+        expected = (
+            (f'docs/{digest[:2]}/{digest}.pdf', f'docs/{digest[:2]}/{digest}.pdf',
+             f'docs/{other[:2]}/{other}.pdf'),
+            sorted([f'docs/{digest[:2]}/{digest}.pdf',
+                    f'docs/{other[:2]}/{other}.pdf']),
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (names, files) are `{actual}` "
+            f"but expected is `{expected}`"
+        )
@@ -0,0 +1,115 @@
+from django.test import SimpleTestCase
+from django.test.utils import (
+    isolate_apps,
+    override_settings
+)
+
+from painless.models.mixins import (
+    CountryProvinceCityMixin,
+    CustomerDetailsMixin,
+    LogisticCostMixin,
+    TitleSlugMixin
+)
+
+
+@override_settings(LANGUAGE_CODE='en')
+@isolate_apps('painless')
+class MixinHelpTextTest(SimpleTestCase):
+    """
+    Test whether `class_prepared` sets the model-specific help texts of the mixins
+    ------
+
+    - testing the order help texts
+    - testing the address help texts
+    - testing the title and logistic cost help texts of any model
+    - testing that proxies leave the concrete model's help texts alone
+    """
+
+    @staticmethod
+    def help_texts(model, *field_names):
+        return tuple(
+            str(model._meta.get_field(name).help_text) for name in field_names
+        )
+
+    def test_order(self):
+        """testing the help texts of a model named `Order`"""
+
+        class Order(CountryProvinceCityMixin, CustomerDetailsMixin):
+            class Meta:
+                app_label = 'painless'
+
+        actual = self.help_texts(Order, 'country', 'receiver_phone_number')
+        expected = (
+            'The country where the user has submitted his/her order.',
+            'The phone number of the person who receives the order.',
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual help texts are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_address(self):
+        """testing the help texts of a model named `Address`"""
+
+        class Address(CountryProvinceCityMixin, CustomerDetailsMixin):
+            class Meta:
+                app_label = 'painless'
+
+        actual = self.help_texts(Address, 'city', 'receiver_first_name')
+        expected = (
+            'The registered city for shipping goods.',
+            "The receiver's first name to receive the goods.",
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual help texts are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_title_and_logistic_cost(self):
+        """testing the help texts built from the model name"""
+
+        class LogisticWeightBased(TitleSlugMixin, LogisticCostMixin):
+            class Meta:
+                app_label = 'painless'
+
+        class Brand(TitleSlugMixin):
+            class Meta:
+                app_label = 'painless'
+
+        actual = (
+            self.help_texts(LogisticWeightBased, 'title', 'logistic_cost')
+            + self.help_texts(Brand, 'title')
+        )
+        expected = (
+            'LogisticWeightBased title.',
+            'If the logistic type is Weight based, '
+            'it takes the value of the money type.',
+            'Brand title.',
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual help texts are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_proxy(self):
+        """testing that a proxy model does not rewrite the inherited help texts"""
+
+        class Address(CountryProvinceCityMixin):
+            class Meta:
+                app_label = 'painless'
+
+        class Order(Address):
+            class Meta:
+                app_label = 'painless'
+                proxy = True
+
+        actual = self.help_texts(Order, 'city')
+        expected = ('The registered city for shipping goods.',)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual help texts are `{actual}` but expected is `{expected}`"
+        )
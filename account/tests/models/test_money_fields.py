@@ -0,0 +1,93 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from djmoney.money import Money
+
+from painless.models.fields import (
+    MoneyCurrencyOutput,
+    MoneyDollarCurrencyOutput,
+    money_as_decimal
+)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class CurrencyOutputTest(SimpleTestCase):
+    """
+    Test the painless money fields that should load amounts as `Money` or
+    `Decimal`
+    ------
+
+    - testing that NULL stays `None`
+    - testing the loaded `Money`, its scale and its pickling
+    - testing that `money_as_decimal` only applies inside its block and thread
+    """
+
+    def setUp(self):
+        self.dollar = MoneyDollarCurrencyOutput(max_digits=14, decimal_places=2)
+        self.euro = MoneyCurrencyOutput('EUR', max_digits=14, decimal_places=4)
+
+    def load(self, field, value):
+        return field.from_db_value(value, None, None)
+
+    def test_null(self):
+        """testing that NULL is loaded as None in both modes"""
+        with money_as_decimal():
+            inside = self.load(self.dollar, None)
+        actual = (
+            self.load(self.dollar, None), self.load(self.euro, None), inside
+        )
+        expected = (None, None, None)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual loaded values are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_money(self):
+        """testing the loaded Money objects"""
+        dollars = self.load(self.dollar, Decimal('12.30'))
+        euros = self.load(self.euro, Decimal('1.2345'))
+
+        actual = (
+            dollars,
+            str(dollars.currency),
+            euros,
+            pickle.loads(pickle.dumps(dollars)),
+            self.load(self.dollar, 7),
+        )
+        expected = (
+            Money(Decimal('12.30'), 'USD'),
+            'USD',
+            Money(Decimal('1.23'), 'EUR'),
+            Money(Decimal('12.30'), 'USD'),
+            Money(Decimal('7'), 'USD'),
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual loaded values are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_money_as_decimal(self):
+        """testing that the Decimal mode is scoped to the block and its thread"""
+        with money_as_decimal():
+            inside = self.load(self.dollar, Decimal('12.30'))
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                other_thread = executor.submit(
+                    self.load, self.dollar, Decimal('12.30')
+                ).result()
+        after = self.load(self.dollar, Decimal('12.30'))
+
+        actual = (type(inside), inside, type(other_thread), type(after))
+        expected = (Decimal, Decimal('12.30'), Money, Money)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (inside, other thread, after) loads are `{actual}` "
+            f"but expected is `{expected}`"
+        )
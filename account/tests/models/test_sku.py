@@ -0,0 +1,102 @@
+import re
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from painless.helper.sku import (
+    ALPHABET,
+    SKU_LENGTH,
+    TIME_LENGTH,
+    allocate_skus,
+    default_sku,
+    generate_sku
+)
+from painless.models.mixins import SKUMixin
+
+SKU_PATTERN = re.compile(f'[{ALPHABET}]{{{SKU_LENGTH}}}')
+
+
+def fixed_sku():
+    return 'FIXED'
+
+
+@override_settings(LANGUAGE_CODE='en')
+class SKUTest(SimpleTestCase):
+    """
+    Test the SKU helpers that should create time-ordered and unique SKUs
+    ------
+
+    - testing the SKU layout
+    - testing that SKUs sort by creation time
+    - testing that a batch is unique, sorted and shares its time prefix
+    - testing that `default_sku` follows the `SKU_GENERATOR` setting
+    """
+
+    def test_layout(self):
+        """testing the length, alphabet and time prefix of a SKU"""
+        sku = generate_sku(timestamp_ms=1)
+
+        actual = (bool(SKU_PATTERN.fullmatch(sku)), sku[:TIME_LENGTH])
+        expected = (True, '0000000001')
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (valid, time prefix) of `{sku}` is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_time_order(self):
+        """testing that later SKUs sort after earlier ones, whatever is random"""
+        timestamps = [
+            0, 1, 31, 32, 999, 1000, 1_700_000_000_000, 1_700_000_000_001
+        ]
+        skus = [generate_sku(timestamp_ms=timestamp) for timestamp in timestamps]
+        with mock.patch('painless.helper.sku.time.time_ns',
+                        return_value=1_700_000_000_002 * 10 ** 6):
+            skus.append(generate_sku())
+
+        actual = sorted(skus)
+        expected = skus
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual order is `{actual}` but expected is `{expected}`"
+        )
+
+    def test_allocate_skus(self):
+        """testing a batch of SKUs"""
+        skus = allocate_skus(5000)
+
+        actual = (
+            len(skus),
+            len(set(skus)),
+            skus == sorted(skus),
+            len({sku[:TIME_LENGTH] for sku in skus}),
+            all(SKU_PATTERN.fullmatch(sku) for sku in skus),
+        )
+        expected = (5000, 5000, True, 1, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (count, unique, sorted, prefixes, valid) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_generator_setting(self):
+        """testing that SKUMixin's default calls the configured generator"""
+        with override_settings(
+                SKU_GENERATOR='account.tests.models.test_sku.fixed_sku'):
+            configured = default_sku()
+        default = default_sku()
+
+        actual = (
+            SKUMixin._meta.get_field('sku').default, configured, len(default)
+        )
+        expected = (default_sku, 'FIXED', SKU_LENGTH)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (field default, configured, default length) is "
+            f"`{actual}` but expected is `{expected}`"
+        )
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import (
+    isolate_apps,
+    override_settings
+)
+
+from painless.models.mixins import (
+    TitleSlugDescriptionMixin,
+    TitleSlugMixin
+)
+from painless.repository.slug import (
+    SlugAllocator,
+    allocate_slugs
+)
+
+with isolate_apps('painless'):
+    class Article(TitleSlugMixin):
+        class Meta:
+            app_label = 'painless'
+
+    class Page(TitleSlugDescriptionMixin):
+        class Meta:
+            app_label = 'painless'
+
+
+@override_settings(LANGUAGE_CODE='en')
+class SlugAllocatorTest(TestCase):
+    """
+    Test SlugAllocator that should give every object a unique slug
+    ------
+
+    - testing collisions between the objects of a batch, across bases
+    - testing collisions with the database and between batches
+    - testing that the batch size is capped by the query parameter limit
+    - testing that `save` derives the slug once
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # The scratch tables are created outside the test transaction.
+        with connection.schema_editor() as editor:
+            editor.create_model(Article)
+            editor.create_model(Page)
+        super(SlugAllocatorTest, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(SlugAllocatorTest, cls).tearDownClass()
+        with connection.schema_editor() as editor:
+            editor.delete_model(Article)
+            editor.delete_model(Page)
+
+    def import_titles(self, titles, **kwargs):
+        objs = allocate_slugs(
+            [Article(title=title) for title in titles], **kwargs
+        )
+        Article.objects.bulk_create(objs)
+        return [obj.slug for obj in objs]
+
+    def test_collisions_inside_batch(self):
+        """testing that a suffixed title and titles of one slug do not collide"""
+        actual = (
+            self.import_titles(['foo', 'Foo', 'foo 2']),
+            self.import_titles(['bar 2', 'bar', 'Bar']),
+        )
+        expected = (['foo', 'foo-2', 'foo-2-2'], ['bar-2', 'bar', 'bar-3'])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual slugs are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_collisions_with_database(self):
+        """testing slugs already stored and slugs given out in an earlier batch"""
+        self.import_titles(['foo', 'Foo!', 'foo 10'])
+        preset = Article(title='preset', slug='baz')
+
+        actual = (
+            self.import_titles(['FOO', 'foo?']),
+            self.import_titles(['qux', 'Qux', 'QUX'], batch_size=1),
+            [obj.slug for obj in allocate_slugs([preset, Article(title='baz')])],
+        )
+        expected = (
+            ['foo-3', 'foo-4'], ['qux', 'qux-2', 'qux-3'], ['baz', 'baz-2']
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual slugs are `{actual}` but expected is `{expected}`"
+        )
+
+    def test_batch_size_is_capped(self):
+        """testing that a query never binds more parameters than allowed"""
+        objs = [Article(title=f'title {index}') for index in range(7)]
+        taken = SlugAllocator.taken
+        with mock.patch.object(connection.features, 'max_query_params', 9), \
+                mock.patch.object(SlugAllocator, 'taken', autospec=True,
+                                  side_effect=taken) as spy:
+            SlugAllocator(Article).allocate(objs, batch_size=1000)
+
+        per_base = SlugAllocator.params_per_base(connection)
+        actual = [
+            len(call.args[1]) * per_base <= 9 for call in spy.call_args_list
+        ]
+        expected = [True] * -(-7 // (9 // per_base))
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual queries within the limit are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_save(self):
+        """testing the slug derived by save on both mixins"""
+        first = Article(title='Hello World')
+        second = Article(title='hello world!')
+        page = Page(title='Hello World', description='body')
+        for obj in (first, second, page):
+            obj.save()
+        page.title = 'Renamed'
+        page.save()
+
+        actual = (first.slug, second.slug, page.slug)
+        expected = ('hello-world', 'hello-world-2', 'hello-world')
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual slugs are `{actual}` but expected is `{expected}`"
+        )
@@ -0,0 +1,195 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import override_settings
+
+from account.models import User
+from painless.repository.cache import (
+    CachedQuerySet,
+    row_cache
+)
+from painless.repository.loader import BulkLoader
+
+
+@override_settings(
+    LANGUAGE_CODE='en',
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    },
+    REPOSITORY_CACHE={'ENABLED': True, 'TIMEOUT': 300},
+)
+class UserRowCacheTest(TransactionTestCase):
+    """
+    Test whether `User.objects.get` is served from the row cache.
+    The cache is bypassed inside transactions, hence `TransactionTestCase`.
+    ------
+
+    - testing that a repeated lookup by `phone_number` runs no query
+    - testing that `save` and `update` invalidate the cached row
+    - testing that a write committed during a miss is not hidden by the cache
+    - testing that `update` does not read the pks when the cache is disabled
+    - testing that filtered lookups bypass the cache
+    - testing that `truncate` and `BulkLoader` invalidate the cached rows
+    - testing that stamps expire, later than the rows stored under them
+    """
+
+    PHONE_NUMBER = '09120000000'
+
+    def setUp(self):
+        """creating and preparing data for testing"""
+
+        cache.clear()
+        row_cache.clear_local()
+        self.user = User.objects.create(
+            phone_number=self.PHONE_NUMBER, first_name='first'
+        )
+
+    def test_repeated_lookup(self):
+        """testing that lookups after the first two do not query the database"""
+
+        # The first lookup maps the phone number to the pk, the second one
+        # reads the row stamp before the row and caches it.
+        with self.assertNumQueries(2):
+            User.objects.get(phone_number=self.PHONE_NUMBER)
+            User.objects.get(phone_number=self.PHONE_NUMBER)
+        with self.assertNumQueries(0):
+            actual = User.objects.get(phone_number=self.PHONE_NUMBER)
+        expected = self.user
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual user is `{actual}` but expected is `{expected}`"
+            )
+        with self.assertNumQueries(0):
+            User.objects.get(pk=self.user.pk)
+
+    def test_save_invalidates(self):
+        """testing that a saved change is visible to the next lookup"""
+
+        user = User.objects.get(phone_number=self.PHONE_NUMBER)
+        user.first_name = 'second'
+        user.save()
+        actual = User.objects.get(phone_number=self.PHONE_NUMBER).first_name
+        expected = 'second'
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first_name is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_update_invalidates(self):
+        """testing that a queryset update is visible to the next lookup"""
+
+        User.objects.get(pk=self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(first_name='third')
+        actual = User.objects.get(pk=self.user.pk).first_name
+        expected = 'third'
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first_name is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_write_during_miss(self):
+        """testing that a row read before a concurrent write is not cached"""
+
+        uncached_get = CachedQuerySet.uncached_get
+
+        def read_then_write(queryset, *args, **kwargs):
+            obj = uncached_get(queryset, *args, **kwargs)
+            # Another worker commits a change after the row was read.
+            User.objects.filter(pk=obj.pk).update(first_name='written')
+            return obj
+
+        with mock.patch.object(CachedQuerySet, 'uncached_get', read_then_write):
+            User.objects.get(pk=self.user.pk)
+        actual = User.objects.get(pk=self.user.pk).first_name
+        expected = 'written'
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first_name is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_update_when_disabled(self):
+        """testing that a disabled cache costs update no extra query"""
+
+        with override_settings(REPOSITORY_CACHE={'ENABLED': False}):
+            with self.assertNumQueries(1):
+                User.objects.filter(pk=self.user.pk).update(first_name='fourth')
+
+    def test_filtered_lookup_bypasses(self):
+        """testing that a get on a filtered queryset always queries"""
+
+        User.objects.get(phone_number=self.PHONE_NUMBER)
+        with self.assertNumQueries(1):
+            User.objects.filter(is_active=True).get(
+                phone_number=self.PHONE_NUMBER
+            )
+
+    def test_truncate_invalidates(self):
+        """testing that a truncated row is not served from the cache"""
+
+        pk = self.user.pk
+        User.objects.get(pk=pk)
+        User.objects.get(pk=pk)
+        User.truncate()
+        with self.assertRaises(User.DoesNotExist):
+            User.objects.get(pk=pk)
+
+        # As a restarted sequence would, a new user gets the pk.
+        User.objects.create(
+            pk=pk, phone_number='09120000001', first_name='new'
+        )
+        actual = User.objects.get(pk=pk).first_name
+        expected = 'new'
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first_name is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_loader_invalidates(self):
+        """testing that a `BulkLoader` write drops the cached rows"""
+
+        pk = self.user.pk
+        User.objects.get(pk=pk)
+        User.objects.get(pk=pk)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {User._meta.db_table} SET first_name = %s '
+                'WHERE id = %s',
+                ['raw', pk]
+            )
+        BulkLoader(User).write([User(phone_number='09120000001')])
+        with self.assertNumQueries(1):
+            actual = User.objects.get(pk=pk).first_name
+        expected = 'raw'
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first_name is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_stamp_timeout(self):
+        """testing that stamps are written with twice the row timeout"""
+
+        with mock.patch.object(cache, 'add', wraps=cache.add) as add, \
+                mock.patch.object(cache, 'set', wraps=cache.set) as set_:
+            User.objects.get(pk=self.user.pk)
+            User.objects.get(pk=self.user.pk)
+            self.user.save()
+        timeouts = {
+            call.args[0].rsplit(':', 2)[-2]: call.args[2]
+            for call in add.call_args_list + set_.call_args_list
+            if ':v:' in call.args[0] or call.args[0].endswith(':gen')
+        }
+        actual = set(timeouts.values())
+        expected = {600}
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual timeouts are `{actual}` but expected is `{expected}`"
+            )
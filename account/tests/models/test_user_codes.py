@@ -0,0 +1,87 @@
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import User
+from painless.repository.codes import (
+    CROCKFORD_ALPHABET,
+    UniqueCodeGenerator
+)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class UniqueCodeGeneratorTest(TestCase):
+    """
+    Test whether `UniqueCodeGenerator` yields unique, unused codes.
+    ------
+
+    - testing length, alphabet and uniqueness across calls
+    - testing that codes already stored are skipped
+    - testing that invalid alphabets raise `ValueError`
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """creating and preparing data for testing"""
+
+        super(UniqueCodeGeneratorTest, cls).setUpClass()
+        cls.KEY = 11
+        cls.ALPHABET = '0123456789'
+        # `phone_number` stands in for a unique code column.
+        cls.stored = UniqueCodeGenerator(
+            length=11, alphabet=cls.ALPHABET, key=cls.KEY
+        ).generate(50)
+        User.objects.bulk_create(User(phone_number=code) for code in cls.stored)
+
+    def test_codes_are_unique(self):
+        """testing that two calls never repeat a code"""
+
+        generator = UniqueCodeGenerator(length=8, alphabet=CROCKFORD_ALPHABET)
+        codes = generator.generate(3000) + generator.generate(3000)
+        actual = (
+            len(set(codes)),
+            {len(code) for code in codes},
+            set(''.join(codes)) <= set(CROCKFORD_ALPHABET),
+        )
+        expected = (6000, {8}, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (distinct, lengths, in alphabet) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_stored_codes_are_skipped(self):
+        """testing that codes in the database are not generated again"""
+
+        generator = UniqueCodeGenerator(
+            length=11, alphabet=self.ALPHABET, key=self.KEY,
+            model=User, field='phone_number', check_size=7
+        )
+        codes = generator.generate(80)
+        actual = (len(set(codes)), set(codes) & set(self.stored))
+        expected = (80, set())
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (distinct, reused) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_invalid_alphabet(self):
+        """testing repeated, too short and non-ASCII alphabets"""
+
+        actual = list()
+        for alphabet in ('0123456789', 'aab', 'a', 'abcdé', 'ابپت'):
+            try:
+                UniqueCodeGenerator(length=6, alphabet=alphabet)
+            except ValueError:
+                actual.append(False)
+            else:
+                actual.append(True)
+        expected = [True, False, False, False, False]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual accepted alphabets are `{actual}` "
+            f"but expected is `{expected}`"
+            )
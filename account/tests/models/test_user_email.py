@@ -0,0 +1,210 @@
+import socketserver
+import threading
+
+from django.core import mail
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import User
+from painless.services import mail_queue
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """
+    Minimal local SMTP server: accepts every message and counts
+    connections; `fail_next` rejects that many MAIL commands with
+    `fail_code`.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.messages = list()
+        self.connections = 0
+        self.fail_next = 0
+        self.fail_code = 451
+        self.lock = threading.Lock()
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply('220 localhost stand-in')
+        while True:
+            line = self.rfile.readline().decode().strip()
+            command = line[:4].upper()
+            if not line or command == 'QUIT':
+                self.reply('221 bye')
+                return
+            if command == 'EHLO':
+                self.reply('250 localhost')
+            elif command == 'MAIL':
+                with self.server.lock:
+                    rejected = self.server.fail_next > 0
+                    self.server.fail_next -= rejected
+                self.reply(
+                    f'{self.server.fail_code} rejected' if rejected else '250 ok'
+                )
+            elif command == 'DATA':
+                self.reply('354 end with .')
+                data = list()
+                for raw in iter(self.rfile.readline, b'.\r\n'):
+                    data.append(raw)
+                with self.server.lock:
+                    self.server.messages.append(b''.join(data))
+                self.reply('250 queued')
+            else:
+                self.reply('250 ok')
+
+
+@override_settings(LANGUAGE_CODE='en')
+class UserEmailTest(TestCase):
+    """
+    Test User.email_user that should deliver through the mail queue
+    ------
+
+    - testing that a burst of emails reuses one SMTP connection
+    - testing that a rejected send is retried
+    - testing that a retry does not hold up the messages behind it
+    - testing that permanent failures are not retried
+    - testing that EMAIL_BACKEND delivers when MAIL_QUEUE has no backend
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(UserEmailTest, cls).setUpClass()
+
+        cls.server = SMTPStandIn()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.user_one = User.objects.create(
+            phone_number='09120000021',
+            email='example@gmail.com',
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        mail_queue.close_connection()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super(UserEmailTest, cls).tearDownClass()
+
+    def setUp(self):
+        self.settings_override = override_settings(
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=self.server.server_address[1],
+            EMAIL_USE_TLS=False,
+            MAIL_QUEUE={
+                'BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+                'BACKOFF': 0.01,
+            },
+        )
+        self.settings_override.enable()
+        mail_queue.close_connection()
+        self.server.messages.clear()
+        self.server.connections = 0
+        self.server.fail_next = 0
+        self.server.fail_code = 451
+
+    def tearDown(self):
+        self.settings_override.disable()
+
+    def test_burst_reuses_connection(self):
+        """testing that many emails are sent over a single connection"""
+        for index in range(20):
+            self.user_one.email_user(f'Subject {index}', 'Here is the message.',
+                                     'from@example.com')
+        mail_queue.flush()
+
+        actual = (len(self.server.messages), self.server.connections)
+        expected = (20, 1)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (messages, connections) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_failed_send_is_retried(self):
+        """testing that a temporary failure is retried"""
+        self.server.fail_next = 1
+        self.user_one.email_user('Subject here', 'Here is the message.',
+                                 'from@example.com')
+        mail_queue.flush()
+
+        self.assertEqual(len(self.server.messages), 1)
+        self.assertGreaterEqual(mail_queue.stats()['retries'], 1)
+
+    def test_retry_does_not_block_queue(self):
+        """testing that a message waiting for its retry does not delay the next"""
+        self.server.fail_next = 1
+        with override_settings(MAIL_QUEUE={
+            'BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'BACKOFF': 0.5,
+        }):
+            for subject in ('First', 'Second'):
+                self.user_one.email_user(
+                    subject, 'Here is the message.', 'from@example.com'
+                )
+            mail_queue.flush()
+
+        actual = [
+            b'Subject: First' in message for message in self.server.messages
+        ]
+        expected = [False, True]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first-message positions are `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_permanent_failure_is_not_retried(self):
+        """testing that a 5xx reply gives up at once"""
+        self.server.fail_next = 1
+        self.server.fail_code = 550
+        retries = mail_queue.stats()['retries']
+        failed = mail_queue.stats()['failed']
+        self.user_one.email_user('Subject here', 'Here is the message.',
+                                 'from@example.com')
+        mail_queue.flush()
+
+        actual = (
+            len(self.server.messages),
+            mail_queue.stats()['retries'] - retries,
+            mail_queue.stats()['failed'] - failed,
+        )
+        expected = (0, 0, 1)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (messages, retries, failures) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
+
+    def test_default_backend_is_email_backend(self):
+        """testing that without MAIL_QUEUE the mail goes through EMAIL_BACKEND"""
+        mail.outbox = list()
+        with override_settings(
+                MAIL_QUEUE=dict(),
+                EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            mail_queue.close_connection()
+            self.user_one.email_user('Subject here', 'Here is the message.',
+                                     'from@example.com')
+            mail_queue.flush()
+            mail_queue.close_connection()
+
+        actual = (
+            [message.subject for message in mail.outbox],
+            len(self.server.messages),
+        )
+        expected = (['Subject here'], 0)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (outbox, smtp messages) is `{actual}` "
+            f"but expected is `{expected}`"
+        )
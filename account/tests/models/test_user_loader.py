@@ -0,0 +1,208 @@
+import datetime
+import decimal
+
+from django.test import (
+    SimpleTestCase,
+    TestCase
+)
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import AccountDataGenerator
+from painless.repository.loader import (
+    BulkLoader,
+    _copy_text
+)
+
+WHEN = datetime.datetime(2021, 3, 4, 5, 6, 7, tzinfo=timezone.utc)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class CopyTextTest(SimpleTestCase):
+    """
+    Test whether `_copy_text` writes values in PostgreSQL's COPY text format.
+    ------
+
+    - testing that NULL, booleans, numbers and datetimes are spelled out
+    - testing that tabs, newlines and backslashes are escaped
+    """
+
+    def test_values(self):
+        """testing every kind of value"""
+
+        actual = [
+            _copy_text(value) for value in (
+                None, True, False, 7, decimal.Decimal('1.50'), WHEN, 'N'
+            )
+        ]
+        expected = ['\\N', 't', 'f', '7', '1.50',
+                    '2021-03-04T05:06:07+00:00', 'N']
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual texts are `{actual}` but expected is `{expected}`"
+            )
+
+    def test_escapes(self):
+        """testing that separators and a literal `\\N` stay data"""
+
+        actual = [
+            _copy_text(value) for value in (
+                'a\tb', 'a\nb', 'a\rb', 'a\\b', '\\N'
+            )
+        ]
+        expected = ['a\\tb', 'a\\nb', 'a\\rb', 'a\\\\b', '\\\\N']
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual texts are `{actual}` but expected is `{expected}`"
+            )
+
+
+@override_settings(LANGUAGE_CODE='en')
+class UserBulkLoaderTest(TestCase):
+    """
+    Test whether `BulkLoader` writes generated users in batches.
+    ------
+
+    - testing that every batch yields the ids of its rows
+    - testing that profiles are built from the streamed user ids
+    - testing that `raw=True` writes `auto_now(_add)` values as they are
+    - testing that `keep` writes only the listed `auto_now(_add)` fields
+    - testing that `write_columns` writes rows given as columns
+    - testing that explicit pks move the pk sequence past them
+    - testing that separators in text survive the round trip
+    """
+
+    def test_load_yields_ids(self):
+        """testing that the yielded ids are the ids of the written users"""
+
+        numbers = AccountDataGenerator().get_unique_phone_numbers(7)
+        loader = BulkLoader(User, batch_size=3)
+        batches = list(loader.load(
+            User(phone_number=number) for number in numbers
+        ))
+        actual = (
+            [len(batch) for batch in batches],
+            sorted(User.objects.filter(pk__in=sum(batches, []))
+                   .values_list('phone_number', flat=True))
+        )
+        expected = ([3, 3, 1], sorted(numbers))
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (batch sizes, phone numbers) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_profiles_from_user_ids(self):
+        """testing that one profile is created for each loaded user"""
+
+        generator = AccountDataGenerator()
+        for user_ids in generator.load_users(10, batch_size=4):
+            generator.create_profile(user_ids, batch_size=4,
+                                     disable_progress_bar=True)
+        actual = (User.objects.count(), Profile.objects.count(),
+                  User.objects.filter(profile__isnull=True).count())
+        expected = (10, 10, 0)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (users, profiles, without profile) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_raw(self):
+        """testing that a raw write keeps created and modified"""
+
+        BulkLoader(User, raw=True).write([User(
+            pk=500, phone_number='09120000500', date_joined=WHEN,
+            created=WHEN, modified=WHEN,
+        )])
+        actual = User.objects.values_list('pk', 'created', 'modified').get()
+        expected = (500, WHEN, WHEN)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (pk, created, modified) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_keep(self):
+        """testing that kept fields are written and the others are stamped"""
+
+        BulkLoader(User, keep=('created',)).write([User(
+            phone_number='09120000501', created=WHEN, modified=WHEN,
+        )])
+        created, modified = User.objects.values_list(
+            'created', 'modified'
+        ).get()
+        actual = (created, modified > WHEN)
+        expected = (WHEN, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (created, modified now) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_write_columns(self):
+        """testing that columns are written row by row"""
+
+        loader = BulkLoader(User, batch_size=1)
+        users = [
+            User(pk=pk, phone_number=f'09120000{pk}', first_name=f'user {pk}',
+                 date_joined=WHEN, created=WHEN, modified=WHEN)
+            for pk in (600, 601)
+        ]
+        written = loader.write_columns({
+            field.attname: [getattr(user, field.attname) for user in users]
+            for field in loader.fields
+        })
+        actual = (
+            written,
+            list(User.objects.order_by('pk')
+                 .values_list('pk', 'first_name', 'created')),
+        )
+        expected = (2, [(600, 'user 600', WHEN), (601, 'user 601', WHEN)])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (written, rows) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_explicit_pks_advance_sequence(self):
+        """testing that the next pk follows the largest written one"""
+
+        BulkLoader(User, raw=True).write([User(
+            pk=700, phone_number='09120000700', date_joined=WHEN,
+            created=WHEN, modified=WHEN,
+        )])
+        BulkLoader(User).write([User(phone_number='09120000701')])
+        actual = User.objects.get(phone_number='09120000701').pk
+        expected = 701
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual pk is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_special_characters(self):
+        """testing that tabs, newlines and backslashes are stored as given"""
+
+        first_name = 'a\tb\nc\\d\\N'
+        BulkLoader(User).write([User(
+            phone_number='09120000800', first_name=first_name
+        )])
+        actual = User.objects.get(phone_number='09120000800').first_name
+        expected = first_name
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual first_name is `{actual}` but expected is `{expected}`"
+            )
@@ -0,0 +1,302 @@
+from collections import Counter
+
+from django.db import (
+    connection,
+    models
+)
+from django.test import (
+    SimpleTestCase,
+    TestCase
+)
+from django.test.utils import (
+    isolate_apps,
+    override_settings
+)
+
+from painless.models.mixins import TimeStampMixin
+from painless.repository.base import STATUSES
+from painless.repository.orders import (
+    REFUNDABLE_STATUSES,
+    OrderHistoryGenerator,
+    OrderHistoryShape,
+    OrderModels
+)
+
+# Stand-ins with the relations and fields the generator writes, as the
+# basket, warehouse and voucher apps are not part of this project.
+with isolate_apps('painless'):
+    class Customer(models.Model):
+        class Meta:
+            app_label = 'painless'
+
+    class Product(models.Model):
+        brand = models.CharField(max_length=16, null=True)
+
+        class Meta:
+            app_label = 'painless'
+
+    class Pack(models.Model):
+        product = models.ForeignKey(Product, on_delete=models.CASCADE)
+        color = models.CharField(max_length=16, null=True)
+
+        class Meta:
+            app_label = 'painless'
+
+    class Voucher(models.Model):
+        kind = models.CharField(max_length=16)
+
+        class Meta:
+            app_label = 'painless'
+
+    class Order(TimeStampMixin):
+        user = models.ForeignKey(
+            Customer, on_delete=models.CASCADE, related_name='orders'
+        )
+        status = models.CharField(max_length=16)
+        vouchers = models.ManyToManyField(Voucher, related_name='orders')
+
+        class Meta:
+            app_label = 'painless'
+
+    class PackOrder(models.Model):
+        order = models.ForeignKey(
+            Order, on_delete=models.CASCADE, related_name='pack_orders'
+        )
+        pack = models.ForeignKey(Pack, on_delete=models.CASCADE)
+        quantity = models.PositiveIntegerField()
+        buy_price = models.DecimalField(max_digits=14, decimal_places=2)
+        cost = models.DecimalField(max_digits=14, decimal_places=2)
+        is_refunded = models.BooleanField(default=False)
+
+        class Meta:
+            app_label = 'painless'
+
+SCRATCH_MODELS = (Customer, Product, Pack, Voucher, Order, PackOrder)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class OrderHistoryPlanTest(SimpleTestCase):
+    """
+    Test whether `OrderHistoryGenerator` plans skewed order histories.
+    ------
+
+    - testing that a few buyers hold most of the orders
+    - testing that only delivered or completed lines are refunded
+    - testing that the statuses follow the weights given per `STATUSES`
+    - testing that the `created` times spread over the period
+    - testing that the same seed gives the same plan
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """creating and preparing data for testing"""
+
+        super(OrderHistoryPlanTest, cls).setUpClass()
+        cls.shape = OrderHistoryShape(orders_exponent=1.6, refund_rate=0.5)
+        generator = OrderHistoryGenerator(seed=5, shape=cls.shape)
+        cls.weights = generator.pack_weights(
+            ['a', 'a', 'b', None], ['red', 'blue', 'red', 'red']
+        )
+        cls.plan = generator.plan_orders(5000, cls.weights)
+
+    def test_orders_are_skewed(self):
+        """testing that the top tenth of buyers hold a third of the orders"""
+
+        counts = dict()
+        for user in self.plan['orders']['user']:
+            counts[user] = counts.get(user, 0) + 1
+        ordered = sorted(counts.values(), reverse=True)
+        top = sum(ordered[:len(ordered) // 10])
+        actual = top * 3 >= len(self.plan['orders']['user'])
+        expected = True
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual skew is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_refunds_follow_status(self):
+        """testing that refunded lines belong to refundable orders"""
+
+        statuses = self.plan['orders']['status']
+        refunded = {
+            statuses[order]
+            for order, is_refunded in zip(
+                self.plan['lines']['order'], self.plan['lines']['is_refunded']
+            )
+            if is_refunded
+        }
+        actual = (bool(refunded), refunded <= set(REFUNDABLE_STATUSES))
+        expected = (True, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (any refund, refundable only) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_same_seed_same_plan(self):
+        """testing that a seed reproduces the plan"""
+
+        generator = OrderHistoryGenerator(seed=5, shape=self.shape)
+        generator.pack_weights(
+            ['a', 'a', 'b', None], ['red', 'blue', 'red', 'red']
+        )
+        actual = generator.plan_orders(5000, self.weights) == self.plan
+        expected = True
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual reproduced is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_status_weights(self):
+        """testing that statuses left out are not drawn and unknown ones raise"""
+
+        generator = OrderHistoryGenerator(seed=5)
+        drawn = Counter(generator.get_random_status_batch(
+            2000, {'delivered': 3, 'cancelled': 1}
+        ))
+        with self.assertRaises(ValueError):
+            generator.get_random_status_batch(10, {'lost': 1})
+        actual = (
+            set(drawn),
+            drawn['delivered'] > 2 * drawn['cancelled'],
+            set(self.plan['orders']['status']) <= set(STATUSES),
+        )
+        expected = ({'delivered', 'cancelled'}, True, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (drawn, skewed, known) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_created_spread(self):
+        """testing that the orders are created over the whole period"""
+
+        start, end = self.shape.period
+        created = self.plan['orders']['created']
+        years = {value.year for value in created}
+        actual = (
+            all(start <= value <= end for value in created),
+            years >= {start.year, end.year - 1},
+        )
+        expected = (True, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (inside, spread) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+
+@override_settings(LANGUAGE_CODE='en')
+class OrderHistoryWriteTest(TestCase):
+    """
+    Test whether `OrderHistoryGenerator` writes the planned history.
+    ------
+
+    - testing that `OrderModels` finds the models through the user relations
+    - testing the rows written per table
+    - testing that the rows keep the planned statuses and `created` times
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """creating the scratch tables outside the test transaction"""
+
+        with connection.schema_editor() as editor:
+            for model in SCRATCH_MODELS:
+                editor.create_model(model)
+        super(OrderHistoryWriteTest, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(OrderHistoryWriteTest, cls).tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in reversed(SCRATCH_MODELS):
+                editor.delete_model(model)
+
+    @classmethod
+    def setUpTestData(cls):
+        """creating customers, packs and vouchers to order"""
+
+        customers = Customer.objects.bulk_create(Customer() for _ in range(50))
+        cls.customer_ids = [customer.pk for customer in customers]
+        products = Product.objects.bulk_create(
+            Product(brand=brand) for brand in ('a', 'b', None)
+        )
+        Pack.objects.bulk_create(
+            Pack(product=product, color=color)
+            for product in products for color in ('red', 'blue')
+        )
+        Voucher.objects.bulk_create(
+            Voucher(kind=kind) for kind in ('static_based', 'code_based')
+        )
+
+    def test_resolve(self):
+        """testing the models and foreign keys found from the customer model"""
+
+        resolved = OrderModels.resolve(Customer)
+        actual = (
+            resolved.order, resolved.user_field, resolved.line,
+            resolved.order_field, resolved.pack, resolved.pack_field,
+            resolved.voucher, resolved.through_order_field,
+            resolved.through_voucher_field,
+        )
+        expected = (
+            Order, 'user_id', PackOrder, 'order_id', Pack, 'pack_id',
+            Voucher, 'order_id', 'voucher_id',
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual resolved models are `{actual}` "
+            f"but expected is `{expected}`"
+            )
+        with self.assertRaises(LookupError):
+            OrderModels.resolve(Product)
+
+    def test_write(self):
+        """testing the written rows against the planned history"""
+
+        shape = OrderHistoryShape(voucher_rate=0.5)
+        written = OrderHistoryGenerator(seed=7, shape=shape).create_order_history(
+            user_ids=self.customer_ids,
+            batch_size=20,
+            disable_progress_bar=True,
+            models=OrderModels.resolve(Customer),
+        )
+        start, end = shape.period
+        created = list(Order.objects.values_list('created', flat=True))
+        refunded = set(
+            PackOrder.objects.filter(is_refunded=True)
+            .values_list('order__status', flat=True)
+        )
+        actual = (
+            written,
+            all(written.values()),
+            set(Order.objects.values_list('status', flat=True)) <= set(STATUSES),
+            all(start <= value <= end for value in created),
+            len(set(created)) > 1,
+            refunded <= set(REFUNDABLE_STATUSES),
+        )
+        expected = (
+            {
+                'orders': Order.objects.count(),
+                'lines': PackOrder.objects.count(),
+                'vouchers': Order.vouchers.through.objects.count(),
+            },
+            True,
+            True,
+            True,
+            True,
+            True,
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (written, any, statuses, created, spread, refunds) is "
+            f"`{actual}` but expected is `{expected}`"
+            )
@@ -0,0 +1,93 @@
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import User
+from account.repository.generator_layer import AccountDataGenerator
+from painless.repository.passwords import (
+    PasswordPool,
+    derive_salt,
+    pool_passwords
+)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class UserPasswordPoolTest(TestCase):
+    """
+    Test whether generated users get usable passwords from a `PasswordPool`.
+    ------
+
+    - testing that every password of the pool is hashed once
+    - testing that generated users log in with `password_for`
+    - testing that a seeded pool hashes with salts derived from the seed
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """creating and preparing data for testing"""
+
+        super(UserPasswordPoolTest, cls).setUpClass()
+        cls.pool = PasswordPool(pool_passwords(3, 'secret-'))
+
+    def test_pool_hashes(self):
+        """testing that the hashes match their passwords"""
+
+        actual = (
+            self.pool.passwords,
+            [check_password(password, hashed)
+             for password, hashed in zip(self.pool.passwords, self.pool.hashes)]
+        )
+        expected = (['secret-0', 'secret-1', 'secret-2'], [True, True, True])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (passwords, checked) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_generated_users_log_in(self):
+        """testing that generated users accept the password of their phone"""
+
+        generator = AccountDataGenerator(seed=7, password_pool=self.pool)
+        generator.create_user(6, batch_size=4)
+        users = list(User.objects.all())
+        actual = (
+            len(users),
+            all(user.check_password(self.pool.password_for(user.phone_number))
+                for user in users),
+            any(user.check_password('1') for user in users),
+        )
+        expected = (6, True, False)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (users, logged in, plain text) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_seeded_hashes(self):
+        """testing that the same seed gives the same hashes"""
+
+        passwords = pool_passwords(2, 'secret-')
+        hashes = PasswordPool(passwords, seed=5).hashes
+        actual = (
+            PasswordPool(passwords, seed=5).hashes == hashes,
+            PasswordPool(passwords, seed=6).hashes == hashes,
+            PasswordPool(passwords).hashes == PasswordPool(passwords).hashes,
+            [hashed.split('$')[2] for hashed in hashes],
+            [check_password(password, hashed)
+             for password, hashed in zip(passwords, hashes)],
+        )
+        expected = (
+            True,
+            False,
+            False,
+            [derive_salt(5, 0), derive_salt(5, 1)],
+            [True, True],
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (same seed, other seed, unseeded, salts, checked) "
+            f"is `{actual}` but expected is `{expected}`"
+            )
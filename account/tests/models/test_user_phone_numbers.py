@@ -0,0 +1,71 @@
+import re
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import User
+from account.repository.generator_layer import AccountDataGenerator
+from painless.helper.enums import RegexPatternEnum
+
+
+@override_settings(LANGUAGE_CODE='en')
+class UserPhoneNumberGeneratorTest(TestCase):
+    """
+    Test whether generated users get unique, valid phone numbers.
+    ------
+
+    - testing that numbers match `IRAN_PHONE_NUMBER`
+    - testing that numbers already stored are skipped
+    - testing that one seed gives the same numbers
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """creating and preparing data for testing"""
+
+        super(UserPhoneNumberGeneratorTest, cls).setUpClass()
+        cls.SEED = 42
+        generator = AccountDataGenerator(seed=cls.SEED)
+        cls.existing = generator.get_unique_phone_numbers(5)
+        User.objects.bulk_create(
+            User(phone_number=number) for number in cls.existing
+        )
+
+    def test_phone_numbers_are_valid(self):
+        """testing that every generated number matches the regex"""
+
+        pattern = re.compile(RegexPatternEnum.IRAN_PHONE_NUMBER.value)
+        numbers = AccountDataGenerator().get_unique_phone_numbers(1000)
+        actual = [number for number in numbers if not pattern.match(number)]
+        expected = []
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual invalid numbers are `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_existing_numbers_are_skipped(self):
+        """testing that stored numbers are never generated again"""
+
+        generator = AccountDataGenerator(seed=self.SEED)
+        numbers = generator.get_unique_phone_numbers(20, model=User)
+        actual = (len(set(numbers)), set(numbers) & set(self.existing))
+        expected = (20, set())
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (distinct, reused) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_seed_is_deterministic(self):
+        """testing that two generators with one seed agree"""
+
+        actual = AccountDataGenerator(seed=7).get_unique_phone_numbers(10)
+        expected = AccountDataGenerator(seed=7).get_unique_phone_numbers(10)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual numbers are `{actual}` but expected is `{expected}`"
+            )
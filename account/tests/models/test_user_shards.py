@@ -0,0 +1,140 @@
+from functools import partial
+
+from django.test import (
+    SimpleTestCase,
+    TransactionTestCase
+)
+from django.test.utils import override_settings
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import generate_account_shard
+from painless.repository.reset import reset_tables
+from painless.repository.shard import (
+    derive_seed,
+    plan_shards,
+    run_shards
+)
+
+
+@override_settings(LANGUAGE_CODE='en')
+class ShardPlanTest(SimpleTestCase):
+    """
+    Test whether a dataset is split into reproducible shards.
+    ------
+
+    - testing that shards cover every row with seeds derived by index
+    - testing that derived seeds differ between shards and datasets
+    - testing that `run_shards` yields every result with one worker
+    """
+
+    def test_plan_shards(self):
+        """testing the offsets, sizes and seeds of a plan"""
+
+        shards = plan_shards(10, 4, seed=3)
+        actual = (
+            [(shard.index, shard.start, shard.count) for shard in shards],
+            [shard.seed for shard in shards],
+            plan_shards(10, 4, seed=3),
+        )
+        expected = (
+            [(0, 0, 4), (1, 4, 4), (2, 8, 2)],
+            [derive_seed(3, index) for index in range(3)],
+            shards,
+        )
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (shards, seeds, replanned) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_derive_seed(self):
+        """testing that seeds are distinct and fit in 63 bits"""
+
+        seeds = [derive_seed(seed, index)
+                 for seed in range(3) for index in range(3)]
+        actual = (len(set(seeds)), all(0 <= seed < 2 ** 63 for seed in seeds))
+        expected = (9, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (distinct, in range) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_run_shards(self):
+        """testing that every shard is run once"""
+
+        shards = plan_shards(5, 2, seed=0)
+        actual = list(run_shards(lambda shard: shard.index, shards))
+        expected = [0, 1, 2]
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual results are `{actual}` but expected is `{expected}`"
+        )
+
+
+@override_settings(LANGUAGE_CODE='en')
+class GenerateAccountShardTest(TransactionTestCase):
+    """
+    Test whether a seeded dataset is generated again row for row.
+    `generate_account_shard` closes the connections, hence
+    `TransactionTestCase`.
+    ------
+
+    - testing that two runs of the same seed write identical rows
+    - testing that `created` / `modified` come from the seed
+    """
+
+    SEED = 11
+
+    def generate(self):
+        """load a 7-user dataset in shards of 3 and read it back"""
+
+        generate = partial(generate_account_shard, seed=self.SEED, stride=3,
+                           user_first_id=1000, profile_first_id=2000,
+                           batch_size=2)
+        list(run_shards(generate, plan_shards(7, 3, self.SEED)))
+        return (
+            list(User.objects.order_by('pk').values_list()),
+            list(Profile.objects.order_by('pk').values_list()),
+        )
+
+    def test_rerun_is_identical(self):
+        """testing that a rerun of the same seed writes the same rows"""
+
+        first = self.generate()
+        reset_tables(User, Profile)
+        second = self.generate()
+        actual = (len(first[0]), len(first[1]), second)
+        expected = (7, 7, first)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (users, profiles, rerun) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
+
+    def test_timestamps(self):
+        """testing that `modified` follows the seeded `created`"""
+
+        self.generate()
+        users = list(User.objects.values_list(
+            'date_joined', 'created', 'modified'
+        ))
+        actual = (
+            all(created == date_joined for date_joined, created, _ in users),
+            all(created <= modified for _, created, modified in users),
+            all(created.year < 2023 for _, created, _ in users),
+        )
+        expected = (True, True, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (created on join, modified after, seeded) is "
+            f"`{actual}` but expected is `{expected}`"
+            )
@@ -0,0 +1,148 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import AccountDataGenerator
+from painless.repository.loader import BulkLoader
+from painless.repository.reset import reset_tables
+from painless.repository.snapshot import (
+    SnapshotError,
+    SnapshotTestMixin,
+    dump_snapshot,
+    load_snapshot,
+    read_manifest
+)
+
+SNAPSHOT_DIR = tempfile.mkdtemp()
+
+
+@override_settings(LANGUAGE_CODE='en', SNAPSHOT_DIR=SNAPSHOT_DIR)
+class UserSnapshotTest(SnapshotTestMixin, TestCase):
+    """
+    Test whether a dumped dataset snapshot restores the same rows.
+    ------
+
+    - testing the manifest of a dumped snapshot
+    - testing that `SnapshotTestMixin` restores every row
+    - testing that loading into non-empty tables is refused
+    - testing that a failed `replace=True` load keeps the old rows
+    - testing that `replace=True` refuses to empty tables it does not restore
+    """
+    snapshot = 'test-users'
+
+    @classmethod
+    def setUpClass(cls):
+        """creating and preparing data for testing"""
+
+        cls.SEED = 3
+        with override_settings(SNAPSHOT_DIR=SNAPSHOT_DIR), transaction.atomic():
+            generator = AccountDataGenerator(seed=cls.SEED)
+            for user_ids in generator.load_users(25, batch_size=10):
+                generator.create_profile(user_ids, batch_size=10,
+                                         disable_progress_bar=True)
+            cls.rows = cls.dump_rows()
+            dump_snapshot(cls.snapshot, [Profile, User], seed=cls.SEED,
+                          chunk_size=10)
+            transaction.set_rollback(True)
+        super(UserSnapshotTest, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(UserSnapshotTest, cls).tearDownClass()
+        shutil.rmtree(SNAPSHOT_DIR, ignore_errors=True)
+
+    @staticmethod
+    def dump_rows():
+        return (
+            list(User.objects.order_by('pk').values_list()),
+            list(Profile.objects.order_by('pk').values_list()),
+        )
+
+    def test_manifest(self):
+        """testing the seed, the load order and the row counts"""
+
+        manifest = read_manifest(self.snapshot)
+        actual = (
+            manifest['seed'],
+            [(entry['label'], entry['rows']) for entry in manifest['models']],
+        )
+        expected = (self.SEED, [('account.user', 25), ('account.profile', 25)])
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual manifest is `{actual}` but expected is `{expected}`"
+            )
+
+    def test_restored_rows(self):
+        """testing that the restored rows equal the dumped rows"""
+
+        actual = self.dump_rows()
+        expected = self.rows
+        self.assertEqual(
+            actual,
+            expected,
+            msg="Actual restored rows differ from the dumped rows"
+            )
+
+    def test_refuses_non_empty_tables(self):
+        """testing that loading twice raises `SnapshotError`"""
+
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.snapshot)
+
+    def test_replace(self):
+        """testing that `replace=True` empties the tables first"""
+
+        reset_tables(User, Profile)
+        User.objects.create(phone_number='09120000000')
+        load_snapshot(self.snapshot, replace=True)
+        actual = self.dump_rows()
+        expected = self.rows
+        self.assertEqual(
+            actual,
+            expected,
+            msg="Actual restored rows differ from the dumped rows"
+            )
+
+    def test_failed_replace_keeps_rows(self):
+        """testing that the tables are only emptied if the load succeeds"""
+
+        with mock.patch.object(BulkLoader, 'write_rows',
+                               side_effect=RuntimeError('load failed')):
+            with self.assertRaises(RuntimeError):
+                load_snapshot(self.snapshot, replace=True)
+        actual = self.dump_rows()
+        expected = self.rows
+        self.assertEqual(
+            actual,
+            expected,
+            msg="Actual rows differ from the rows before the failed load"
+            )
+
+    def test_replace_refuses_cascade(self):
+        """testing that rows referencing the snapshot need `cascade=True`"""
+
+        user = User.objects.get(pk=self.rows[0][0][0])
+        user.groups.add(Group.objects.create(name='staff'))
+        with self.assertRaises(SnapshotError):
+            load_snapshot(self.snapshot, replace=True)
+        memberships = User.groups.through.objects
+        refused = (memberships.count(), self.dump_rows() == self.rows)
+        load_snapshot(self.snapshot, replace=True, cascade=True)
+        actual = (refused, memberships.count(), self.dump_rows() == self.rows)
+        expected = ((1, True), 0, True)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (refused, memberships, restored) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
@@ -0,0 +1,55 @@
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from account.models import (
+    Profile,
+    User
+)
+from painless.repository.reset import dependency_order
+
+
+@override_settings(LANGUAGE_CODE='en')
+class UserTruncateTest(TestCase):
+    """
+    Test whether `TruncateMixin.truncate` empties the user tables.
+    ------
+
+    - testing the delete order of the dependency graph
+    - testing that referencing tables are emptied too
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """creating and preparing data for testing"""
+
+        super(UserTruncateTest, cls).setUpClass()
+        cls.users = [
+            User.objects.create(phone_number=f'0912000000{index}')
+            for index in range(3)
+        ]
+
+    def test_dependency_order(self):
+        """testing that profiles come before the users they point at"""
+
+        order = dependency_order([User])
+        actual = order.index(Profile) < order.index(User)
+        expected = True
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual delete order is `{order}` "
+            f"but Profile is expected before User"
+            )
+
+    def test_truncate(self):
+        """testing that users and their profiles are removed"""
+
+        User.truncate()
+        actual = (User.objects.count(), Profile.objects.count())
+        expected = (0, 0)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (users, profiles) is `{actual}` "
+            f"but expected is `{expected}`"
+            )
@@ -0,0 +1,129 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import (
+    SimpleTestCase,
+    TestCase
+)
+from django.test.utils import override_settings
+
+from account.models import User
+from account.repository.queryset.plans import (
+    PLAN_BASELINES_DIR,
+    load_plan_dataset,
+    user_queryset_plans
+)
+from painless.repository.explain import (
+    PlanBaselines,
+    compare_plans
+)
+
+
+def _shape(total_cost, *nodes):
+    return {
+        'total_cost': total_cost,
+        'rows': 1,
+        'nodes': [{'type': node_type, 'relation': relation}
+                  for node_type, relation in nodes],
+    }
+
+
+@override_settings(LANGUAGE_CODE='en')
+class ComparePlansTest(SimpleTestCase):
+    """
+    Test whether `compare_plans` reports plan regressions.
+    ------
+
+    - testing that a new sequential scan on a large table is reported
+    - testing that new sequential scans on small tables are not
+    - testing that a cost growth past the threshold is reported
+    - testing that an added prefetch query and its regressions are reported
+    """
+
+    def test_regressions(self):
+        """testing every rule on one baseline"""
+
+        baseline = _shape(100.0, ('Index Scan', 'account_user'),
+                          ('Seq Scan', 'account_profile'))
+        rows = {
+            'account_user': 50000, 'account_profile': 50000, 'django_site': 1
+        }
+        seq_scan = _shape(110.0, ('Seq Scan', 'account_user'))
+        small_seq_scan = _shape(110.0, ('Index Scan', 'account_user'),
+                                ('Seq Scan', 'django_site'))
+        cost = _shape(151.0, ('Index Scan', 'account_user'))
+        actual = (
+            len(compare_plans(baseline, seq_scan, rows)),
+            len(compare_plans(baseline, small_seq_scan, rows)),
+            len(compare_plans(baseline, cost, rows)),
+        )
+        expected = (1, 0, 1)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (seq scan, small seq scan, cost) problems are "
+            f"`{actual}` but expected is `{expected}`"
+            )
+
+    def test_prefetches(self):
+        """testing that prefetch queries are compared with the baseline"""
+
+        rows = {'account_user': 50000, 'account_address': 50000}
+        prefetch = _shape(10.0, ('Index Scan', 'account_address'))
+        baseline = dict(_shape(100.0, ('Index Scan', 'account_user')),
+                        prefetches=[prefetch])
+        added = dict(baseline, prefetches=[prefetch, prefetch])
+        seq_scan = dict(baseline, prefetches=[
+            _shape(10.0, ('Seq Scan', 'account_address'))
+        ])
+        actual = (
+            compare_plans(baseline, baseline, rows),
+            len(compare_plans(baseline, added, rows)),
+            len(compare_plans(baseline, seq_scan, rows)),
+            len(compare_plans(_shape(100.0), baseline, rows)),
+        )
+        expected = ([], 1, 1, 1)
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual (same, added, seq scan, no prefetch baseline) "
+            f"problems are `{actual}` but expected is `{expected}`"
+            )
+
+
+@skipUnless(connection.vendor == 'postgresql',
+            'EXPLAIN plans are compared on PostgreSQL only.')
+@override_settings(LANGUAGE_CODE='en')
+class UserQuerySetPlanTest(TestCase):
+    """
+    Test whether the `UserQuerySet` plans still match their baselines.
+    ------
+
+    - testing that no method gains a sequential scan on a large table
+    - testing that no method's estimated cost grows past the threshold
+    - testing that no method runs more queries than its baseline
+    - testing that every method has a baseline
+
+    Baselines are written by `manage.py update_plan_baselines --yes`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """creating and preparing data for testing"""
+
+        super(UserQuerySetPlanTest, cls).setUpTestData()
+        cls.baselines = PlanBaselines(PLAN_BASELINES_DIR)
+        load_plan_dataset()
+
+    def test_plans_match_baselines(self):
+        """testing every method whose relations are installed"""
+
+        querysets, _ = user_queryset_plans(User.objects.all())
+        actual = self.baselines.check(querysets)
+        expected = dict()
+        self.assertEqual(
+            actual,
+            expected,
+            msg=f"Actual plan regressions are `{actual}` "
+            f"but expected is `{expected}`"
+            )
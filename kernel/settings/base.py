@@ -5,6 +5,10 @@ import logging
 from decouple import config
 from sorl.thumbnail.log import ThumbnailLogHandler
 
+# `packages.py` is shadowed by the `packages` directory, so the project
+# settings are pulled in here.
+from kernel.settings.packages.project import *
+
 BASE_DIR = os.path.normpath(
     os.path.join(os.path.dirname(os.path.dirname(
         os.path.abspath(__file__))), os.pardir)
@@ -21,6 +25,8 @@ DEFAULT_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Resolves `request.ip_address` lazily and refuses blocked networks early
+    'painless.middlewares.GetIPMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -106,6 +112,12 @@ FIXTURE_DIRS = tuple(config('FIXTURE_TEST_DIRS'))
 # ############################### #
 #            LOGGING              #
 # ############################### #
-with open('logging.toml') as config_file:
-    config = toml.load(config_file)
-    # logging.config.dictConfig(config)
+# File handlers are wrapped in `painless.log.QueuedHandler`, so records are
+# written by a background thread instead of the request thread.
+with open(os.path.join(BASE_DIR, 'logging.toml')) as config_file:
+    LOGGING = toml.load(config_file)
+
+for handler in LOGGING.get('handlers', {}).values():
+    if 'filename' in handler:
+        handler['filename'] = os.path.join(BASE_DIR, handler['filename'])
+        os.makedirs(os.path.dirname(handler['filename']), exist_ok=True)
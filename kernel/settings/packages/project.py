@@ -0,0 +1,84 @@
+from decouple import config
+
+# ############################### #
+#           LAST LOGIN            #
+# ############################### #
+LAST_LOGIN_BUFFER = {
+    'ENABLED': config('LAST_LOGIN_BUFFER_ENABLED', default=False, cast=bool),
+    # Staleness window: seconds a login timestamp may stay in memory.
+    'FLUSH_INTERVAL': config('LAST_LOGIN_FLUSH_INTERVAL', default=30, cast=int),
+    'MAX_PENDING': config('LAST_LOGIN_MAX_PENDING', default=5000, cast=int),
+    'BATCH_SIZE': 1000,
+}
+
+# ############################### #
+#           IP ADDRESS            #
+# ############################### #
+# Proxies allowed to set `X-Forwarded-For`.
+TRUSTED_PROXIES = config('TRUSTED_PROXIES', default='127.0.0.1/32,::1/128',
+                         cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+# Networks refused by `GetIPMiddleware` from start-up.
+IP_BLOCKLIST = config('IP_BLOCKLIST', default='',
+                      cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+
+# ############################### #
+#               OTP               #
+# ############################### #
+OTP = {
+    'LENGTH': 6,
+    'TTL': config('OTP_TTL', default=120, cast=int),
+    # (codes, seconds)
+    'NUMBER_RATE': (3, 600),
+    'IP_RATE': (20, 3600),
+    'MAX_ATTEMPTS': config('OTP_MAX_ATTEMPTS', default=5, cast=int),
+    'MESSAGE': 'Your verification code is {code}',
+    'CACHE': 'default',
+}
+
+# ############################### #
+#               SMS               #
+# ############################### #
+# Dotted path of the SMS transport; sending fails until one is set.
+SMS_TRANSPORT = config('SMS_TRANSPORT', default='', cast=lambda v: v or None)
+SMS_FROM_NUMBER = config('SMS_FROM_NUMBER', default=None)
+
+# ############################### #
+#           THUMBNAIL             #
+# ############################### #
+THUMBNAIL_PIPELINE = {
+    'ENABLED': config('THUMBNAIL_PIPELINE_ENABLED', default=False, cast=bool),
+    'WORKERS': config('THUMBNAIL_PIPELINE_WORKERS', default=2, cast=int),
+    'CACHE': 'default',
+    'TIMEOUT': None,
+}
+
+# ############################### #
+#               SKU               #
+# ############################### #
+# Callable used as the default of `SKUMixin.sku`.
+SKU_GENERATOR = config('SKU_GENERATOR', default='painless.helper.sku.generate_sku')
+
+# ############################### #
+#          ROW CACHE              #
+# ############################### #
+REPOSITORY_CACHE = {
+    'ENABLED': config('REPOSITORY_CACHE_ENABLED', default=False, cast=bool),
+    'CACHE': 'default',
+    'TIMEOUT': 300,
+    'LOCAL_SIZE': 1024,
+}
+
+# ############################### #
+#           SNAPSHOTS             #
+# ############################### #
+# Directory of generated-dataset snapshots, relative to BASE_DIR.
+SNAPSHOT_DIR = config('SNAPSHOT_DIR', default='snapshots')
+
+# ############################### #
+#       GENERATED PASSWORDS       #
+# ############################### #
+# Known passwords shared by generated users, `<PREFIX><n>` for n < POOL_SIZE.
+GENERATED_PASSWORDS = {
+    'PREFIX': config('GENERATED_PASSWORDS_PREFIX', default='load-test-'),
+    'POOL_SIZE': config('GENERATED_PASSWORDS_POOL_SIZE', default=16, cast=int),
+}
@@ -16,13 +16,23 @@ PREPEND_WWW = config('PREPEND_WWW', cast=bool)
 #             EMAIL               #
 # ############################### #
 if config('EMAIL_DEBUG', cast=bool):
-    EMAIL_BACKEND = 'django.core.mail.backend.console.EmailBackend'
+    EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 else:
+    # Messages are queued and sent in batches over a reused SMTP connection.
+    EMAIL_BACKEND = 'painless.services.QueuedEmailBackend'
+    MAIL_QUEUE = {
+        'BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+        'MAX_RETRIES': config('MAIL_QUEUE_MAX_RETRIES', default=5, cast=int),
+        'BACKOFF': 1.0,
+        'MAX_BACKOFF': 60.0,
+        'IDLE_TIMEOUT': 30,
+    }
     EMAIL_HOST = config('EMAIL_HOST')
     EMAIL_PORT = config('EMAIL_PORT', cast=int)
     EMAIL_HOST_USER = config('EMAIL_HOST_USER')
     EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
-    EMAIL_USER_TLS = config('EMAIL_USER_TLS', default=True, cast=bool)
+    EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+    EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
     DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
     ADMINS = config('ADMINS', cast=lambda string: [s.strip() for s in string.split(',')])
 
@@ -55,6 +65,12 @@ FILE_UPLOAD_PERMISSIONS = 0o755
 FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o755
 FILE_UPLOAD_MAX_MEMORY_SIZE = config('FILE_UPLOAD_MAX_MEMORY_SIZE', cast=int)
 MAX_UPLOAD_SIZE = config('MAX_UPLOAD_SIZE', cast=int)
+# Stream every upload to FILE_UPLOAD_TEMP_DIR, hash it on the way and reject
+# a file once it passes MAX_UPLOAD_SIZE; the painless.files upload mixins
+# report it as a field error.
+FILE_UPLOAD_HANDLERS = [
+    'painless.files.HashingTemporaryFileUploadHandler',
+]
 
 # ############################### #
 #       SSL CONFIGURATION         #
@@ -121,6 +137,7 @@ with open(os.path.normpath('deploy/.confidential/RS512.key'), mode='r') as priva
             'ROTATE_REFRESH_TOKENS': config('JWT_ROTATE_REFRESH_TOKENS', cast=bool),
             'BLACKLIST_AFTER_ROTATION': config('JWT_BLACKLIST_AFTER_ROTATION', cast=bool),
             'UPDATE_LAST_LOGIN': False,
+            'TOKEN_OBTAIN_SERIALIZER': 'account.api.serializers.LastLoginTokenObtainPairSerializer',
 
             'ALGORITHM': 'RS512',
             'SIGNING_KEY': private_key,
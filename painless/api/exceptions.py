@@ -1,3 +1,5 @@
+import math
+
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext
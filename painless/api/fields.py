@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+from painless.helper.jalali import (
+    DEFAULT_FORMAT,
+    to_solar
+)
+
+
+class SolarDateField(serializers.ReadOnlyField):
+    """
+    Read-only field that renders a date or datetime attribute in the Jalali
+    calendar, with the same output as `TimeStampMixin.get_solar_created`.
+
+        created_solar = SolarDateField(source='created')
+    """
+
+    def __init__(self, fmt=DEFAULT_FORMAT, **kwargs):
+        self.fmt = fmt
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return to_solar(value, self.fmt)
@@ -0,0 +1,10 @@
+from .mixins import (
+    UploadErrorsFormMixin,
+    UploadErrorsSerializerMixin
+)
+from .storage import DeduplicatingFileSystemStorage
+from .uploadhandler import (
+    HashingTemporaryFileUploadHandler,
+    file_sha256,
+    upload_errors
+)
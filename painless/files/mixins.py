@@ -0,0 +1,51 @@
+from rest_framework import serializers
+from rest_framework.fields import get_error_detail
+
+from .uploadhandler import upload_errors
+
+
+class UploadErrorsFormMixin:
+    """
+    Form mixin reporting the uploads `HashingTemporaryFileUploadHandler`
+    rejected as errors of their fields, instead of a missing file.
+
+        form = DocumentForm(request.POST, request.FILES,
+                            upload_errors=upload_errors(request))
+    """
+
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_errors = upload_errors or dict()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, error in self.upload_errors.items():
+            if name in self.fields:
+                # Replaces the `required` error of the missing file.
+                self._errors.pop(name, None)
+                self.add_error(name, error)
+        return cleaned_data
+
+
+class UploadErrorsSerializerMixin:
+    """
+    Serializer mixin reporting the uploads `HashingTemporaryFileUploadHandler`
+    rejected in `context['request']` as errors of their fields, instead of a
+    missing file.
+    """
+
+    def to_internal_value(self, data):
+        rejected = {
+            name: get_error_detail(error)
+            for name, error in upload_errors(self.context.get('request')).items()
+            if name in self.fields
+        }
+        try:
+            value = super().to_internal_value(data)
+        except serializers.ValidationError as error:
+            if not rejected or not isinstance(error.detail, dict):
+                raise
+            raise serializers.ValidationError({**error.detail, **rejected})
+        if rejected:
+            raise serializers.ValidationError(rejected)
+        return value
@@ -0,0 +1,32 @@
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+from .uploadhandler import file_sha256
+
+
+class DeduplicatingFileSystemStorage(FileSystemStorage):
+    """
+    Content-addressed file system storage.
+
+    A file is saved as `<upload dir>/<sha[:2]>/<sha><ext>`. When that name
+    already exists the same bytes are stored, so nothing is written and the
+    existing name is returned. The digest comes from
+    `HashingTemporaryFileUploadHandler`, so an upload is never read twice.
+
+    Files are shared between rows: do not delete a file from a model's
+    `post_delete` while other rows may reference the same name.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            return super().save(name, content, max_length=max_length)
+        digest = file_sha256(content)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(directory, digest[:2], f'{digest}{extension}')
+        if self.exists(name):
+            return name.replace('\\', '/')
+        return super().save(name, content, max_length=max_length)
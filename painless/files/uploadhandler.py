@@ -0,0 +1,101 @@
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import gettext_lazy as _
+
+logger = logging.getLogger(__name__)
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams every uploaded file into `FILE_UPLOAD_TEMP_DIR`, whatever its
+    size, and hashes it on the way.
+
+    A worker only holds one `chunk_size` chunk per upload in memory. The
+    SHA-256 digest is available as `uploaded_file.sha256` when the request
+    is parsed, so storages can deduplicate without reading the file again.
+
+    An upload growing past `MAX_UPLOAD_SIZE` bytes is abandoned as soon as
+    the limit is crossed: the temporary file is removed, the rest of it is
+    read and thrown away so the other fields of the request still parse,
+    and the file is left out of `request.FILES`. The reason is recorded in
+    `request.upload_errors`, see `upload_errors`; forms and serializers
+    built with `UploadErrorsFormMixin` or `UploadErrorsSerializerMixin`
+    report it as an error of the field. Bound the request body at the web
+    server to stop reading oversized requests altogether.
+    """
+    chunk_size = 64 * 2 ** 10
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = getattr(settings, 'MAX_UPLOAD_SIZE', None)
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+        self.received = 0
+        self.rejected = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rejected:
+            return None
+        self.received += len(raw_data)
+        if self.max_size is not None and self.received > self.max_size:
+            logger.warning('Upload %s exceeded %d bytes and was rejected.',
+                           self.file_name, self.max_size)
+            if self.request is not None:
+                if not hasattr(self.request, 'upload_errors'):
+                    self.request.upload_errors = dict()
+                self.request.upload_errors[self.field_name] = ValidationError(
+                    _('Ensure %(name)s is at most %(limit)s.'),
+                    code='file_too_large',
+                    params={'name': self.file_name,
+                            'limit': filesizeformat(self.max_size)},
+                )
+            self.rejected = True
+            self.upload_interrupted()
+            return None
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.rejected:
+            return None
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.hasher.hexdigest()
+        return uploaded_file
+
+
+def upload_errors(request) -> dict:
+    """
+    `{field name: ValidationError}` of the uploads of `request` that
+    `HashingTemporaryFileUploadHandler` rejected; empty when there is none.
+    """
+    return getattr(request, 'upload_errors', None) or dict()
+
+
+def file_sha256(
+        file, chunk_size: int = HashingTemporaryFileUploadHandler.chunk_size
+) -> str:
+    """
+    SHA-256 of `file`, taken from the upload handler when it already has it.
+
+    Files that did not come through `HashingTemporaryFileUploadHandler` are
+    read once, in chunks.
+    """
+    digest = getattr(file, 'sha256', None)
+    if digest is not None:
+        return digest
+    hasher = hashlib.sha256()
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    for chunk in file.chunks(chunk_size):
+        hasher.update(chunk)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    file.sha256 = hasher.hexdigest()
+    return file.sha256
@@ -0,0 +1,60 @@
+"""Small helpers shared by the `benchmark_*` management commands."""
+import time
+import tracemalloc
+
+
+class Stopwatch:
+    """
+    Measure the wall time of a block.
+
+        with Stopwatch() as watch:
+            ...
+        watch.elapsed  # seconds
+    """
+
+    def __enter__(self):
+        self.elapsed = None
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self._started
+
+    def per_op(self, operations: int) -> float:
+        """Microseconds per operation."""
+        return self.elapsed * 1e6 / max(operations, 1)
+
+    def rate(self, operations: int) -> float:
+        """Operations per second."""
+        return operations / self.elapsed if self.elapsed else float('inf')
+
+
+class PeakMemory:
+    """
+    Measure the peak Python heap allocated inside a block, in bytes.
+
+    Uses `tracemalloc`, so only allocations made through Python's
+    allocator are counted and the block runs noticeably slower.
+    """
+
+    def __enter__(self):
+        self.peak = None
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc_info):
+        self.peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+
+def human_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024:
+            return f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}TB'
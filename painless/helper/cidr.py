@@ -0,0 +1,145 @@
+import ipaddress
+import threading
+import time
+from typing import (
+    Optional,
+    Union
+)
+
+Network = Union[str, ipaddress.IPv4Network, ipaddress.IPv6Network]
+Address = Union[str, ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+# Node layout: [child for bit 0, child for bit 1, expiry or _EMPTY]
+_ZERO, _ONE, _EXPIRY = 0, 1, 2
+_EMPTY = object()
+FOREVER = float('inf')
+PRUNE_INTERVAL = 60
+
+
+class CIDRTrie:
+    """
+    Binary radix trie of IPv4 and IPv6 networks.
+
+    A lookup walks at most one node per bit of the address (32 for IPv4,
+    128 for IPv6) and stops at the first stored prefix that contains it, so
+    the cost does not grow with the number of networks stored.
+
+    Every network carries an expiry (a `time.time()` value, or `FOREVER`);
+    expired networks stop matching at once and are pruned from the trie
+    during a later `add`.
+    """
+
+    def __init__(self):
+        self._roots = {4: [None, None, _EMPTY], 6: [None, None, _EMPTY]}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pruned_at = time.time()
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def add(self, network: Network, ttl: Optional[float] = None) -> None:
+        """
+        Store `network` (e.g. `'10.0.0.0/8'` or a single address).
+
+        PARAMS
+        ------
+        network: str | IPv4Network | IPv6Network
+            the network or address to store.
+        ttl: float = None
+            seconds until the network expires, `None` keeps it forever.
+        """
+        network = ipaddress.ip_network(network, strict=False)
+        expiry = FOREVER if ttl is None else time.time() + ttl
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        with self._lock:
+            node = self._roots[network.version]
+            for depth in range(network.prefixlen):
+                bit = (bits >> (width - 1 - depth)) & 1
+                if node[bit] is None:
+                    node[bit] = [None, None, _EMPTY]
+                node = node[bit]
+            if node[_EXPIRY] is _EMPTY:
+                self._size += 1
+                node[_EXPIRY] = expiry
+            else:
+                node[_EXPIRY] = max(node[_EXPIRY], expiry)
+            now = time.time()
+            if now - self._pruned_at > PRUNE_INTERVAL:
+                self._pruned_at = now
+                self._prune(now)
+
+    def remove(self, network: Network) -> bool:
+        """Forget `network`; return whether it was stored."""
+        network = ipaddress.ip_network(network, strict=False)
+        bits = int(network.network_address)
+        width = network.max_prefixlen
+        with self._lock:
+            node = self._roots[network.version]
+            for depth in range(network.prefixlen):
+                node = node[(bits >> (width - 1 - depth)) & 1]
+                if node is None:
+                    return False
+            if node[_EXPIRY] is _EMPTY:
+                return False
+            node[_EXPIRY] = _EMPTY
+            self._size -= 1
+            return True
+
+    def match(self, address: Address) -> bool:
+        """Return whether `address` is inside a stored, unexpired network."""
+        if not self._size:
+            return False
+        try:
+            address = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        now = time.time()
+        bits = int(address)
+        width = address.max_prefixlen
+        node = self._roots[address.version]
+        depth = 0
+        while node is not None:
+            expiry = node[_EXPIRY]
+            if expiry is not _EMPTY and expiry > now:
+                return True
+            if depth == width:
+                return False
+            node = node[(bits >> (width - 1 - depth)) & 1]
+            depth += 1
+        return False
+
+    __contains__ = match
+
+    @staticmethod
+    def is_address(value) -> bool:
+        """Return whether `value` parses as an IPv4 or IPv6 address."""
+        try:
+            ipaddress.ip_address(value)
+        except ValueError:
+            return False
+        return True
+
+    def _prune(self, now: float) -> None:
+        for root in self._roots.values():
+            self._prune_node(root, now)
+
+    def _prune_node(self, node, now: float) -> bool:
+        """Drop expired entries below `node`; return whether it is now empty."""
+        for bit in (_ZERO, _ONE):
+            child = node[bit]
+            if child is not None and self._prune_node(child, now):
+                node[bit] = None
+        if node[_EXPIRY] is not _EMPTY and node[_EXPIRY] <= now:
+            node[_EXPIRY] = _EMPTY
+            self._size -= 1
+        return (
+            node[_ZERO] is None and node[_ONE] is None
+            and node[_EXPIRY] is _EMPTY
+        )
@@ -0,0 +1,114 @@
+import struct
+from typing import (
+    NamedTuple,
+    Optional
+)
+
+# Bytes needed to identify every supported format and, except for JPEG,
+# to read its dimensions.
+HEAD_SIZE = 32
+# JPEG segments are skipped with `seek`, this bounds how far into the file
+# the frame header is looked for.
+JPEG_SCAN_LIMIT = 1024 * 1024
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Start-of-frame markers; 0xC4, 0xC8 and 0xCC share the range but are not frames.
+_JPEG_SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field.
+_JPEG_STANDALONE = frozenset(range(0xD0, 0xDA)) | {0x01}
+
+
+class ImageHeader(NamedTuple):
+    format: str
+    width: int
+    height: int
+
+
+def read_image_header(file) -> Optional[ImageHeader]:
+    """
+    Identify a PNG, GIF, JPEG, WebP or BMP image from its header.
+
+    Only the first `HEAD_SIZE` bytes are read, plus the segment headers of
+    a JPEG up to its frame header, whatever the size of the file. The file
+    position is restored afterwards.
+
+    PARAMS
+    ------
+    file: file-like
+        a seekable binary file.
+
+    Returns `None` when the format is not recognised or the header is
+    truncated.
+    """
+    position = file.tell()
+    try:
+        file.seek(0)
+        head = file.read(HEAD_SIZE)
+        if head[:2] == b'\xff\xd8':
+            return _jpeg(file)
+        return _from_head(head)
+    except struct.error:
+        return None
+    finally:
+        file.seek(position)
+
+
+def _from_head(head: bytes) -> Optional[ImageHeader]:
+    if head[:8] == _PNG_SIGNATURE and head[12:16] == b'IHDR':
+        width, height = struct.unpack('>II', head[16:24])
+        return ImageHeader('PNG', width, height)
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        width, height = struct.unpack('<HH', head[6:10])
+        return ImageHeader('GIF', width, height)
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return _webp(head)
+    if head[:2] == b'BM':
+        if struct.unpack('<I', head[14:18])[0] == 12:
+            width, height = struct.unpack('<HH', head[18:22])
+        else:
+            width, height = struct.unpack('<ii', head[18:26])
+        return ImageHeader('BMP', abs(width), abs(height))
+    return None
+
+
+def _webp(head: bytes) -> Optional[ImageHeader]:
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and head[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', head[26:30])
+        return ImageHeader('WEBP', width & 0x3FFF, height & 0x3FFF)
+    # `int.from_bytes` accepts short slices, so the lengths are checked.
+    if chunk == b'VP8L' and head[20:21] == b'\x2f' and len(head) >= 25:
+        bits = int.from_bytes(head[21:25], 'little')
+        return ImageHeader(
+            'WEBP', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        )
+    if chunk == b'VP8X' and len(head) >= 30:
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return ImageHeader('WEBP', width, height)
+    return None
+
+
+def _jpeg(file) -> Optional[ImageHeader]:
+    file.seek(2)
+    while file.tell() < JPEG_SCAN_LIMIT:
+        byte = file.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            # Not at a marker: the stream is corrupt.
+            return None
+        marker = file.read(1)
+        while marker == b'\xff':
+            marker = file.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in _JPEG_STANDALONE:
+            continue
+        length = struct.unpack('>H', file.read(2))[0]
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack('>xHH', file.read(5))
+            return ImageHeader('JPEG', width, height)
+        file.seek(length - 2, 1)
+    return None
@@ -0,0 +1,140 @@
+import re
+from collections import OrderedDict
+from datetime import (
+    date,
+    datetime
+)
+from threading import Lock
+from typing import (
+    Iterable,
+    List,
+    Optional,
+    Union
+)
+
+from khayyam import JalaliDatetime
+from khayyam.formatting.constants import FORMAT_DIRECTIVE_REGEX
+from khayyam.formatting.directives import DATE_FORMAT_DIRECTIVES
+
+DEFAULT_FORMAT = '%d %B %Y'
+CACHE_SIZE = 4096
+
+_DAY_DIRECTIVES = frozenset(directive.key for directive in DATE_FORMAT_DIRECTIVES)
+
+
+class SolarCache:
+    """
+    Bounded LRU of rendered Jalali strings keyed by `(gregorian date, format)`.
+
+    Only formats made of date directives are cached: their output depends on
+    the calendar day alone, so every timestamp of the same day shares one
+    entry. Formats with time directives are rendered on every call.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._cacheable = dict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_cacheable(self, fmt: str) -> bool:
+        """Return whether `fmt` only uses day-granularity directives."""
+        cacheable = self._cacheable.get(fmt)
+        if cacheable is None:
+            matches = re.findall(FORMAT_DIRECTIVE_REGEX, fmt)
+            keys = {match[1:] for match in matches}
+            cacheable = self._cacheable[fmt] = keys <= _DAY_DIRECTIVES
+        return cacheable
+
+    def render(self, value: Union[date, datetime], fmt: str) -> str:
+        if not self.is_cacheable(fmt):
+            return JalaliDatetime(value).strftime(fmt)
+        key = (value.date() if isinstance(value, datetime) else value, fmt)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+        result = JalaliDatetime(value).strftime(fmt)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+solar_cache = SolarCache()
+
+
+def to_solar(value: Optional[Union[date, datetime]],
+             fmt: str = DEFAULT_FORMAT) -> Optional[str]:
+    """
+    Render a gregorian date or datetime as a Jalali string.
+
+    The output is identical to `JalaliDatetime(value).strftime(fmt)`.
+
+    PARAMS
+    ------
+    value: date | datetime | None
+        the value to convert, `None` is returned unchanged.
+    fmt: str
+        a khayyam `strftime` format, default `'%d %B %Y'`.
+    """
+    if value is None:
+        return None
+    return solar_cache.render(value, fmt)
+
+
+def to_solar_batch(values: Iterable[Optional[Union[date, datetime]]],
+                   fmt: str = DEFAULT_FORMAT) -> List[Optional[str]]:
+    """
+    Render a whole column of dates at once.
+
+    Each distinct calendar day is converted once, however many rows share
+    it, so a changelist page or a serializer `many=True` pass costs one
+    conversion per day instead of one per row.
+
+    PARAMS
+    ------
+    values: iterable of date | datetime | None
+        the column to convert, `None` entries stay `None`.
+    fmt: str
+        a khayyam `strftime` format, default `'%d %B %Y'`.
+    """
+    values = list(values)
+    if not solar_cache.is_cacheable(fmt):
+        return [
+            None if value is None else JalaliDatetime(value).strftime(fmt)
+            for value in values
+        ]
+    rendered = dict()
+    result = list()
+    for value in values:
+        if value is None:
+            result.append(None)
+            continue
+        day = value.date() if isinstance(value, datetime) else value
+        text = rendered.get(day)
+        if text is None:
+            text = rendered[day] = solar_cache.render(value, fmt)
+        result.append(text)
+    return result
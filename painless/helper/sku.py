@@ -0,0 +1,78 @@
+import secrets
+import time
+from typing import List
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Crockford's base32: no I, L, O or U, so codes are easy to read out.
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+TIME_LENGTH = 10
+RANDOM_LENGTH = 16
+SKU_LENGTH = TIME_LENGTH + RANDOM_LENGTH
+
+
+def _encode(number: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        number, index = divmod(number, 32)
+        chars.append(ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
+def generate_sku(timestamp_ms: int = None) -> str:
+    """
+    A 26-character, time-ordered and unguessable SKU.
+
+    The first 10 characters encode the creation time in milliseconds and
+    the last 16 carry 80 random bits (the ULID layout, in Crockford's
+    base32). New SKUs sort after older ones, so inserts land on the right
+    edge of the unique index instead of splitting pages all over it, and
+    the fixed width keeps index entries small.
+
+    PARAMS
+    ------
+    timestamp_ms: int = None
+        creation time in milliseconds since the epoch, default now.
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    return (
+        _encode(timestamp_ms, TIME_LENGTH)
+        + _encode(secrets.randbits(80), RANDOM_LENGTH)
+    )
+
+
+def allocate_skus(count: int) -> List[str]:
+    """
+    `count` SKUs for a `bulk_create`, sorted so the batch is inserted in
+    index order.
+
+        for obj, sku in zip(objs, allocate_skus(len(objs))):
+            obj.sku = sku
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    prefix = _encode(timestamp_ms, TIME_LENGTH)
+    randbits = secrets.randbits
+    return sorted(
+        prefix + _encode(randbits(80), RANDOM_LENGTH) for _ in range(count)
+    )
+
+
+def default_sku() -> str:
+    """
+    Default of `SKUMixin.sku`: calls the generator named by the
+    `SKU_GENERATOR` setting (`generate_sku` when unset).
+    """
+    return _get_generator()()
+
+
+_generators = dict()
+
+
+def _get_generator():
+    path = getattr(settings, 'SKU_GENERATOR', 'painless.helper.sku.generate_sku')
+    generator = _generators.get(path)
+    if generator is None:
+        generator = _generators[path] = import_string(path)
+    return generator
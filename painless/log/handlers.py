@@ -0,0 +1,205 @@
+"""
+Logging handlers that keep file I/O off the request thread.
+
+`QueuedHandler` wraps an ordinary handler (the *target*). The calling
+thread only appends the record to a bounded in-memory buffer; a background
+thread drains the buffer in batches, formats the records and writes each
+batch with one write and one flush. When the buffer is full new records
+are dropped and counted instead of blocking the request.
+
+It is configured through `dictConfig` like any other handler; keys that
+`QueuedHandler` does not know are passed to the target:
+
+    [handlers.AuthHandler]
+    class = "painless.log.QueuedHandler"
+    target = "logging.handlers.RotatingFileHandler"
+    filename = "logs/auth.log"
+    maxBytes = 104857600
+    backupCount = 10
+    capacity = 10000
+    formatter = "AuthFormatter"
+"""
+import collections
+import logging
+import logging.handlers
+import os
+import threading
+import time
+
+from django.utils.module_loading import import_string
+
+
+class QueuedHandler(logging.Handler):
+    """
+    Hand records to a background writer thread through a bounded buffer.
+
+    Records are formatted by the writer thread, so the message of a record
+    is built from its `args` after the logging call has returned. Pass
+    values, not objects that are mutated right after logging.
+
+    PARAMS
+    ------
+    target: str | logging.Handler
+        the handler doing the I/O, or the dotted path of its class.
+    capacity: int = 10000
+        maximum number of records waiting in memory.
+    batch_size: int = 500
+        maximum number of records written per flush.
+    flush_interval: float = 0.2
+        seconds the writer sleeps when the buffer is empty.
+    **target_kwargs:
+        passed to the target class when `target` is a path.
+    """
+
+    def __init__(self, target='logging.StreamHandler', capacity=10000,
+                 batch_size=500, flush_interval=0.2, level=logging.NOTSET,
+                 **target_kwargs):
+        super().__init__(level)
+        if isinstance(target, str):
+            target = import_string(target)(**target_kwargs)
+        self.target = target
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        # `deque.append` and `deque.popleft` are atomic, so the request
+        # thread never waits on a lock held by the writer.
+        self._buffer = collections.deque()
+        # Only taken by records dropped from a full buffer.
+        self._dropped_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closing = False
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            self._start_writer()
+        if len(self._buffer) >= self.capacity:
+            with self._dropped_lock:
+                self.dropped += 1
+            return
+        self._buffer.append(record)
+
+    def handle(self, record):
+        # Skip `Handler.handle`'s lock, `emit` is lock-free.
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def flush(self):
+        """Block until every buffered record has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        while self._buffer or not self._idle.is_set():
+            self._wakeup.set()
+            time.sleep(0.001)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._closing = True
+            self._wakeup.set()
+            self._thread.join()
+        self._thread = None
+        self.target.close()
+        super().close()
+
+    def stats(self) -> dict:
+        return {
+            'buffered': len(self._buffer),
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+        }
+
+    def _start_writer(self):
+        # Started lazily and per process so that pre-forking servers get
+        # a writer in every worker.
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f'log-writer-{self.name or id(self)}',
+                daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self):
+        while True:
+            if not self._buffer:
+                if self._closing:
+                    return
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                continue
+            self._idle.clear()
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+            except IndexError:
+                pass
+            try:
+                self._write(batch)
+            except Exception:
+                self.target.handleError(batch[-1])
+            finally:
+                self._idle.set()
+
+    def _write(self, records):
+        target = self.target
+        if not isinstance(target, logging.StreamHandler):
+            for record in records:
+                target.handle(record)
+            self.written += len(records)
+            self.batches += 1
+            return
+
+        chunks = []
+        for record in records:
+            if record.levelno < target.level or not target.filter(record):
+                continue
+            try:
+                chunks.append(target.format(record) + target.terminator)
+            except Exception:
+                target.handleError(record)
+        if not chunks:
+            return
+        text = ''.join(chunks)
+
+        target.acquire()
+        try:
+            if target.stream is None:
+                target.stream = target._open()
+            if self._should_rollover(target, records[0], len(text)):
+                target.doRollover()
+            target.stream.write(text)
+            target.stream.flush()
+        except Exception:
+            target.handleError(records[-1])
+        finally:
+            target.release()
+        self.written += len(chunks)
+        self.batches += 1
+
+    @staticmethod
+    def _should_rollover(target, record, size) -> bool:
+        if isinstance(target, logging.handlers.RotatingFileHandler):
+            if target.maxBytes <= 0:
+                return False
+            return target.stream.tell() + size >= target.maxBytes
+        if isinstance(target, logging.handlers.BaseRotatingHandler):
+            return target.shouldRollover(record)
+        return False
@@ -0,0 +1,109 @@
+import resource
+
+from django.core.management.base import BaseCommand
+from django.db import (
+    connection,
+    models
+)
+
+from painless.helper.benchmark import (
+    Stopwatch,
+    human_bytes
+)
+from painless.repository.base import BaseDataGenerator
+from painless.repository.codes import UniqueCodeGenerator
+from painless.repository.loader import BulkLoader
+
+
+class Command(BaseCommand):
+    """Unique Code Benchmark
+
+    Generate unique codes with `UniqueCodeGenerator`, alone and inserted
+    into a scratch table with a unique `code` column, twice: the second run checks
+    every chunk against the codes of the first. Also times the set-union
+    loop `get_unique_hashes_list` used before on `--legacy-count` codes.
+    Memory is reported as the growth of the process' peak RSS, which stays
+    bounded by one chunk whatever `--count` is.
+    """
+    help = 'Benchmark generating and inserting unique codes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count',
+                            type=int,
+                            default=10000000,
+                            help='Codes generated and inserted per run.'
+                            )
+        parser.add_argument('--length',
+                            type=int,
+                            default=12,
+                            help='Characters per code.'
+                            )
+        parser.add_argument('--legacy-count',
+                            type=int,
+                            default=100000,
+                            help='Codes generated by the set-union loop.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        generator = UniqueCodeGenerator(length=kwargs['length'])
+        rss = self.peak_rss()
+        with Stopwatch() as watch:
+            for _ in generator.codes(kwargs['count']):
+                pass
+        self.stdout.write(f'{"generate":<12} '
+                          f'{watch.rate(kwargs["count"]):10.0f} codes/s  '
+                          f'peak RSS +{human_bytes(self.peak_rss() - rss)}')
+
+        model = self.scratch_model()
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            for label, check in (('empty table', None), ('checked', model)):
+                generator = UniqueCodeGenerator(length=kwargs['length'],
+                                                model=check)
+                loader = BulkLoader(model, batch_size=10000)
+                rss = self.peak_rss()
+                with Stopwatch() as watch:
+                    for chunk in generator.codes(kwargs['count']):
+                        loader.write(model(code=code) for code in chunk)
+                peak = human_bytes(self.peak_rss() - rss)
+                self.stdout.write(f'{label:<12} '
+                                  f'{watch.rate(kwargs["count"]):10.0f} '
+                                  f'codes/s  peak RSS +{peak}')
+            stored = model.objects.count()
+            distinct = model.objects.values('code').distinct().count()
+            self.stdout.write(f'{"stored":<12} {stored:10d} codes, '
+                              f'{distinct} distinct')
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+
+        with Stopwatch() as watch:
+            self.legacy(kwargs['legacy_count'])
+        self.stdout.write(f'{"set union":<12} '
+                          f'{watch.rate(kwargs["legacy_count"]):10.0f} codes/s')
+
+    @staticmethod
+    def legacy(total):
+        generator = BaseDataGenerator()
+        hash_set = {generator.get_random_secret(12) for _ in range(total)}
+        while len(hash_set) < total:
+            hash_set = set.union(
+                hash_set, {generator.get_random_secret(12) for _ in range(10)}
+            )
+        return list(hash_set)[:total]
+
+    @staticmethod
+    def peak_rss():
+        # ru_maxrss is in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    @staticmethod
+    def scratch_model():
+        attrs = {
+            '__module__': __name__,
+            'code': models.CharField(max_length=64, unique=True),
+            'Meta': type('Meta', (), {'app_label': 'painless',
+                                      'db_table': 'benchmark_codes'}),
+        }
+        return type('BenchmarkCode', (models.Model,), attrs)
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django_countries.fields import CountryField
+from mimesis import (
+    Datetime,
+    Numeric,
+    Person
+)
+
+from painless.helper.benchmark import Stopwatch
+from painless.repository.base import BaseDataGenerator
+
+
+class Command(BaseCommand):
+    """Data Generator Benchmark
+
+    Generate the columns of a user row three ways and report values per
+    second for each: a mimesis provider built per value (how
+    `BaseDataGenerator` used to work), the generator's shared providers one
+    value at a time, and the `*_batch(n)` column methods.
+    """
+    help = ('Compare per-call providers, shared providers and batch columns '
+            'of BaseDataGenerator.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows',
+                            type=int,
+                            default=100000,
+                            help='Values generated per column and method.'
+                            )
+        parser.add_argument('--seed',
+                            type=int,
+                            default=None,
+                            help='Seed of the generator.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        rows = kwargs['rows']
+        generator = BaseDataGenerator(seed=kwargs['seed'])
+        columns = (
+            ('first_name',
+             lambda: Person().first_name(),
+             generator.get_random_first_name,
+             generator.get_random_first_name_batch),
+            ('email',
+             lambda: Person().email(),
+             generator.get_random_email,
+             generator.get_random_email_batch),
+            ('job',
+             lambda: Person().occupation(),
+             generator.get_random_job,
+             generator.get_random_job_batch),
+            ('country',
+             lambda: tuple(CountryField().countries)[0][0],
+             generator.get_random_country,
+             generator.get_random_country_batch),
+            ('boolean',
+             generator.get_random_boolean,
+             generator.get_random_boolean,
+             generator.get_random_boolean_batch),
+            ('number',
+             lambda: Numeric().integer_number(start=-100, end=1000),
+             generator.get_random_number,
+             generator.get_random_number_batch),
+            ('datetime',
+             lambda: Datetime().datetime(start=1980, end=2022),
+             lambda: generator.get_random_datetime(1980, 2022),
+             lambda count: generator.get_random_datetime_batch(
+                 count, 1980, 2022)),
+        )
+        self.stdout.write(f'{"column":<12} {"per-call":>12} {"shared":>12} '
+                          f'{"batch":>12}  values/s')
+        for label, per_call, shared, batch in columns:
+            rates = list()
+            for scalar in (per_call, shared):
+                with Stopwatch() as watch:
+                    for _ in range(rows):
+                        scalar()
+                rates.append(watch.rate(rows))
+            with Stopwatch() as watch:
+                batch(rows)
+            rates.append(watch.rate(rows))
+            self.stdout.write(f'{label:<12} '
+                              + ' '.join(f'{rate:12.0f}' for rate in rates)
+                              + f'  x{rates[2] / rates[0]:.0f}')
@@ -0,0 +1,126 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import (
+    connection,
+    transaction
+)
+
+from painless.helper.benchmark import Stopwatch
+from painless.models.mixins import (
+    CountryProvinceCityMixin,
+    CustomerDetailsMixin,
+    LogisticCostMixin,
+    TitleSlugMixin
+)
+
+
+class Command(BaseCommand):
+    """Hydration Benchmark
+
+    Fill a scratch table whose model uses the four help-text mixins
+    (`TitleSlugMixin`, `CountryProvinceCityMixin`, `CustomerDetailsMixin`,
+    `LogisticCostMixin`) and time `list(Model.objects.all())`:
+    - on the model itself, whose help texts are set once by `class_prepared`;
+    - on a proxy that rewrites the help texts in `__init__`, as the mixins
+      did before, on every hydrated row.
+    """
+    help = 'Measure queryset hydration throughput of the help-text mixins.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows',
+                            type=int,
+                            default=100000,
+                            help='Rows inserted and hydrated.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=1000,
+                            help='Objects per bulk_create.'
+                            )
+        parser.add_argument('--repeat',
+                            type=int,
+                            default=3,
+                            help='Hydrations per model, the fastest is reported.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        model = self.scratch_model()
+        legacy = self.legacy_model(model)
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            rows = kwargs['rows']
+            with Stopwatch() as watch:
+                self.fill(model, rows, kwargs['batch_size'])
+            self.stdout.write(f'{"insert":<24} {watch.rate(rows):10.0f} rows/s')
+
+            for label, hydrated in (('class_prepared', model),
+                                    ('per-instance __init__', legacy)):
+                best = None
+                for _ in range(kwargs['repeat']):
+                    with Stopwatch() as watch:
+                        list(hydrated.objects.all())
+                    if best is None or watch.elapsed < best.elapsed:
+                        best = watch
+                self.stdout.write(f'{label:<24} {best.rate(rows):10.0f} rows/s'
+                                  f'  {best.per_op(rows):8.2f} us/row')
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+
+    @staticmethod
+    def scratch_model():
+        # Named `Order` so every mixin has a model-specific help text.
+        attrs = {
+            '__module__': __name__,
+            'Meta': type('Meta', (), {'app_label': 'painless',
+                                      'db_table': 'benchmark_hydration'}),
+        }
+        bases = (TitleSlugMixin, CountryProvinceCityMixin,
+                 CustomerDetailsMixin, LogisticCostMixin)
+        return type('Order', bases, attrs)
+
+    @staticmethod
+    def legacy_model(model):
+        help_texts = dict()
+        for mixin in (TitleSlugMixin, CountryProvinceCityMixin,
+                      CustomerDetailsMixin, LogisticCostMixin):
+            help_texts.update(mixin.get_dynamic_help_texts(model))
+
+        def __init__(self, *args, **kwargs):
+            super(legacy, self).__init__(*args, **kwargs)
+            for field_name, help_text in help_texts.items():
+                getattr(self.__class__, field_name).field.help_text = help_text
+
+        attrs = {
+            '__module__': __name__,
+            '__init__': __init__,
+            'Meta': type('Meta', (), {'app_label': 'painless', 'proxy': True}),
+        }
+        legacy = type('LegacyOrder', (model,), attrs)
+        return legacy
+
+    @staticmethod
+    def fill(model, rows, batch_size):
+        for start in range(0, rows, batch_size):
+            objs = [
+                model(
+                    title=f'Order {index}',
+                    slug=f'order-{index}',
+                    country='IR',
+                    province='Tehran',
+                    city='Tehran',
+                    postal_address=f'No. {index}, Example street',
+                    postal_code='1234567890',
+                    house_number=str(index % 1000),
+                    building_unit=str(index % 10),
+                    receiver_first_name='First',
+                    receiver_last_name='Last',
+                    receiver_phone_number='+989120000000',
+                    logistic_cost=Decimal(index % 100),
+                )
+                for index in range(start, min(start + batch_size, rows))
+            ]
+            with transaction.atomic():
+                model.objects.bulk_create(objs)
@@ -0,0 +1,85 @@
+import logging
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import AccountDataGenerator
+from painless.helper.benchmark import (
+    PeakMemory,
+    Stopwatch,
+    human_bytes
+)
+from painless.repository.reset import reset_tables
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Loader Benchmark
+
+    Generate users and their profiles twice: with `bulk_create` in batches
+    of 500 after building every object, and streamed through `BulkLoader`
+    (`COPY` on PostgreSQL) with profiles built from the loaded user ids.
+    Reports rows per second and peak Python memory. The user and profile
+    tables are emptied before each run, so the command refuses to run
+    without `--yes`.
+    """
+    help = 'Compare bulk_create with BulkLoader for generated users and profiles.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--total-users',
+                            type=int,
+                            default=100000,
+                            help='Users (and profiles) generated per method.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=5000,
+                            help='Rows per COPY / INSERT of the loader.'
+                            )
+        parser.add_argument('--yes',
+                            action='store_true',
+                            help='Confirm that the user and profile tables '
+                                 'may be emptied.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        if not kwargs['yes']:
+            raise CommandError('This benchmark empties the user and profile '
+                               'tables, pass --yes.')
+        total = kwargs['total_users']
+        generator = AccountDataGenerator()
+
+        def bulk_create():
+            users = User.objects.bulk_create(
+                [User(phone_number=number, password=1)
+                 for number in generator.get_unique_phone_numbers(total)],
+                batch_size=500
+            )
+            Profile.objects.bulk_create(
+                [Profile(user=user) for user in users],
+                batch_size=500
+            )
+
+        def loader():
+            batch_size = kwargs['batch_size']
+            for user_ids in generator.load_users(total, batch_size=batch_size):
+                generator.create_profile(user_ids, batch_size=batch_size,
+                                         disable_progress_bar=True)
+
+        for label, run in (('bulk_create', bulk_create), ('BulkLoader', loader)):
+            reset_tables(User, Profile)
+            with Stopwatch() as watch:
+                run()
+            reset_tables(User, Profile)
+            with PeakMemory() as memory:
+                run()
+            self.stdout.write(f'{label:<12} {watch.rate(2 * total):10.0f} '
+                              f'rows/s  peak {human_bytes(memory.peak):>10}')
+        reset_tables(User, Profile)
@@ -0,0 +1,77 @@
+import logging
+import logging.handlers
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from painless.helper.benchmark import Stopwatch
+from painless.log import QueuedHandler
+
+FORMAT = '%(levelname)s %(asctime)s - %(message)s'
+
+
+class Command(BaseCommand):
+    """Logging Benchmark
+
+    Compare the time a login request spends in logging with a plain
+    `RotatingFileHandler` and with `QueuedHandler` in front of it.
+    Each simulated login emits the lines `CustomAuthenticationForm` emits.
+    """
+    help = 'Measure logging cost per login request.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests',
+                            type=int,
+                            default=100000,
+                            help='Number of simulated login requests.'
+                            )
+        parser.add_argument('--max-bytes',
+                            type=int,
+                            default=1024 * 1024,
+                            help='Rotate log files at this size.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        total = kwargs['requests']
+        with tempfile.TemporaryDirectory() as directory:
+            sync_handler = logging.handlers.RotatingFileHandler(
+                os.path.join(directory, 'sync.log'),
+                maxBytes=kwargs['max_bytes'],
+                backupCount=2
+            )
+            queued_handler = QueuedHandler(
+                'logging.handlers.RotatingFileHandler',
+                filename=os.path.join(directory, 'queued.log'),
+                maxBytes=kwargs['max_bytes'],
+                backupCount=2
+            )
+            for name, handler in (('RotatingFileHandler', sync_handler),
+                                  ('QueuedHandler', queued_handler)):
+                handler.setFormatter(logging.Formatter(FORMAT))
+                per_request, drain = self.run(handler, total)
+                self.stdout.write(
+                    f'{name:<20} {per_request:8.2f} us/request on the '
+                    f'request thread (drained after {drain:.2f}s)')
+                handler.close()
+            self.stdout.write(f'QueuedHandler stats: {queued_handler.stats()}')
+
+    def run(self, handler, total):
+        logger = logging.getLogger(f'benchmark.{id(handler)}')
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        try:
+            with Stopwatch() as request_watch:
+                for index in range(total):
+                    phone_number = f'0912{index:07d}'
+                    logger.warning('%s with ip of %s failed to log in because of '
+                                   'invalid password or username',
+                                   phone_number, '127.0.0.1')
+                    logger.info('%s logged in successfully', phone_number)
+            with Stopwatch() as drain_watch:
+                handler.flush()
+        finally:
+            logger.removeHandler(handler)
+        elapsed = request_watch.elapsed + drain_watch.elapsed
+        return request_watch.per_op(total), elapsed
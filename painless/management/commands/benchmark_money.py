@@ -0,0 +1,76 @@
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from djmoney.money import Money
+
+from painless.helper.benchmark import Stopwatch
+from painless.models.fields import (
+    MoneyCurrencyOutput,
+    MoneyTomanCurrencyOutput,
+    money_as_decimal
+)
+
+
+class Command(BaseCommand):
+    """Money Conversion Benchmark
+
+    Run `from_db_value` of the painless money fields over the values a
+    price column returns (Decimals at scale 2, some NULLs) and compare it
+    with the previous per-row `Money(value, code)` and
+    `Money(round(Decimal(value), 2), code)` conversions.
+    """
+    help = 'Measure money field conversion per row.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows',
+                            type=int,
+                            default=1000000,
+                            help='Number of converted values.'
+                            )
+        parser.add_argument('--null-ratio',
+                            type=float,
+                            default=0.0,
+                            help='Share of NULL values.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        rows = kwargs['rows']
+        rng = random.Random(0)
+        values = [
+            None if rng.random() < kwargs['null_ratio']
+            else Decimal(rng.randrange(10 ** 9)).scaleb(-2)
+            for _ in range(rows)
+        ]
+        toman = MoneyTomanCurrencyOutput(max_digits=14, decimal_places=2)
+        currency = MoneyCurrencyOutput('T', max_digits=14, decimal_places=2)
+
+        def previous_toman(value):
+            return Money(value, 'T')
+
+        def previous_currency(value):
+            return Money(round(Decimal(value), 2), 'T')
+
+        cases = (
+            ('Toman, previous', previous_toman),
+            ('Toman', lambda value: toman.from_db_value(value, None, None)),
+            ('Currency, previous', previous_currency),
+            ('Currency', lambda value: currency.from_db_value(value, None, None)),
+        )
+        for label, convert in cases:
+            self.run(label, convert, values)
+        with money_as_decimal():
+            self.run('Currency, raw Decimal',
+                     lambda value: currency.from_db_value(value, None, None),
+                     values)
+
+    def run(self, label, convert, values):
+        try:
+            with Stopwatch() as watch:
+                for value in values:
+                    convert(value)
+        except (TypeError, ArithmeticError) as e:
+            self.stdout.write(f'{label:<24} failed: {e!r}')
+            return
+        self.stdout.write(f'{label:<24} {watch.per_op(len(values)):8.3f} us/row'
+                          f' {watch.elapsed:7.2f}s total')
@@ -0,0 +1,86 @@
+import re
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from painless.helper.benchmark import (
+    PeakMemory,
+    Stopwatch,
+    human_bytes
+)
+from painless.helper.enums import RegexPatternEnum
+from painless.repository.base import BaseDataGenerator
+from painless.repository.permutation import (
+    FeistelPermutation,
+    PHONE_NUMBER_DIGITS,
+    unique_phone_numbers
+)
+
+
+class Command(BaseCommand):
+    """Phone Number Benchmark
+
+    Generate unique phone numbers with the keyed permutation of
+    `unique_phone_numbers`, as raw permuted integers and as formatted
+    strings, and with the set-union loop of
+    `BaseDataGenerator.get_unique_phone_number_set` on a smaller count.
+    Every permuted integer is checked for uniqueness and a sample of the
+    strings against `RegexPatternEnum.IRAN_PHONE_NUMBER`.
+    """
+    help = 'Benchmark unique phone number generation.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count',
+                            type=int,
+                            default=10000000,
+                            help='Numbers generated by the permutation.'
+                            )
+        parser.add_argument('--legacy-count',
+                            type=int,
+                            default=100000,
+                            help='Numbers generated by '
+                                 'get_unique_phone_number_set.'
+                            )
+        parser.add_argument('--key',
+                            type=int,
+                            default=None,
+                            help='Permutation key.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        count = kwargs['count']
+        permutation = FeistelPermutation(
+            10 ** PHONE_NUMBER_DIGITS, key=kwargs['key']
+        )
+        with Stopwatch() as watch:
+            values = permutation.take(0, count)
+        distinct = len(np.unique(values))
+        self.stdout.write(f'{"permutation":<14} {watch.rate(count):12.0f} '
+                          f'numbers/s  distinct {distinct}/{count}')
+
+        pattern = re.compile(RegexPatternEnum.IRAN_PHONE_NUMBER.value)
+        invalid = 0
+        with Stopwatch() as watch:
+            for chunk in unique_phone_numbers(count, key=permutation.key):
+                invalid += sum(
+                    not pattern.match(number) for number in chunk[::1000]
+                )
+        # tracemalloc slows the block down, so memory is measured on a
+        # separate run of 2M numbers.
+        with PeakMemory() as memory:
+            for chunk in unique_phone_numbers(min(count, 2000000),
+                                              key=permutation.key):
+                pass
+        self.stdout.write(f'{"formatted":<14} {watch.rate(count):12.0f} '
+                          f'numbers/s  peak {human_bytes(memory.peak)}  '
+                          f'invalid samples {invalid}')
+
+        legacy_count = kwargs['legacy_count']
+        generator = BaseDataGenerator()
+        with Stopwatch() as watch:
+            numbers = generator.get_unique_phone_number_set(legacy_count,
+                                                            digits=13)
+        invalid = sum(not pattern.match(number) for number in numbers)
+        self.stdout.write(f'{"set union":<14} '
+                          f'{watch.rate(legacy_count):12.0f} numbers/s  '
+                          f'invalid {invalid}/{len(numbers)}')
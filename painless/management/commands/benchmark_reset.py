@@ -0,0 +1,77 @@
+import logging
+
+from django.core.management import call_command
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from account.models import (
+    Profile,
+    User
+)
+from account.repository.generator_layer import AccountDataGenerator
+from painless.helper.benchmark import Stopwatch
+from painless.repository.reset import reset_tables
+from painless.repository.snapshot import load_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Reset Benchmark
+
+    Generate users and profiles (or restore them from `--snapshot`), then
+    wipe them, alternating between `reset_tables(User, Profile)` and
+    `manage.py flush`. `flush` empties
+    EVERY table of the database, so the command refuses to run without
+    `--yes`.
+    """
+    help = 'Compare reset_tables with flush after generating account data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--total-users',
+                            type=int,
+                            default=2000,
+                            help='Users generated before each wipe.'
+                            )
+        parser.add_argument('--rounds',
+                            type=int,
+                            default=3,
+                            help='Wipes per method.'
+                            )
+        parser.add_argument('--snapshot',
+                            default=None,
+                            help='Restore this snapshot before each wipe '
+                                 'instead of generating users.'
+                            )
+        parser.add_argument('--yes',
+                            action='store_true',
+                            help='Confirm that the whole database may be flushed.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        if not kwargs['yes']:
+            raise CommandError('This benchmark runs `flush` on the whole '
+                               'database, pass --yes.')
+        generator = AccountDataGenerator()
+        methods = (
+            ('reset_tables', lambda: reset_tables(User, Profile)),
+            ('flush',
+             lambda: call_command('flush', interactive=False, verbosity=0)),
+        )
+        timings = {label: list() for label, _ in methods}
+        for _ in range(kwargs['rounds']):
+            for label, wipe in methods:
+                if kwargs['snapshot']:
+                    load_snapshot(kwargs['snapshot'], replace=True, cascade=True)
+                else:
+                    generator.create_user(kwargs['total_users'])
+                    generator.create_profile(disable_progress_bar=True)
+                with Stopwatch() as watch:
+                    wipe()
+                timings[label].append(watch.elapsed)
+        for label, elapsed in timings.items():
+            mean = sum(elapsed) / len(elapsed)
+            self.stdout.write(f'{label:<14} best {min(elapsed) * 1000:8.1f} ms'
+                              f'  mean {mean * 1000:8.1f} ms')
@@ -0,0 +1,112 @@
+import secrets
+
+from django.core.management.base import BaseCommand
+from django.db import (
+    connection,
+    models,
+    transaction
+)
+
+from painless.helper.benchmark import (
+    Stopwatch,
+    human_bytes
+)
+from painless.helper.sku import (
+    allocate_skus,
+    generate_sku
+)
+
+
+class Command(BaseCommand):
+    """SKU Benchmark
+
+    Insert rows into a scratch table with a unique `sku` column, once with
+    `secrets.token_urlsafe` (the previous default) and once with the
+    time-ordered `generate_sku`, and report insert throughput and the size
+    of the unique index. Run it against the production database engine:
+    index sizes are only read on PostgreSQL and on SQLite builds with the
+    `dbstat` table.
+    """
+    help = 'Compare random and time-ordered SKUs: insert rate and index size.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows',
+                            type=int,
+                            default=200000,
+                            help='Rows inserted per generator.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=1000,
+                            help='Rows per bulk_create.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        generators = (
+            ('token_urlsafe',
+             lambda count: [secrets.token_urlsafe() for _ in range(count)]),
+            ('generate_sku',
+             lambda count: [generate_sku() for _ in range(count)]),
+            ('allocate_skus', allocate_skus),
+        )
+        for label, allocate in generators:
+            model = self.scratch_model(label)
+            with connection.schema_editor() as editor:
+                editor.create_model(model)
+            try:
+                rate = self.insert(model, allocate,
+                                   kwargs['rows'], kwargs['batch_size'])
+                size = self.index_size(model)
+            finally:
+                with connection.schema_editor() as editor:
+                    editor.delete_model(model)
+            size = human_bytes(size) if size is not None else 'n/a'
+            self.stdout.write(
+                f'{label:<16} {rate:10.0f} rows/s  index {size:>10}'
+            )
+
+    @staticmethod
+    def scratch_model(label):
+        attrs = {
+            '__module__': __name__,
+            'sku': models.CharField(max_length=50, unique=True),
+            'Meta': type('Meta', (), {'app_label': 'painless',
+                                      'db_table': f'benchmark_sku_{label}'}),
+        }
+        return type(f'BenchmarkSKU_{label}', (models.Model,), attrs)
+
+    @staticmethod
+    def insert(model, allocate, rows, batch_size):
+        with Stopwatch() as watch:
+            for start in range(0, rows, batch_size):
+                count = min(batch_size, rows - start)
+                with transaction.atomic():
+                    model.objects.bulk_create(
+                        model(sku=sku) for sku in allocate(count)
+                    )
+        return watch.rate(rows)
+
+    @staticmethod
+    def index_size(model):
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT COALESCE(SUM(pg_relation_size(indexrelid)), 0) '
+                    'FROM pg_index '
+                    'WHERE indrelid = %s::regclass AND NOT indisprimary',
+                    [table]
+                )
+                return cursor.fetchone()[0]
+            if connection.vendor == 'sqlite':
+                try:
+                    cursor.execute(
+                        'SELECT SUM(pgsize) FROM dbstat WHERE name IN '
+                        '(SELECT name FROM sqlite_master '
+                        'WHERE type = %s AND tbl_name = %s)',
+                        ['index', table]
+                    )
+                except Exception:
+                    return None
+                return cursor.fetchone()[0]
+        return None
@@ -0,0 +1,125 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+from django.db import (
+    connection,
+    transaction
+)
+from django.utils.text import slugify
+
+from painless.helper.benchmark import Stopwatch
+from painless.models.mixins import TitleSlugMixin
+from painless.repository.slug import allocate_slugs
+
+TITLES = (
+    'Product {0}',
+    'product {0}!',
+    'محصول {0}',
+)
+
+
+class QueryCounter:
+    """Count the statements executed on the default connection inside a block."""
+
+    def __enter__(self):
+        self.count = 0
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """Slug Benchmark
+
+    Import titled objects into a scratch `TitleSlugMixin` table:
+    - naively, one `exists()` check per candidate slug and one INSERT per object;
+    - with `allocate_slugs` and `bulk_create`, one slug query per batch.
+    Every other title collides with another one once slugified.
+    """
+    help = 'Measure slug allocation throughput on imports.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows',
+                            type=int,
+                            default=100000,
+                            help='Objects imported with allocate_slugs.'
+                            )
+        parser.add_argument('--naive-rows',
+                            type=int,
+                            default=5000,
+                            help='Objects imported with the naive loop.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=1000,
+                            help='Objects per bulk_create.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        model = self.scratch_model()
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            naive_rows = kwargs['naive_rows']
+            with QueryCounter() as queries, Stopwatch() as watch:
+                with transaction.atomic():
+                    self.naive(model, self.titles(naive_rows))
+            self.report('exists() loop', naive_rows, watch, queries.count)
+            model.objects.all().delete()
+
+            rows, batch_size = kwargs['rows'], kwargs['batch_size']
+            titles = self.titles(rows)
+            with QueryCounter() as queries, Stopwatch() as watch:
+                for start in range(0, rows, batch_size):
+                    objs = [
+                        model(title=title)
+                        for title in titles[start:start + batch_size]
+                    ]
+                    with transaction.atomic():
+                        model.objects.bulk_create(
+                            allocate_slugs(objs, batch_size=batch_size)
+                        )
+            self.report('allocate_slugs', rows, watch, queries.count)
+            if model.objects.values('slug').distinct().count() != rows:
+                raise CommandError('allocate_slugs produced duplicate slugs.')
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+
+    @staticmethod
+    def scratch_model():
+        attrs = {
+            '__module__': __name__,
+            'Meta': type('Meta', (), {'app_label': 'painless',
+                                      'db_table': 'benchmark_slug'}),
+        }
+        return type('BenchmarkSlug', (TitleSlugMixin,), attrs)
+
+    @staticmethod
+    def titles(rows):
+        return [
+            TITLES[index % len(TITLES)].format(index // 2)
+            for index in range(rows)
+        ]
+
+    @staticmethod
+    def naive(model, titles):
+        for title in titles:
+            base = slugify(title, allow_unicode=True)
+            slug, number = base, 1
+            while model.objects.filter(slug=slug).exists():
+                number += 1
+                slug = f'{base}-{number}'
+            model.objects.create(title=title, slug=slug)
+
+    def report(self, label, rows, watch, queries):
+        self.stdout.write(f'{label:<16} {watch.rate(rows):10.0f} objects/s'
+                          f'  {queries:8d} queries')
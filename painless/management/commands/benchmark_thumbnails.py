@@ -0,0 +1,139 @@
+import io
+import time
+import uuid
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from PIL import (
+    Image,
+    ImageFilter
+)
+
+from painless.helper.benchmark import Stopwatch
+from painless.services.thumbnail import (
+    ThumbnailPipeline,
+    ThumbnailSpec,
+    get_manifest_cache
+)
+
+
+class TimedPipeline(ThumbnailPipeline):
+    """Records when the manifest of each job is ready."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ready = dict()
+
+    def render(self, key, picture, specs):
+        manifest = super().render(key, picture, specs)
+        self.ready[key] = time.perf_counter()
+        return manifest
+
+
+class Command(BaseCommand):
+    """Thumbnail Benchmark
+
+    Upload generated photos and compare:
+    - rendering on first request, the old `get_thumbnail(..., quality=99)`;
+    - `ThumbnailPipeline`, from queueing on save to the manifest being ready.
+    Reports the latency a visitor or an uploader waits for and the bytes
+    served per thumbnail for each variant.
+    """
+    help = 'Measure thumbnail upload-to-ready latency and bytes served.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images',
+                            type=int,
+                            default=20,
+                            help='Number of uploaded pictures.'
+                            )
+        parser.add_argument('--size',
+                            type=str,
+                            default='1600x1200',
+                            help='Dimensions of the uploaded pictures.'
+                            )
+        parser.add_argument('--geometry',
+                            type=str,
+                            default='300x300',
+                            help='Thumbnail geometry.'
+                            )
+        parser.add_argument('--workers',
+                            type=int,
+                            default=4,
+                            help='Rendering threads of the pipeline.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        width, height = map(int, kwargs['size'].split('x'))
+        run = uuid.uuid4().hex[:8]
+        names = [
+            default_storage.save(
+                f'benchmark/thumbnails/{run}-{index}.jpg',
+                ContentFile(self.make_photo(width, height, index))
+            )
+            for index in range(kwargs['images'])
+        ]
+        spec = ThumbnailSpec('benchmark', kwargs['geometry'])
+        try:
+            self.first_request(names, kwargs['geometry'])
+            self.pipeline(names, spec, kwargs['workers'])
+        finally:
+            for name in names:
+                default_storage.delete(name)
+
+    def first_request(self, names, geometry):
+        baseline = ThumbnailSpec('baseline', geometry,
+                                 quality=99, webp_quality=None)
+        fmt, quality = baseline.variants()[0]
+        served = 0
+        with Stopwatch() as watch:
+            for name in names:
+                served += self.file_size(baseline.render(name, fmt, quality))
+        self.report(f'first request ({fmt} q{quality})',
+                    watch.elapsed / len(names), served / len(names))
+
+    def pipeline(self, names, spec, workers):
+        pipeline = TimedPipeline(workers=workers)
+        submitted = dict()
+        for name in names:
+            submitted[f'benchmark:{name}'] = time.perf_counter()
+            pipeline.submit((f'benchmark:{name}', name, (spec,)))
+        pipeline.flush()
+        pipeline.shutdown()
+        latency = sum(
+            pipeline.ready[key] - started for key, started in submitted.items()
+        ) / len(names)
+
+        cache = get_manifest_cache()
+        for fmt, quality in spec.variants():
+            served = sum(
+                self.file_size(spec.render(name, fmt, quality))
+                for name in names
+                if cache.get(f'benchmark:{name}')
+            )
+            self.report(f'pipeline ({fmt} q{quality})',
+                        latency, served / len(names))
+        self.stdout.write('Request path with the pipeline: '
+                          'one manifest cache read per thumbnail.')
+        for name in names:
+            cache.delete(f'benchmark:{name}')
+
+    @staticmethod
+    def file_size(thumbnail) -> int:
+        return thumbnail.storage.size(thumbnail.name)
+
+    def report(self, label, seconds, size):
+        self.stdout.write(f'{label:<28} {seconds * 1000:9.1f} ms to ready'
+                          f' {size / 1024:9.1f} KiB/thumbnail')
+
+    @staticmethod
+    def make_photo(width, height, seed) -> bytes:
+        """A noisy gradient, closer to a photo than a flat colour."""
+        image = Image.effect_noise((width, height), 40 + seed % 20).convert('RGB')
+        gradient = Image.linear_gradient('L').resize((width, height))
+        gradient = gradient.convert('RGB')
+        image = Image.blend(image, gradient, 0.5).filter(ImageFilter.SMOOTH)
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=92)
+        return buffer.getvalue()
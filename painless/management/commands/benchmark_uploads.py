@@ -0,0 +1,119 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.uploadhandler import (
+    MemoryFileUploadHandler,
+    TemporaryFileUploadHandler
+)
+from django.core.management.base import BaseCommand
+from django.http.multipartparser import MultiPartParser
+from django.test.utils import override_settings
+
+from painless.files import HashingTemporaryFileUploadHandler
+from painless.helper.benchmark import (
+    PeakMemory,
+    Stopwatch,
+    human_bytes
+)
+
+BOUNDARY = 'BenchmarkBoundary'
+MB = 2 ** 20
+
+
+class MultipartStream(io.RawIOBase):
+    """
+    A multipart body with one file of `size` bytes, generated while it is
+    read.
+    """
+
+    def __init__(self, size):
+        self.head = (f'--{BOUNDARY}\r\n'
+                     'Content-Disposition: form-data; name="picture"; '
+                     'filename="upload.jpg"\r\n'
+                     'Content-Type: image/jpeg\r\n\r\n').encode()
+        self.tail = f'\r\n--{BOUNDARY}--\r\n'.encode()
+        self.size = size
+        self.length = len(self.head) + size + len(self.tail)
+        self.position = 0
+        self.block = bytes(range(256)) * 256
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        written = 0
+        while written < len(buffer) and self.position < self.length:
+            offset = self.position
+            if offset < len(self.head):
+                chunk = self.head[offset:]
+            elif offset < len(self.head) + self.size:
+                start = (offset - len(self.head)) % len(self.block)
+                left = len(self.head) + self.size - offset
+                chunk = self.block[start:start + left]
+            else:
+                chunk = self.tail[offset - len(self.head) - self.size:]
+            chunk = chunk[:len(buffer) - written]
+            buffer[written:written + len(chunk)] = chunk
+            written += len(chunk)
+            self.position += len(chunk)
+        return written
+
+
+class Command(BaseCommand):
+    """Upload Benchmark
+
+    Parse several concurrent multipart uploads, as worker threads would,
+    and report the peak Python heap with:
+    - Django's default handlers under the old 100MB `FILE_UPLOAD_MAX_MEMORY_SIZE`;
+    - `HashingTemporaryFileUploadHandler`, which streams to disk and hashes.
+    """
+    help = 'Measure upload memory under concurrent large uploads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--uploads',
+                            type=int,
+                            default=4,
+                            help='Concurrent uploads.'
+                            )
+        parser.add_argument('--size',
+                            type=int,
+                            default=50,
+                            help='Size of each upload in MB.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        uploads, size = kwargs['uploads'], kwargs['size'] * MB
+        default = [MemoryFileUploadHandler, TemporaryFileUploadHandler]
+        with override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=100 * MB):
+            self.run('default handlers', default, uploads, size)
+        hashing = [HashingTemporaryFileUploadHandler]
+        with override_settings(MAX_UPLOAD_SIZE=size + MB):
+            self.run('hashing handler', hashing, uploads, size)
+        with override_settings(MAX_UPLOAD_SIZE=size // 10):
+            self.run('hashing handler, limit', hashing, uploads, size)
+
+    def run(self, label, handler_classes, uploads, size):
+        with PeakMemory() as memory, Stopwatch() as watch:
+            with ThreadPoolExecutor(max_workers=uploads) as executor:
+                files = list(executor.map(
+                    lambda _: self.parse(handler_classes, size), range(uploads)
+                ))
+        stored = sum(1 for file in files if file is not None)
+        self.stdout.write(f'{label:<24} peak {human_bytes(memory.peak):>10}'
+                          f' in {watch.elapsed:6.2f}s,'
+                          f' {stored}/{uploads} files kept')
+        for file in files:
+            if file is not None:
+                file.close()
+
+    @staticmethod
+    def parse(handler_classes, size):
+        stream = MultipartStream(size)
+        meta = {
+            'CONTENT_TYPE': f'multipart/form-data; boundary={BOUNDARY}',
+            'CONTENT_LENGTH': str(stream.length),
+        }
+        handlers = [handler_class() for handler_class in handler_classes]
+        parser = MultiPartParser(meta, io.BufferedReader(stream), handlers)
+        _, files = parser.parse()
+        return files.get('picture')
@@ -0,0 +1,55 @@
+import os
+
+from django.apps import apps
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from painless.helper.benchmark import (
+    Stopwatch,
+    human_bytes
+)
+from painless.repository.snapshot import (
+    dump_snapshot,
+    snapshot_path
+)
+
+
+class Command(BaseCommand):
+    """Dump Snapshot
+
+    Write the rows of the given models to a named snapshot (a zip of
+    columnar JSON chunks plus a manifest) that `load_snapshot` restores.
+    """
+    help = 'Dump models to a named dataset snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name',
+                            help='Snapshot name, or a path ending in .zip.'
+                            )
+        parser.add_argument('models',
+                            nargs='+',
+                            help='Models to dump, as app_label.ModelName.'
+                            )
+        parser.add_argument('--seed',
+                            type=int,
+                            default=None,
+                            help='Seed the data was generated with, recorded '
+                                 'in the manifest.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        try:
+            models = [apps.get_model(label) for label in kwargs['models']]
+        except (LookupError, ValueError) as error:
+            raise CommandError(error)
+        with Stopwatch() as watch:
+            manifest = dump_snapshot(kwargs['name'], models, seed=kwargs['seed'])
+        for entry in manifest['models']:
+            self.stdout.write(f'{entry["label"]:<24} {entry["rows"]:>10} rows')
+        size = human_bytes(os.path.getsize(snapshot_path(kwargs['name'])))
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshot `{kwargs["name"]}` written in {watch.elapsed:.1f}s '
+            f'({size}).'
+        ))
@@ -0,0 +1,56 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from painless.helper.benchmark import Stopwatch
+from painless.repository.snapshot import (
+    SnapshotError,
+    load_snapshot
+)
+
+
+class Command(BaseCommand):
+    """Load Snapshot
+
+    Restore a snapshot written by `dump_snapshot` into empty tables through
+    `BulkLoader`; `--replace` empties the snapshot's tables first. Tables
+    that reference them and are not in the snapshot are emptied too, so
+    `--replace` refuses when they hold rows unless `--cascade` is passed.
+    """
+    help = 'Restore a named dataset snapshot.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name',
+                            help='Snapshot name, or a path ending in .zip.'
+                            )
+        parser.add_argument('--replace',
+                            action='store_true',
+                            help='Empty the tables of the snapshot before '
+                                 'loading.'
+                            )
+        parser.add_argument('--cascade',
+                            action='store_true',
+                            help='With --replace, also empty the tables '
+                                 'referencing them.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=5000,
+                            help='Rows per COPY / INSERT.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        try:
+            with Stopwatch() as watch:
+                manifest = load_snapshot(kwargs['name'],
+                                         replace=kwargs['replace'],
+                                         batch_size=kwargs['batch_size'],
+                                         cascade=kwargs['cascade'])
+        except SnapshotError as error:
+            raise CommandError(error)
+        rows = sum(entry['rows'] for entry in manifest['models'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshot `{kwargs["name"]}` (seed {manifest["seed"]}) loaded: '
+            f'{rows} rows in {watch.elapsed:.1f}s, {watch.rate(rows):.0f} rows/s.'
+        ))
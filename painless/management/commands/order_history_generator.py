@@ -0,0 +1,103 @@
+import secrets
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from painless.repository.orders import (
+    OrderHistoryGenerator,
+    OrderHistoryShape,
+    OrderModels
+)
+
+
+class Command(BaseCommand):
+    """Order History Generator
+
+    Generate a skewed order history (orders, order lines and voucher use)
+    for every user without an order, from the existing packs and vouchers,
+    so the `UserQuerySet` analytics can be benchmarked on a production-like
+    shape. See `OrderHistoryShape` for the distributions.
+    """
+    help = 'Generate power-law order histories for users without orders.'
+
+    def add_arguments(self, parser):
+        defaults = OrderHistoryShape()
+        parser.add_argument('--seed',
+                            type=int,
+                            default=None,
+                            help='Seed of the history, random when omitted.'
+                            )
+        parser.add_argument('--batch-size',
+                            type=int,
+                            default=5000,
+                            help='Users planned at once and rows per '
+                                 'COPY / INSERT.'
+                            )
+        parser.add_argument('--buyer-rate',
+                            type=float,
+                            default=defaults.buyer_rate,
+                            help='Share of users with at least one order.'
+                            )
+        parser.add_argument('--orders-exponent',
+                            type=float,
+                            default=defaults.orders_exponent,
+                            help='Zipf exponent of the orders per buyer, above 1.'
+                            )
+        parser.add_argument('--refund-rate',
+                            type=float,
+                            default=defaults.refund_rate,
+                            help='Share of delivered order lines refunded.'
+                            )
+        parser.add_argument('--voucher-rate',
+                            type=float,
+                            default=defaults.voucher_rate,
+                            help='Share of orders using a voucher.'
+                            )
+        parser.add_argument('--brand-exponent',
+                            type=float,
+                            default=defaults.brand_exponent,
+                            help='Zipf exponent of brand popularity.'
+                            )
+        parser.add_argument('--color-exponent',
+                            type=float,
+                            default=defaults.color_exponent,
+                            help='Zipf exponent of color popularity.'
+                            )
+
+    def handle(self, *args, **kwargs):
+        if kwargs['orders_exponent'] <= 1:
+            raise CommandError('--orders-exponent has to be above 1.')
+        try:
+            models = OrderModels.resolve()
+        except LookupError as e:
+            raise CommandError(str(e))
+        seed = kwargs['seed']
+        if seed is None:
+            seed = secrets.randbits(32)
+        self.stdout.write(self.style.WARNING(
+            f'Prepare to generate order history with --seed {seed}...'
+        ))
+
+        shape = OrderHistoryShape()._replace(
+            buyer_rate=kwargs['buyer_rate'],
+            orders_exponent=kwargs['orders_exponent'],
+            refund_rate=kwargs['refund_rate'],
+            voucher_rate=kwargs['voucher_rate'],
+            brand_exponent=kwargs['brand_exponent'],
+            color_exponent=kwargs['color_exponent'],
+        )
+        generator = OrderHistoryGenerator(seed=seed, shape=shape)
+        try:
+            written = generator.create_order_history(
+                batch_size=kwargs['batch_size'], models=models
+            )
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.HTTP_NOT_MODIFIED(
+            f'{written["orders"]} Orders with {written["lines"]} lines and '
+            f'{written["vouchers"]} vouchers have been generated by machine.')
+        )
+        self.stdout.write(self.style.SUCCESS('Data Generation finished'))
@@ -1 +1,6 @@
-from .ip_address import get_request_ip
+from .ip_address import (
+    GetIPMiddleware,
+    get_request_ip,
+    ip_blocklist,
+    trusted_proxies
+)
@@ -1,34 +1,182 @@
-from django.contrib.auth import get_user_model
-from django.utils.deprecation import MiddlewareMixin
+import ipaddress
+import logging
+import time
+import uuid
 
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponseForbidden
+from django.utils.functional import SimpleLazyObject
 
-User = get_user_model()
+from painless.helper.cidr import CIDRTrie
 
+logger = logging.getLogger(__name__)
+
+
+class _LazyCIDRTrie(CIDRTrie):
+    """A CIDRTrie that is filled from a list setting on first use."""
+
+    def __init__(self, setting_name, default=()):
+        super().__init__()
+        self.setting_name = setting_name
+        self.default = default
+        self._loaded = False
+
+    def load(self):
+        if not self._loaded:
+            self._loaded = True
+            for network in getattr(settings, self.setting_name, self.default):
+                self.add(network)
+        return self
+
+
+class _SharedCIDRTrie(_LazyCIDRTrie):
+    """
+    A `_LazyCIDRTrie` whose runtime blocks are shared by every worker process.
+
+    `block` stores the network with its expiry in the cache and bumps a
+    version key; each process compares that version with the one it last
+    read, at most every `sync_interval` seconds, and adds the shared
+    networks to its own trie when it changed. Lookups stay in memory; a
+    block reaches the other workers within `sync_interval` seconds.
+    """
+    KEY = 'painless:ip_blocklist'
+    VERSION_KEY = 'painless:ip_blocklist:version'
+    LOCK_KEY = 'painless:ip_blocklist:lock'
+
+    def __init__(self, setting_name, default=(), cache_alias='default',
+                 sync_interval=5):
+        super().__init__(setting_name, default)
+        self.cache_alias = cache_alias
+        self.sync_interval = sync_interval
+        self._version = None
+        self._synced_at = 0.0
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def block(self, network, ttl=None) -> None:
+        """
+        Refuse `network` in every worker, for `ttl` seconds or until it is
+        cleared.
+        """
+        network = str(ipaddress.ip_network(network, strict=False))
+        now = time.time()
+        expiry = None if ttl is None else now + ttl
+        locked = self._acquire()
+        try:
+            stored = self.cache.get(self.KEY) or dict()
+            entries = {
+                key: value for key, value in stored.items()
+                if value is None or value > now
+            }
+            if network in entries and (
+                    entries[network] is None or expiry is None):
+                expiry = None
+            elif network in entries:
+                expiry = max(entries[network], expiry)
+            entries[network] = expiry
+            self.cache.set(self.KEY, entries, None)
+            self.cache.set(self.VERSION_KEY, uuid.uuid4().hex, None)
+        finally:
+            if locked:
+                self.cache.delete(self.LOCK_KEY)
+        self.add(network, ttl=ttl)
+
+    def sync(self, force=False) -> None:
+        """
+        Add the networks other workers blocked since the last sync. When the
+        cache cannot be read the trie is kept as it is and the sync is
+        retried after `sync_interval` seconds.
+        """
+        now = time.time()
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+        self._synced_at = now
+        try:
+            version = self.cache.get(self.VERSION_KEY)
+            if version is None or version == self._version:
+                return
+            entries = self.cache.get(self.KEY) or dict()
+        except Exception:  # noqa: a cache outage must not fail the request
+            logger.exception('Reading the shared IP blocklist failed.')
+            return
+        self._version = version
+        for network, expiry in entries.items():
+            if expiry is None:
+                self.add(network)
+            elif expiry > now:
+                self.add(network, ttl=expiry - now)
+
+    def _acquire(self, attempts=50) -> bool:
+        # `add` only succeeds for one process; it keeps concurrent blocks
+        # from overwriting each other's entries.
+        for _ in range(attempts):
+            if self.cache.add(self.LOCK_KEY, 1, timeout=5):
+                return True
+            time.sleep(0.01)
+        return False
+
+
+# Proxies whose `X-Forwarded-For` entries are believed.
+trusted_proxies = _LazyCIDRTrie(
+    'TRUSTED_PROXIES', default=('127.0.0.1/32', '::1/128')
+)
+# Networks refused by `GetIPMiddleware`: the `IP_BLOCKLIST` setting plus the
+# networks blocked by `AccountBusinessLogicLayer.block_ip`.
+ip_blocklist = _SharedCIDRTrie('IP_BLOCKLIST')
+
+
+class GetIPMiddleware:
+    """
+    Attach the client IP to the request as `request.ip_address`.
+
+    The address is resolved lazily on first access, so requests that never
+    look at it pay nothing; the user is not touched at all. When the
+    blocklist is not empty, requests from blocked networks are refused
+    without a database query; the networks blocked by other workers are
+    picked up from the cache every few seconds.
+    """
 
-class GetIPMiddleware(MiddlewareMixin):
     def __init__(self, get_response):
         self.get_response = get_response
+        ip_blocklist.load()
 
     def __call__(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
+        request.ip_address = SimpleLazyObject(lambda: resolve_request_ip(request))
+        ip_blocklist.sync()
+        if ip_blocklist and ip_blocklist.match(str(request.ip_address)):
+            return HttpResponseForbidden()
+        return self.get_response(request)
 
-        if request.user.is_authenticated:
-            request.user.ip_address = ip
-        else:
-            request.user.ip_address_anon = ip
-        response = self.get_response(request)
-        return response
 
+def resolve_request_ip(request):
+    """
+    Walk `X-Forwarded-For` from the nearest hop outwards and return the first
+    address that is not a trusted proxy.
 
-def get_request_ip(request):
+    Entries are only believed while every hop after them is a trusted proxy,
+    so a client cannot spoof its address by sending its own header.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR')
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-    if x_forwarded_for:
-        ip = x_forwarded_for.split(',')[0]
-    else:
-        ip = request.META.get('REMOTE_ADDR')
+    if not x_forwarded_for or not trusted_proxies.load().match(remote_addr):
+        return remote_addr
 
+    ip = remote_addr
+    for hop in reversed(x_forwarded_for.split(',')):
+        hop = hop.strip()
+        if not CIDRTrie.is_address(hop):
+            break
+        ip = hop
+        if not trusted_proxies.match(hop):
+            break
     return ip
+
+
+def get_request_ip(request):
+    ip = getattr(request, 'ip_address', None)
+    if ip is None:
+        return resolve_request_ip(request)
+    return str(ip)
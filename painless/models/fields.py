@@ -1,29 +1,75 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from decimal import Decimal
 
+from django.utils.functional import cached_property
 from djmoney.models.fields import MoneyField
 from djmoney.money import Money
 from djmoney.settings import DECIMAL_PLACES
+from moneyed import get_currency
 
+_money_as_decimal = ContextVar('money_as_decimal', default=False)
 
-class MoneyRialCurrencyOutput(MoneyField):
 
-    def from_db_value(self, value, expression, connection):
-        return Money(value, 'R')
+@contextmanager
+def money_as_decimal():
+    """
+    Load the painless money fields as plain `Decimal` amounts.
 
+    For analytics querysets that only sum, sort or export amounts and do
+    not need `Money` objects. Querysets are lazy: evaluate them inside the
+    block.
 
-class MoneyTomanCurrencyOutput(MoneyField):
+        with money_as_decimal():
+            prices = list(Product.objects.values_list('price', flat=True))
+    """
+    token = _money_as_decimal.set(True)
+    try:
+        yield
+    finally:
+        _money_as_decimal.reset(token)
 
-    def from_db_value(self, value, expression, connection):
-        return Money(value, 'T')
 
+class CurrencyOutputMixin:
+    """
+    Converts the stored amount into `Money` in `output_currency`.
+
+    NULL stays `None`, the `Currency` is looked up once per field, and the
+    database backends already return a `Decimal` at the column's scale, so
+    it is used as is.
+    """
+    output_currency = None
 
-class MoneyDollarCurrencyOutput(MoneyField):
+    @cached_property
+    def output_currency_object(self):
+        return get_currency(str(self.output_currency).upper())
+
+    def to_amount(self, value) -> Decimal:
+        return value if isinstance(value, Decimal) else Decimal(str(value))
 
     def from_db_value(self, value, expression, connection):
-        return Money(value, 'USD')
+        if value is None:
+            return None
+        amount = self.to_amount(value)
+        if _money_as_decimal.get():
+            return amount
+        # A `Decimal` amount and a `Currency` are used by `Money` as is.
+        return Money(amount, self.output_currency_object)
+
+
+class MoneyRialCurrencyOutput(CurrencyOutputMixin, MoneyField):
+    output_currency = 'R'
 
 
-class MoneyCurrencyOutput(MoneyField):
+class MoneyTomanCurrencyOutput(CurrencyOutputMixin, MoneyField):
+    output_currency = 'T'
+
+
+class MoneyDollarCurrencyOutput(CurrencyOutputMixin, MoneyField):
+    output_currency = 'USD'
+
+
+class MoneyCurrencyOutput(CurrencyOutputMixin, MoneyField):
     def __init__(self, currency, *args, **kwargs):
         self.currency = currency
 
@@ -34,11 +80,13 @@ class MoneyCurrencyOutput(MoneyField):
 
         super().__init__(currency, *args, **kwargs)
 
-    def from_db_value(self, value, expression, connection):
-        value = round(Decimal(value), 2)
-        money = Money(
-            value,
-            self.currency
-        )
+    @property
+    def output_currency(self):
+        return self.currency
 
-        return money
+    def to_amount(self, value) -> Decimal:
+        # A column with two decimal places already comes back at that
+        # scale, rounding it again would not change it.
+        if isinstance(value, Decimal) and self.decimal_places == 2:
+            return value
+        return round(Decimal(value), 2)
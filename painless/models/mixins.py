@@ -12,16 +12,14 @@ Examples of functionality provided by these mixins include
 By using mixins, developers can easily add common functionality to their models without having to 
 repeat the same code in multiple places.
 """
-import secrets
 
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.contrib import admin
 from django_countries.fields import CountryField
-from django.db import (
-    models,
-    connection
-)
+from django.db import models
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
 from django.core.validators import (
     MaxLengthValidator,
     MinLengthValidator
@@ -29,14 +27,19 @@ from django.core.validators import (
 
 from ckeditor_uploader.fields import RichTextUploadingField
 from djmoney.models.fields import MoneyField
-from khayyam import JalaliDatetime
 from sorl.thumbnail import (
     ImageField,
     get_thumbnail
 )
 
 from kernel.settings.packages import DEFAULT_CURRENCY_SHOW_ON_SITE
+from painless.helper.jalali import to_solar
+from painless.helper.sku import default_sku
+from painless.services import thumbnail
+from painless.services.thumbnail import ThumbnailSpec
 from painless.helper.typing import Dimension
+from painless.repository.reset import reset_tables
+from painless.repository.slug import SlugAllocator
 
 
 class SKUMixin(models.Model):
@@ -44,7 +47,9 @@ class SKUMixin(models.Model):
 
     Attributes:
     sku (CharField): A unique identifier for the object. 
-                    It is generated using a secure token and can't be edited.
+                    It is generated by the `SKU_GENERATOR` setting, a
+                    time-ordered token by default (see
+                    `painless.helper.sku`), and can't be edited.
     """
     sku = models.CharField(
         _('sku'),
@@ -52,7 +57,7 @@ class SKUMixin(models.Model):
         validators=[MaxLengthValidator(50)],
         unique=True,
         editable=False,
-        default=secrets.token_urlsafe,
+        default=default_sku,
         help_text=_('An alternate field to store the unique identity per '
                     'object. This field is also shown in the URL.')
     )
@@ -71,11 +76,6 @@ class SKUMixin(models.Model):
 
 
 class TitleSlugMixin(models.Model):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Dynamically change help text
-        self.__class__.title.field.help_text = _('{0} title.'.format(self.__class__.__name__))  # noqa
-
     title = models.CharField(
         _('title'),
         max_length=255,
@@ -92,6 +92,20 @@ class TitleSlugMixin(models.Model):
                     'or hyphens. They are generally used in URLs.')
     )
 
+    @staticmethod
+    def get_dynamic_help_texts(model):
+        """
+        Help texts that depend on the concrete model, see
+        `set_dynamic_help_texts`.
+        """
+        return {'title': _('{0} title.'.format(model.__name__))}
+
+    def save(self, *args, **kwargs):
+        """Derives a unique slug from the title on the first save."""
+        if not self.slug:
+            SlugAllocator(type(self)).allocate([self], using=kwargs.get('using'))
+        super().save(*args, **kwargs)
+
     @admin.display(description=_('title'), ordering=('-title'))
     def get_title(self):
         return self.title if len(self.title) < 30 else (self.title[:30] + '...')
@@ -167,12 +181,12 @@ class TimeStampMixin(models.Model):
     @admin.display(description=_('created'), ordering=('-created'))
     def get_solar_created(self):
         """Returns the solar creation time of the record in the format '%d %B %Y'."""
-        return JalaliDatetime(self.created).strftime('%d %B %Y')
+        return to_solar(self.created)
 
     @admin.display(description=_('modified'), ordering=('-modified'))
     def get_solar_modified(self):
         """Returns the solar modification time of the record in the format '%d %B %Y'."""
-        return JalaliDatetime(self.modified).strftime('%d %B %Y')
+        return to_solar(self.modified)
 
     class Meta:
         """The Meta class of the TimeStampMixin has an attribute abstract = True, 
@@ -264,11 +278,25 @@ class UploadSorlThumbnailPictureMixin(UploadBasePictureMixin):
         help_text=_('Is this picture default?')
     )
 
-    def get_thumbnail(self, value: Dimension = Dimension('100x100')):
+    # Rendered in the background when the picture is saved, see
+    # `painless.services.thumbnail`. Override per model.
+    thumbnail_specs = (
+        ThumbnailSpec('default', '100x100'),
+    )
+
+    def get_thumbnail(self, value: Dimension = Dimension('100x100'),
+                      quality: int = 85):
         return get_thumbnail(self.picture,
                              value,
                              crop='center',
-                             quality=99)
+                             quality=quality)
+
+    def get_thumbnail_url(self, name: str = 'default', fmt: str = None):
+        """
+        URL of the declared `name` thumbnail, `fmt='WEBP'` for the WebP
+        variant.
+        """
+        return thumbnail.get_thumbnail_url(self, name, fmt)
 
     class Meta:
         """The Meta class of the UploadSorlThumbnailPictureMixin has an attribute abstract = True, 
@@ -279,43 +307,54 @@ class UploadSorlThumbnailPictureMixin(UploadBasePictureMixin):
 
 
 class CountryProvinceCityMixin(models.Model):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        if self.__class__.__name__.lower() == 'order':
-            self.__class__.country.field.help_text = _('The country where the '
-                                                       'user has submitted '
-                                                       'his/her order.')
-            self.__class__.province.field.help_text = _('The province where the '
-                                                        'user has submitted '
-                                                        'his/her order.')
-            self.__class__.city.field.help_text = _('The city where the '
-                                                    'user has submitted '
-                                                    'his/her order.')
-            self.__class__.postal_address.field.help_text = _('The postal address where the '  # noqa
-                                                              'user has submitted '  # noqa
-                                                              'his/her order.')
-            self.__class__.postal_code.field.help_text = _('The postal code where the '  # noqa
-                                                           'user has submitted '  # noqa
-                                                           'his/her order.')
-            self.__class__.house_number.field.help_text = _('The license plate number of the house '  # noqa
-                                                            'where the user wants to receive his/her order.')  # noqa
-            self.__class__.building_unit.field.help_text = _('The house unit number '  # noqa
-                                                             'where the user wants to receive his/her order.')  # noqa
-        elif self.__class__.__name__.lower() == 'address':
-            self.__class__.country.field.help_text = _('The registered country for '  # noqa
-                                                       'shipping goods.')
-            self.__class__.province.field.help_text = _('The registered province for '  # noqa
-                                                        'shipping goods.')
-            self.__class__.city.field.help_text = _('The registered city for '
-                                                    'shipping goods.')
-            self.__class__.postal_address.field.help_text = _('The registered postal address for '  # noqa
-                                                              'shipping goods.')
-            self.__class__.postal_code.field.help_text = _('The registered postal code for '  # noqa
-                                                           'shipping goods.')
-            self.__class__.house_number.field.help_text = _('The registered house number for '  # noqa
-                                                            'shipping goods.')
-            self.__class__.building_unit.field.help_text = _('The registered house unit number for '  # noqa
-                                                             'shipping goods.')
+    @staticmethod
+    def get_dynamic_help_texts(model):
+        """
+        Help texts that depend on the concrete model, see
+        `set_dynamic_help_texts`.
+        """
+        if model.__name__.lower() == 'order':
+            return {
+                'country': _('The country where the '
+                             'user has submitted '
+                             'his/her order.'),
+                'province': _('The province where the '
+                              'user has submitted '
+                              'his/her order.'),
+                'city': _('The city where the '
+                          'user has submitted '
+                          'his/her order.'),
+                'postal_address': _('The postal address where the '
+                                    'user has submitted '
+                                    'his/her order.'),
+                'postal_code': _('The postal code where the '
+                                 'user has submitted '
+                                 'his/her order.'),
+                'house_number': _('The license plate number of the house '
+                                  'where the user wants to receive '
+                                  'his/her order.'),
+                'building_unit': _('The house unit number '
+                                   'where the user wants to receive '
+                                   'his/her order.'),
+            }
+        elif model.__name__.lower() == 'address':
+            return {
+                'country': _('The registered country for '
+                             'shipping goods.'),
+                'province': _('The registered province for '
+                              'shipping goods.'),
+                'city': _('The registered city for '
+                          'shipping goods.'),
+                'postal_address': _('The registered postal address for '
+                                    'shipping goods.'),
+                'postal_code': _('The registered postal code for '
+                                 'shipping goods.'),
+                'house_number': _('The registered house number for '
+                                  'shipping goods.'),
+                'building_unit': _('The registered house unit number for '
+                                   'shipping goods.'),
+            }
+        return dict()
 
     country = CountryField(
         _('country'),
@@ -356,23 +395,31 @@ class CountryProvinceCityMixin(models.Model):
 class CustomerDetailsMixin(models.Model):
     """A Mixin that provides fields for storing customer details and dynamic help text."""
 
-    def __init__(self, *args, **kwargs):
-        """Overrides the parent's init method to set dynamic help text for the customer detail fields."""
-        super().__init__(*args, **kwargs)
-        if self.__class__.__name__.lower() == 'order':
-            self.__class__.receiver_first_name.field.help_text = _(
-                'The first name of the person who receives the order.')
-            self.__class__.receiver_last_name.field.help_text = _(
-                'The last name of the person who receives the order.')
-            self.__class__.receiver_phone.field.help_text = _(
-                'The phone number of the person who receives the order.')
-        elif self.__class__.__name__.lower() == 'address':
-            self.__class__.receiver_first_name.field.help_text = _(
-                "The receiver's first name to receive the goods.")
-            self.__class__.receiver_last_name.field.help_text = _(
-                "The receiver's last name to receive the goods.")
-            self.__class__.receiver_phone_number.field.help_text = _(
-                "The receiver's phone number to receive the goods.")
+    @staticmethod
+    def get_dynamic_help_texts(model):
+        """
+        Help texts that depend on the concrete model, see
+        `set_dynamic_help_texts`.
+        """
+        if model.__name__.lower() == 'order':
+            return {
+                'receiver_first_name': _(
+                    'The first name of the person who receives the order.'),
+                'receiver_last_name': _(
+                    'The last name of the person who receives the order.'),
+                'receiver_phone_number': _(
+                    'The phone number of the person who receives the order.'),
+            }
+        elif model.__name__.lower() == 'address':
+            return {
+                'receiver_first_name': _(
+                    "The receiver's first name to receive the goods."),
+                'receiver_last_name': _(
+                    "The receiver's last name to receive the goods."),
+                'receiver_phone_number': _(
+                    "The receiver's phone number to receive the goods."),
+            }
+        return dict()
 
     receiver_first_name = models.CharField(
         _('receiver first name'),
@@ -401,16 +448,17 @@ class CustomerDetailsMixin(models.Model):
 class LogisticCostMixin(models.Model):
     """A Mixin that provides a `logistic_cost` field with a dynamic help text."""
 
-    def __init__(self, *args, **kwargs):
+    @staticmethod
+    def get_dynamic_help_texts(model):
         """
-        Overrides the parent's init method to set dynamic help text for the logistic_cost field
+        Help texts that depend on the concrete model, see
+        `set_dynamic_help_texts`.
         """
-        super().__init__(*args, **kwargs)
-
-        self.__class__.logistic_cost.field.help_text = \
-            _('If the logistic type is {0} based, '
-              'it takes the value of the money type.'
-              .format((self.__class__.__name__)[8:-5]))
+        return {
+            'logistic_cost': _('If the logistic type is {0} based, '
+                               'it takes the value of the money type.'
+                               .format(model.__name__[8:-5]))
+        }
 
     logistic_cost = MoneyField(
         _('logistic cost'),
@@ -429,23 +477,52 @@ class LogisticCostMixin(models.Model):
         abstract = True
 
 
+DYNAMIC_HELP_TEXT_MIXINS = (
+    TitleSlugMixin,
+    CountryProvinceCityMixin,
+    CustomerDetailsMixin,
+    LogisticCostMixin,
+)
+
+
+@receiver(class_prepared)
+def set_dynamic_help_texts(sender, **kwargs):
+    """
+    Sets the model-specific help texts of the mixins' fields once, when a
+    concrete model class is prepared, instead of on every instantiation.
+
+    Fields inherited from an abstract mixin are copied into each concrete
+    model, so every model gets its own help text. Proxy models and fields
+    owned by a concrete parent are left alone.
+    """
+    if sender._meta.proxy:
+        return
+    for mixin in DYNAMIC_HELP_TEXT_MIXINS:
+        if not issubclass(sender, mixin):
+            continue
+        for field_name, help_text in mixin.get_dynamic_help_texts(sender).items():
+            field = sender._meta.get_field(field_name)
+            if field.model is sender:
+                field.help_text = help_text
+
+
 class TruncateMixin:
     """A Mixin that provides a method to truncate the current model's table."""
 
     @classmethod
-    def truncate(cls):
+    def truncate(cls, using=None):
         """
         Truncates the table associated with the current model.
 
-        This method uses the `connection.cursor()` to execute a TRUNCATE TABLE query 
-        on the current model's table. The truncation is done using CASCADE to also truncate 
-        any related tables.
+        The tables referencing it are emptied too, as with
+        `TRUNCATE ... CASCADE`, and primary key sequences restart. See
+        `painless.repository.reset.reset_tables` to empty several models in
+        one statement.
 
         Returns:
-            None
+            list: the emptied table names.
         """
-        with connection.cursor() as cursor:
-            cursor.execute("TRUNCATE TABLE '{0}' CASCADE".format(cls._meta.db_table))  # noqa
+        return reset_tables(cls, using=using)
 
 
 class AdminLoginAttempt(models.Model):
@@ -1,3 +1,4 @@
 from .picture import DimensionValidator
 from .picture import ImageSizeValidator
+from .picture import ImageFormatValidator
 from .picture import SquareDimensionValidator
@@ -2,10 +2,37 @@ from django.utils.deconstruct import deconstructible
 from django.core.exceptions import ValidationError
 from django.core.validators import BaseValidator
 from django.core.files.images import get_image_dimensions
+from django.template.defaultfilters import filesizeformat
 from django.utils.translation import gettext_lazy as _
 
+from painless.helper.image import (
+    ImageHeader,
+    read_image_header
+)
 from painless.helper.typing import Byte
 
+_MISSING = object()
+
+
+def get_image_header(value) -> ImageHeader:
+    """
+    Sniff the format and dimensions of an uploaded picture once.
+
+    The result is kept on `value`, so every picture validator of a field
+    shares a single pass over the first bytes of the file instead of
+    reopening and decoding it per validator. Formats the header parser
+    does not know fall back to Pillow's incremental parser.
+    """
+    header = getattr(value, '_image_header', _MISSING)
+    if header is _MISSING:
+        value.open()
+        header = read_image_header(value)
+        if header is None:
+            width, height = get_image_dimensions(value)
+            header = ImageHeader(None, width, height)
+        value._image_header = header
+    return header
+
 
 @deconstructible
 class DimensionValidator(BaseValidator):
@@ -14,8 +41,8 @@ class DimensionValidator(BaseValidator):
         self.height = height
 
     def __call__(self, value):
-        pic = value.file.open()
-        width, height = get_image_dimensions(pic)
+        header = get_image_header(value)
+        width, height = header.width, header.height
         if not (width == self.width and height == self.height):
             raise ValidationError(
                 _(f'Expected dimension is: [{self.width}w, {self.height}h] but actual is: [{width}w, {height}h]'))  # noqa
@@ -27,8 +54,36 @@ class ImageSizeValidator(BaseValidator):
         self.limit_size = limit_size
 
     def __call__(self, value):
+        # `size` comes from the upload handler or the storage, the content
+        # is never read. Put this validator first to reject large uploads
+        # before anything sniffs them.
         if value.size > self.limit_size:
-            raise ValidationError(f'Please upload file lower than one Megabyte.')  # noqa
+            raise ValidationError(
+                _('Please upload a file smaller than %(limit)s.'),
+                code='file_too_large',
+                params={'limit': filesizeformat(self.limit_size)}
+            )
+
+
+@deconstructible
+class ImageFormatValidator(object):
+    def __init__(self, formats=('JPEG', 'PNG', 'WEBP', 'GIF')):
+        self.formats = tuple(formats)
+
+    def __call__(self, value):
+        image_format = get_image_header(value).format
+        if image_format not in self.formats:
+            raise ValidationError(
+                _('Upload a picture in one of these formats: %(formats)s.'),
+                code='invalid_image_format',
+                params={'formats': ', '.join(self.formats)}
+            )
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ImageFormatValidator)
+            and self.formats == other.formats
+        )
 
 
 @deconstructible
@@ -37,8 +92,8 @@ class SquareDimensionValidator(object):
         pass
 
     def __call__(self, value):
-        pic = value
-        width, height = get_image_dimensions(pic)
+        header = get_image_header(value)
+        width, height = header.width, header.height
 
         if not (width == height):
             raise ValidationError(
@@ -1,11 +1,20 @@
 import secrets
-import random
-from typing import Set
+import uuid
+from functools import lru_cache
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+    Set,
+    Tuple
+)
 from datetime import datetime
-from random import randint
 
+import numpy as np
 from django.utils import timezone
 from django.utils.text import slugify
+from mimesis.data import EMAIL_DOMAINS
 from mimesis.locales import Locale
 from mimesis import (
     Text,
@@ -18,13 +27,83 @@ from mimesis import (
 )
 from django_countries.fields import CountryField
 
+from painless.repository.codes import UniqueCodeGenerator
+from painless.repository.permutation import (
+    existing_phone_numbers,
+    unique_phone_numbers
+)
 
-class BaseDataGenerator:
-    """Generate reusable data"""
+STATUSES = (
+    'waiting',
+    'expiring',
+    'cancelled',
+    'shipped',
+    'processing',
+    'delivered',
+    'completed'
+)
+GENDERS = ('male', 'female')
+CURRENCIES = ('IRR', 'USD', 'EUR')
+VOUCHER_KINDS = ('static_based', 'code_based')
+VOUCHER_TYPES = ('fixed_price_based', 'percentage_based')
+VOUCHER_STATUSES = ('open', 'suspend', 'consumed')
+
+
+@lru_cache(maxsize=None)
+def get_country_codes() -> Tuple[str, ...]:
+    """ISO codes of every country django-countries knows, built once."""
+    return tuple(code for code, _ in CountryField().countries)
+
+
+def _flatten(data) -> List[str]:
+    """mimesis datasets are either a list or a list per gender."""
+    if isinstance(data, dict):
+        return [item for values in data.values() for item in values]
+    return list(data)
 
-    def __init__(self, locale='en'):
-        self.person = Person(getattr(Locale, locale.upper()))
-        self.text = Text(getattr(Locale, locale.upper()))
+
+class BaseDataGenerator:
+    """
+    Generate reusable data.
+
+    mimesis providers are built once per generator with its locale, and the
+    lookup tables (countries, names, jobs, ...) once per process. Every
+    `get_random_*` method returns one value; the `get_random_*_batch(n)`
+    methods return a whole column of `n` values as a list, drawn with NumPy
+    in one vectorized call, which is what bulk generators should use. Both
+    draw from the generator's own seeded `rng` and mimesis providers, never
+    from the global `random` state; only secrets (`get_random_secret*`)
+    come from `secrets` and are never reproducible.
+
+    PARAMS
+    ------
+    locale: str = 'en'
+        mimesis locale of the text providers.
+    seed: int = None
+        seed of the NumPy generator and the mimesis providers; the same seed
+        gives the same columns.
+    """
+
+    def __init__(self, locale='en', seed=None):
+        self.locale = getattr(Locale, locale.upper())
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.person = Person(self.locale, seed=seed)
+        self.text = Text(self.locale, seed=seed)
+        self.address = Address(self.locale, seed=seed)
+        self.datetime = Datetime(self.locale, seed=seed)
+        self.finance = Finance(self.locale, seed=seed)
+        self.food = Food(self.locale, seed=seed)
+        self.numeric = Numeric(seed=seed)
+        self.first_names = np.array(
+            _flatten(self.person.extract(['names'])), dtype=object
+        )
+        self.last_names = np.array(
+            _flatten(self.person.extract(['surnames'])), dtype=object
+        )
+        self.jobs = np.array(self.person.extract(['occupation']), dtype=object)
+        self.phone_number_key = secrets.randbits(63) if seed is None else seed
+        self.phone_number_index = 0
 
     def get_random_secret(self, nbytes=20):
         """Generate random string"""
@@ -32,98 +111,90 @@ class BaseDataGenerator:
 
     def get_random_color(self):
         """Generate random code"""
-        return Text().color()
+        return self.text.color()
 
     def get_random_hex_code(self):
         """Generate random hex code"""
-        return Text().hex_color()
+        return self.text.hex_color()
 
     def get_random_time(self):
         """Generate random time"""
-        return Datetime().time()
+        return self.datetime.time()
 
     def get_random_datetime(self, start, end):
         """Generate a random time between start and end."""
-        return Datetime().datetime(start=start, end=end).replace()
+        return self.datetime.datetime(start=start, end=end)
 
     def get_random_boolean(self):
         """Generate a random boolean."""
-        return random.choice([True, False])
+        return bool(self.rng.integers(2))
 
     def get_random_population(self, population, k):
-        objs = set(random.sample(population, k))
+        indexes = self.rng.choice(len(population), size=k, replace=False)
+        objs = {population[index] for index in indexes.tolist()}
         population = set(population)
         return list(objs), list(population - objs)
 
     def get_random_object(self, population):
-        return random.choice(population)
+        return self.get_random_choice_batch(1, population)[0]
 
     def get_random_float(self, lower, upper):
         """Generate a random float with 2 digits after seperator"""
-        return round(random.uniform(lower, upper), 2)
+        return round(float(self.rng.uniform(lower, upper)), 2)
 
     def get_random_currency(self):
         """Generate a random currency."""
-        return random.choice(['IRR', 'USD', 'EUR'])
+        return self.get_random_object(CURRENCIES)
 
     def get_random_price(self):
         """Generate a random price."""
-        return Finance().price()
+        return self.finance.price()
 
     def get_random_number(self, start=-100, stop=1000):
         """Generate a random number."""
-        return Numeric().integer_number(start=start, end=stop)
+        return self.numeric.integer_number(start=start, end=stop)
 
     def get_random_country(self):
-        """Generate a random country.249"""
-        return tuple(CountryField().countries)[randint(0,200)][0]
+        """Generate a random country code out of every known country."""
+        return self.get_random_object(get_country_codes())
 
     def get_random_country_code(self):
         """Generate a random country code"""
-        return Address().country_code()
+        return self.address.country_code()
 
     def get_random_city(self):
         """Generate a random city."""
-        return Address().city()
+        return self.address.city()
 
     def get_random_address(self):
         """Generate a random address."""
-        return Address().address()
+        return self.address.address()
 
     def get_random_postal_code(self):
         """Generate a random postal_code."""
-        return Address().postal_code()
+        return self.address.postal_code()
 
     def get_random_street_number(self):
         """Generate a random street_number."""
-        return Address().street_number()
+        return self.address.street_number()
 
     def get_random_full_name(self):
         """Generate a random full_name."""
-        return Person().full_name()
+        return self.person.full_name()
 
     def get_random_first_name(self):
-        return Person().first_name()
+        return self.person.first_name()
 
     def get_random_last_name(self):
-        return Person().last_name()
+        return self.person.last_name()
 
     def get_random_telephone(self):
         """Generate a random telephone."""
-        return slugify(Person().telephone())
+        return slugify(self.person.telephone())
 
     def get_random_status(self):
         """Generate a random status."""
-        status = [
-            'waiting',
-            'expiring',
-            'cancelled',
-            'shipped',
-            'processing',
-            'delivered',
-            'completed'
-        ]
-        return random.choice(status)
+        return self.get_random_object(STATUSES)
 
     def get_image_banner(self, index):
         """Generate a random image banner."""
@@ -146,24 +217,20 @@ class BaseDataGenerator:
         return result
 
     def get_random_sentence(self):
-        return Text().sentence()
+        return self.text.sentence()
 
     def get_random_email(self):
-        return Person().email()
+        return self.person.email()
 
     def get_random_job(self):
-        return Person().occupation()
+        return self.person.occupation()
 
     def get_random_gender(self):
         """Generate a random gender."""
-        gender = [
-            'male',
-            'female'
-        ]
-        return random.choice(gender)
+        return self.get_random_object(GENDERS)
 
     def get_random_province(self):
-        return Address().province()
+        return self.address.province()
 
     def get_unique_phone_number_set(
             self, min_length: int, digits: int
@@ -192,13 +259,61 @@ class BaseDataGenerator:
                 set([self.get_random_telephone()[:digits] for _ in range(10)]))
         return phone_number_set
 
+    def iter_unique_phone_numbers(
+            self, total: int, model=None, field: str = 'phone_number',
+            chunk_size: int = 100000
+    ) -> Iterator[List[str]]:
+        """
+        `total` distinct `09xxxxxxxxx` phone numbers in chunks of at most
+        `chunk_size`, in O(total) and without retries (see
+        `painless.repository.permutation`). Successive calls on one
+        generator never repeat a number.
+
+        PARAMS
+        ------
+        total: int
+            how many phone numbers to generate.
+        model: Model = None
+            when given, numbers already stored in `model.field` are skipped.
+        field: str = 'phone_number'
+            the phone number field of `model`.
+        chunk_size: int = 100000
+            numbers per yielded list.
+        """
+        exclude = None
+        if model is not None:
+            exclude = existing_phone_numbers(model, field)
+        start = self.phone_number_index
+        self.phone_number_index += total
+        if exclude is not None:
+            self.phone_number_index += len(exclude)
+        return unique_phone_numbers(
+            total, key=self.phone_number_key, start=start, exclude=exclude,
+            chunk_size=chunk_size
+        )
+
+    def get_unique_phone_numbers(
+            self, total: int, model=None, field: str = 'phone_number'
+    ) -> List[str]:
+        """`iter_unique_phone_numbers` as one list."""
+        numbers = list()
+        for chunk in self.iter_unique_phone_numbers(total, model, field):
+            numbers.extend(chunk)
+        return numbers
+
     def get_currency_exchange(self, source_currency, source_value, rial_profit, toman_profit, usd_profit):
         if source_currency == 'R':
-            target_value = int(int(source_value) * random.uniform(*rial_profit))
+            target_value = int(
+                int(source_value) * float(self.rng.uniform(*rial_profit))
+            )
         elif source_currency == 'T':
-            target_value = int(int(source_value) * random.uniform(*toman_profit))
+            target_value = int(
+                int(source_value) * float(self.rng.uniform(*toman_profit))
+            )
         else:
-            target_value = round(int(source_value) * random.uniform(*usd_profit), 2)
+            target_value = round(
+                int(source_value) * float(self.rng.uniform(*usd_profit)), 2
+            )
         return target_value
 
     def get_voucher_kind(self, static_chance: int = 20):
@@ -211,25 +326,19 @@ class BaseDataGenerator:
             chance for every created voucher to be static.
         """
 
-        kinds = ('static_based', 'code_based')
-        return random.choices(kinds,
-                              weights=(static_chance, (100 - static_chance)),
-                              k=1
-                              )[0]
+        return self.get_voucher_kind_batch(1, static_chance)[0]
 
     def get_voucher_type(self):
         """
         Get a random type for voucher.
         """
-        types = ('fixed_price_based', 'percentage_based')
-        return random.choice(types)
+        return self.get_random_object(VOUCHER_TYPES)
 
     def get_voucher_status(self):
         """
         Get a random status for voucher.
         """
-        status = ('open', 'suspend', 'consumed')
-        return random.choice(status)
+        return self.get_random_object(VOUCHER_STATUSES)
 
     def get_random_percentage(self, start: int = 1, end: int = 100):
         """
@@ -247,25 +356,36 @@ class BaseDataGenerator:
             raise ValueError(f"start has to be smaller than end, however given"
                              f"start is {start} and given end is {end}")
         else:
-            return random.randint(start, end)
+            return int(self.rng.integers(start, end, endpoint=True))
 
-    def get_unique_hashes_list(self, total: int, element_length: int = 12):
+    def get_unique_hashes_list(
+            self, total: int, element_length: int = 12, model=None,
+            field: str = 'code'
+    ):
         """
-        Get a set(which has unique elements) of hashes.
+        Get a list of unique url-safe hashes, as long as
+        `get_random_secret(element_length)` ones. See `UniqueCodeGenerator`.
+
+        For generated test data only: the permutation key comes from the
+        seeded generator, so the same seed gives the same, predictable list.
 
         PARAMS:
         total: int:
-            length of the set.
+            length of the list.
         element_length: int = 12:
-            length of each element in the set.
+            random bytes behind each element of the list.
+        model: Model = None:
+            when given, hashes already stored in `model.field` are skipped.
+        field: str = 'code':
+            the unique field of `model`.
         """
-        hash_set = {self.get_random_secret(element_length) for _ in range(total)}
-        while len(hash_set) < total:
-            hash_set = set.union(
-                hash_set,
-                {self.get_random_secret(element_length) for _ in range(10)}
-            )
-        return list(hash_set)[:total]
+        generator = UniqueCodeGenerator(
+            length=len(self.get_random_secret(element_length)),
+            model=model,
+            field=field,
+            key=int(self.rng.integers(2 ** 63)),
+        )
+        return generator.generate(total)
 
     def get_random_time_between_two_datetime_objects(
             self, time1: datetime, time2: datetime, tz: timezone = timezone.utc
@@ -288,11 +408,196 @@ class BaseDataGenerator:
         if time1 > time2:
             raise ValueError("start time is later than end time"
                              f"{time1} > {time2}")
-        random_time = random.randint(time1, time2)
+        random_time = int(self.rng.integers(time1, time2, endpoint=True))
         return datetime.fromtimestamp(random_time).replace(tzinfo=tz)
 
     def get_random_spice(self):
         """
         Gets the name of a random spice.
         """
-        return Food().spices()
+        return self.food.spices()
+
+    # Batch variants: a column of `n` values per call.
+
+    def get_random_choice_batch(
+            self, n: int, population: Sequence, weights: Sequence = None
+    ) -> list:
+        """
+        `n` values drawn with replacement from `population`.
+
+        PARAMS
+        ------
+        n: int
+            length of the column.
+        population: Sequence
+            values to choose from.
+        weights: Sequence = None
+            relative weight of every value, uniform by default.
+        """
+        p = None
+        if weights is not None:
+            p = np.asarray(weights, dtype=float)
+            p = p / p.sum()
+        indexes = self.rng.choice(len(population), size=n, p=p)
+        if isinstance(population, np.ndarray):
+            return population[indexes].tolist()
+        return [population[index] for index in indexes.tolist()]
+
+    def get_random_boolean_batch(self, n: int) -> List[bool]:
+        return self.rng.integers(0, 2, size=n).astype(bool).tolist()
+
+    def get_random_number_batch(
+            self, n: int, start: int = -100, stop: int = 1000
+    ) -> List[int]:
+        """`n` integers between start and stop, both included."""
+        return self.rng.integers(start, stop, size=n, endpoint=True).tolist()
+
+    def get_random_float_batch(
+            self, n: int, lower: float, upper: float
+    ) -> List[float]:
+        """`n` floats with 2 digits after separator."""
+        return np.round(self.rng.uniform(lower, upper, size=n), 2).tolist()
+
+    def get_random_percentage_batch(
+            self, n: int, start: int = 1, end: int = 100
+    ) -> List[int]:
+        return self.get_random_number_batch(n, start, end)
+
+    def get_random_currency_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, CURRENCIES)
+
+    def get_random_country_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, get_country_codes())
+
+    def get_random_status_batch(
+            self, n: int, weights: Dict[str, float] = None
+    ) -> List[str]:
+        """
+        `n` values of `STATUSES`.
+
+        PARAMS
+        ------
+        n: int
+            length of the column.
+        weights: Dict[str, float] = None
+            relative weight per status, uniform by default; statuses left
+            out are not drawn. Raises ValueError for a name that is not in
+            `STATUSES`.
+        """
+        if weights is None:
+            return self.get_random_choice_batch(n, STATUSES)
+        unknown = set(weights) - set(STATUSES)
+        if unknown:
+            raise ValueError(f"unknown statuses {sorted(unknown)}, "
+                             f"statuses are {STATUSES}")
+        return self.get_random_choice_batch(
+            n, STATUSES, [weights.get(status, 0) for status in STATUSES]
+        )
+
+    def get_random_gender_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, GENDERS)
+
+    def get_currency_exchange_batch(
+            self, source_currencies: Sequence[str], source_values: Sequence,
+            rial_profit, toman_profit, usd_profit
+    ) -> list:
+        """
+        `get_currency_exchange` of every pair of `source_currencies` and
+        `source_values`.
+        """
+        currencies = np.asarray(source_currencies, dtype=object)
+        values = np.asarray(source_values, dtype=float).astype(np.int64)
+        rial = currencies == 'R'
+        toman = currencies == 'T'
+        low = np.where(rial, rial_profit[0],
+                       np.where(toman, toman_profit[0], usd_profit[0]))
+        high = np.where(rial, rial_profit[1],
+                        np.where(toman, toman_profit[1], usd_profit[1]))
+        targets = values * self.rng.uniform(low, high)
+        integral = rial | toman
+        return [
+            int(target) if is_integral else round(float(target), 2)
+            for target, is_integral in zip(targets.tolist(), integral.tolist())
+        ]
+
+    def get_voucher_kind_batch(
+            self, n: int, static_chance: int = 20
+    ) -> List[str]:
+        return self.get_random_choice_batch(
+            n, VOUCHER_KINDS, weights=(static_chance, 100 - static_chance)
+        )
+
+    def get_voucher_type_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, VOUCHER_TYPES)
+
+    def get_voucher_status_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, VOUCHER_STATUSES)
+
+    def get_random_first_name_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, self.first_names)
+
+    def get_random_last_name_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, self.last_names)
+
+    def get_random_job_batch(self, n: int) -> List[str]:
+        return self.get_random_choice_batch(n, self.jobs)
+
+    def get_random_email_batch(self, n: int) -> List[str]:
+        """
+        `n` emails shaped like mimesis' `<word><digits>@<domain>`, not
+        unique.
+        """
+        names = self.get_random_first_name_batch(n)
+        numbers = self.rng.integers(0, 10000, size=n).tolist()
+        domains = self.get_random_choice_batch(n, EMAIL_DOMAINS)
+        return [
+            f'{name.lower()}{number}{domain}'
+            for name, number, domain in zip(names, numbers, domains)
+        ]
+
+    def get_random_uuid_batch(self, n: int) -> List[uuid.UUID]:
+        """
+        `n` version 4 UUIDs drawn from the generator, reproducible with a
+        seed.
+        """
+        data = self.rng.bytes(16 * n)
+        return [
+            uuid.UUID(bytes=data[index:index + 16], version=4)
+            for index in range(0, 16 * n, 16)
+        ]
+
+    def get_random_secret_batch(self, n: int, nbytes: int = 20) -> List[str]:
+        return [secrets.token_urlsafe(nbytes) for _ in range(n)]
+
+    def get_random_time_between_batch(
+            self, n: int, time1: datetime, time2: datetime,
+            tz: timezone = timezone.utc
+    ) -> List[datetime]:
+        """
+        `n` aware datetimes, to the second, between two datetime objects.
+        raises ValueError if start time is bigger than end time.
+        """
+        start = int(datetime.timestamp(time1))
+        end = int(datetime.timestamp(time2))
+        if start > end:
+            raise ValueError("start time is later than end time"
+                             f"{start} > {end}")
+        seconds = self.rng.integers(start, end, size=n, endpoint=True)
+        naive = seconds.astype('datetime64[s]').astype(object)
+        return [
+            value.replace(tzinfo=timezone.utc).astimezone(tz) for value in naive
+        ]
+
+    def get_random_datetime_batch(
+            self, n: int, start: int, end: int
+    ) -> List[datetime]:
+        """
+        `n` naive datetimes from the start of year `start` to the end of year
+        `end`.
+        """
+        seconds = self.rng.integers(
+            int(np.datetime64(f'{start:04d}-01-01', 's').astype(np.int64)),
+            int(np.datetime64(f'{end + 1:04d}-01-01', 's').astype(np.int64)),
+            size=n
+        )
+        return seconds.astype('datetime64[s]').astype(object).tolist()
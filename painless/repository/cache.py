@@ -0,0 +1,363 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import (
+    Any,
+    Optional,
+    Tuple
+)
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import (
+    models,
+    transaction
+)
+from django.db.models.signals import (
+    post_delete,
+    post_save
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_config() -> dict:
+    return getattr(settings, 'REPOSITORY_CACHE', dict())
+
+
+class LocalLRU:
+    """Small thread-safe LRU kept in the worker process."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RowCache:
+    """
+    Two-level read-through cache of model rows, invalidated by version stamps.
+
+    Every cached row has a version stamp in the shared cache, and every
+    model a generation stamp. Saving or deleting the row replaces its
+    stamp; writes that bypass the ORM, `reset_tables` and `BulkLoader`,
+    replace the generation of the model, which drops all of its rows at
+    once. Both are replaced right away and again when the transaction
+    commits, so readers never trust a copy stored under an old stamp.
+    Rows are kept under `(pk, generation, stamp)`, in the process-local
+    LRU and in the shared cache; unique-value lookups only map a value to a
+    pk. A lookup costs one shared-cache read for the stamps when the row
+    is in the local LRU, and at most three reads without touching the
+    database otherwise. A row first looked up by a unique value is cached
+    on its second lookup, once its pk, and so its stamp, is known
+    beforehand. Other raw SQL writes are not seen: call `invalidate_rows`
+    or `invalidate_models` after them.
+
+    Configured with the `REPOSITORY_CACHE` setting:
+        ENABLED: bool
+            Serve `get()` from the cache; when off, the default, every
+            `get()` queries.
+        CACHE: str
+            Alias of the shared cache.
+        TIMEOUT: int
+            Seconds rows and lookups stay in the shared cache; stamps stay
+            twice as long.
+        LOCAL_SIZE: int
+            Rows kept in the process-local LRU.
+    """
+
+    def __init__(self):
+        self._local = None
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return get_config().get('ENABLED', False)
+
+    @property
+    def shared(self):
+        return caches[get_config().get('CACHE', 'default')]
+
+    @property
+    def timeout(self) -> int:
+        return get_config().get('TIMEOUT', 300)
+
+    @property
+    def stamp_timeout(self) -> int:
+        # Outlives the rows stored under a stamp; an expired stamp is
+        # replaced by a new one, which only costs misses.
+        return 2 * self.timeout
+
+    @property
+    def local(self) -> LocalLRU:
+        if self._local is None:
+            self._local = LocalLRU(get_config().get('LOCAL_SIZE', 1024))
+        return self._local
+
+    @staticmethod
+    def prefix(model) -> str:
+        return f'rowcache:{model._meta.label_lower}'
+
+    def version(self, model, pk) -> str:
+        """
+        Current `generation:stamp` of a row, read in one shared-cache call;
+        stamps the shared cache has not got are created.
+        """
+        prefix = self.prefix(model)
+        keys = (f'{prefix}:gen', f'{prefix}:v:{pk}')
+        stamps = self.shared.get_many(keys)
+        for key in keys:
+            if key not in stamps:
+                stamp = uuid.uuid4().hex
+                if not self.shared.add(key, stamp, self.stamp_timeout):
+                    stamp = self.shared.get(key, stamp)
+                stamps[key] = stamp
+        return ':'.join(stamps[key] for key in keys)
+
+    def invalidate(self, model, pk) -> None:
+        """Give a row a new stamp; every cached copy becomes unreachable."""
+        self.invalidations += 1
+        self.shared.set(f'{self.prefix(model)}:v:{pk}', uuid.uuid4().hex,
+                        self.stamp_timeout)
+
+    def invalidate_model(self, model) -> None:
+        """
+        Give a model a new generation; every cached row of it becomes
+        unreachable.
+        """
+        self.invalidations += 1
+        self.shared.set(f'{self.prefix(model)}:gen', uuid.uuid4().hex,
+                        self.stamp_timeout)
+
+    def get(self, queryset, field: str, value) -> models.Model:
+        model = queryset.model
+        prefix = self.prefix(model)
+        if field == 'pk':
+            pk = value
+        else:
+            lookup_key = f'{prefix}:{field}:{value}'
+            pk = self.local.get(lookup_key)
+            if pk is None:
+                pk = self.shared.get(lookup_key)
+        stamp = None
+        if pk is not None:
+            stamp = self.version(model, pk)
+            row_key = f'{prefix}:{pk}:{stamp}'
+            row = self.local.get(row_key)
+            if row is not None:
+                self.local_hits += 1
+            else:
+                row = self.shared.get(row_key)
+                if row is not None:
+                    self.shared_hits += 1
+                    self.local.set(row_key, row)
+            if row is not None and (
+                    field == 'pk' or row[1][row[0].index(field)] == value):
+                return model.from_db(queryset.db, *row)
+
+        self.misses += 1
+        obj = queryset.uncached_get(**{field: value})
+        self.store(obj, field, value, stamp)
+        return obj
+
+    def store(self, obj, field: str, value, stamp: str = None) -> None:
+        """
+        Cache `obj`, read from the database while `stamp` was current.
+
+        The stamp must be read before the row: read after, it may already
+        belong to a write committed in between and would keep the stale row
+        reachable. Without a stamp, when the row was looked up by a unique
+        value whose pk was not known yet, only the value is mapped to the
+        pk; the next lookup reads the stamp first and caches the row.
+        """
+        model = type(obj)
+        prefix = self.prefix(model)
+        if stamp is not None:
+            row = self.row(obj)
+            row_key = f'{prefix}:{obj.pk}:{stamp}'
+            self.local.set(row_key, row)
+            self.shared.set(row_key, row, self.timeout)
+        if field != 'pk':
+            lookup_key = f'{prefix}:{field}:{value}'
+            self.local.set(lookup_key, obj.pk)
+            self.shared.set(lookup_key, obj.pk, self.timeout)
+
+    @staticmethod
+    def row(obj) -> Tuple[list, list]:
+        """`(attnames, values)` in the shape `Model.from_db` expects."""
+        fields = obj._meta.concrete_fields
+        names = [field.attname for field in fields]
+        return names, [getattr(obj, name) for name in names]
+
+    def clear_local(self) -> None:
+        self.local.clear()
+
+    def stats(self) -> dict:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        hits = self.local_hits + self.shared_hits
+        return {
+            'local_hits': self.local_hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'bypasses': self.bypasses,
+            'invalidations': self.invalidations,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'local_size': len(self.local),
+        }
+
+
+row_cache = RowCache()
+
+
+class CachedQuerySet(models.QuerySet):
+    """
+    QuerySet whose `get()` by primary key or by a field named in the
+    model's `CACHED_LOOKUPS` is served from `row_cache`.
+
+    Only a plain `Model.objects.get(<field>=<value>)` outside a transaction
+    is cached; a `get()` inside `atomic`, or on a filtered, annotated,
+    deferred, `select_related` or `select_for_update` queryset, goes to the
+    database as usual.
+    `update()` and `bulk_update()` invalidate the rows they touch; with
+    the cache disabled `update()` does not read their pks first.
+    """
+
+    def _cached_lookup(self, args, kwargs):
+        if args or len(kwargs) != 1 or not row_cache.enabled:
+            return None
+        # Inside a transaction the row may hold uncommitted writes that a
+        # rollback would undo after they were cached.
+        if transaction.get_connection(self.db).in_atomic_block:
+            return None
+        (field, value), = kwargs.items()
+        pk_field = self.model._meta.pk
+        if field in ('pk', pk_field.name, f'{pk_field.name}__exact'):
+            field = 'pk'
+            try:
+                value = pk_field.to_python(value)
+            except ValidationError:
+                return None
+        elif field not in getattr(self.model, 'CACHED_LOOKUPS', ()):
+            return None
+        query = self.query
+        if (query.where or query.select_related or query.annotations
+                or query.select_for_update or query.is_sliced
+                or query.deferred_loading != (frozenset(), True)
+                or self._fields is not None or value is None):
+            return None
+        return field, value
+
+    def get(self, *args, **kwargs):
+        lookup = self._cached_lookup(args, kwargs)
+        if lookup is None:
+            if row_cache.enabled:
+                row_cache.bypasses += 1
+            return super().get(*args, **kwargs)
+        return row_cache.get(self, *lookup)
+
+    def uncached_get(self, *args, **kwargs):
+        return super().get(*args, **kwargs)
+
+    def update(self, **kwargs):
+        if not row_cache.enabled:
+            return super().update(**kwargs)
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        invalidate_rows(self.model, pks)
+        return rows
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        invalidate_rows(self.model, [obj.pk for obj in objs])
+        return rows
+
+
+def invalidate_rows(model, pks) -> None:
+    """Invalidate rows now and again once the current transaction commits."""
+    pks = list(pks)
+    for pk in pks:
+        row_cache.invalidate(model, pk)
+
+    def on_commit():
+        for pk in pks:
+            row_cache.invalidate(model, pk)
+    transaction.on_commit(on_commit)
+
+
+def uses_row_cache(model) -> bool:
+    """Whether a manager of `model` serves `get()` from `row_cache`."""
+    return any(
+        issubclass(getattr(manager, '_queryset_class', object), CachedQuerySet)
+        for manager in model._meta.managers
+    )
+
+
+def invalidate_models(*models) -> None:
+    """
+    Invalidate every row of `models`, now and again once the current
+    transaction commits; for writes that bypass the ORM. Models not using
+    `row_cache` are skipped.
+    """
+    models = [model for model in models if uses_row_cache(model)]
+    for model in models:
+        row_cache.invalidate_model(model)
+
+    def on_commit():
+        for model in models:
+            row_cache.invalidate_model(model)
+    if models:
+        transaction.on_commit(on_commit)
+
+
+def invalidate_instance(sender, instance, **kwargs):
+    """`post_save` / `post_delete` receiver of models using `CachedManager`."""
+    if instance.pk is not None:
+        invalidate_rows(sender, [instance.pk])
+
+
+class CachedManager(models.Manager.from_queryset(CachedQuerySet)):
+    """
+    Manager serving `get()` by pk and by `CACHED_LOOKUPS` fields from
+    `row_cache`. A model opts in by using it (or a manager whose queryset
+    subclasses `CachedQuerySet`) and naming its unique lookup fields:
+
+        class Product(SKUMixin, TitleSlugMixin, TimeStampMixin):
+            CACHED_LOOKUPS = ('sku', 'slug')
+            objects = CachedManager()
+    """
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            label = cls._meta.label_lower
+            post_save.connect(invalidate_instance, sender=cls, weak=False,
+                              dispatch_uid=f'rowcache-save-{label}')
+            post_delete.connect(invalidate_instance, sender=cls, weak=False,
+                                dispatch_uid=f'rowcache-delete-{label}')
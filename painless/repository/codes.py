@@ -0,0 +1,156 @@
+import secrets
+import string
+from typing import (
+    Iterator,
+    List,
+    Set
+)
+
+import numpy as np
+from django.db import router
+
+from painless.helper.sku import ALPHABET
+from painless.repository.permutation import FeistelPermutation
+
+URLSAFE_ALPHABET = string.ascii_letters + string.digits + '-_'
+CROCKFORD_ALPHABET = ALPHABET
+# Largest index space permuted; keeps the Feistel halves within 31 bits.
+MAX_SPACE = 2 ** 62
+
+_MIX = np.uint64(0xBF58476D1CE4E5B9)
+
+
+class UniqueCodeGenerator:
+    """
+    Generate codes of `length` characters from `alphabet` for generated
+    test data (the voucher codes and tokens of fake rows, ...) that are
+    unique within the generator and not yet stored in `model.field`.
+
+    The codes are not secrets: a 4-round Feistel network is not a
+    cryptographic permutation, and whoever knows the key, or enough codes,
+    can work out the others. Codes handed out to real users must come from
+    `secrets` (e.g. `secrets.token_urlsafe`).
+
+    Code `i` is the image of index `i` under a keyed permutation of
+    `min(len(alphabet) ** length, 2 ** 62)` values, written in base
+    `len(alphabet)` in the last characters; the leading characters left
+    over, if any, are a keyed hash of the same value. Codes are therefore
+    distinct by construction, without a set of what was already generated,
+    and successive calls continue where the previous one stopped. Every
+    chunk is checked against the database with `field__in` queries of
+    `check_size` codes, and the stored ones are replaced by further indexes.
+    Memory is bounded by one chunk whatever `count` is.
+
+    PARAMS
+    ------
+    length: int = 12
+        characters per code.
+    alphabet: str = URLSAFE_ALPHABET
+        ASCII characters codes are made of, each used once.
+    model: Model = None
+        model whose `field` must not already hold the code.
+    field: str = 'code'
+        the unique code field of `model`.
+    key: int = None
+        permutation key, random when omitted.
+    check_size: int = 5000
+        codes per `field__in` query.
+    using: str = None
+        database alias checked, default the router's read database of `model`.
+    """
+
+    def __init__(
+            self,
+            length: int = 12,
+            alphabet: str = URLSAFE_ALPHABET,
+            model=None,
+            field: str = 'code',
+            key: int = None,
+            check_size: int = 5000,
+            using: str = None
+    ):
+        if (len(set(alphabet)) != len(alphabet) or len(alphabet) < 2
+                or not alphabet.isascii()):
+            raise ValueError(f'alphabet has to hold at least 2 distinct '
+                             f'ASCII characters, however given alphabet is '
+                             f'{alphabet!r}')
+        self.length = length
+        self.alphabet = alphabet
+        self.model = model
+        self.field = field
+        self.check_size = check_size
+        self.using = using
+        self.key = secrets.randbits(63) if key is None else key
+        base = len(alphabet)
+        self.permutation = FeistelPermutation(min(base ** length, MAX_SPACE),
+                                              key=self.key)
+        # characters needed to write every permuted value
+        self.value_digits = 1
+        while base ** self.value_digits < self.permutation.size:
+            self.value_digits += 1
+        self.index = 0
+        self._symbols = np.frombuffer(alphabet.encode('ascii'), dtype=np.uint8)
+        rng = np.random.default_rng(self.key)
+        self._hash_key = np.uint64(rng.integers(1, 2 ** 63))
+
+    @property
+    def remaining(self) -> int:
+        return self.permutation.size - self.index
+
+    def encode(self, values: np.ndarray) -> List[str]:
+        """Codes of permuted values."""
+        base = np.uint64(len(self.alphabet))
+        values = np.asarray(values, dtype=np.uint64)
+        digits = np.empty((len(values), self.length), dtype=np.uint8)
+        number = values.copy()
+        last = self.length - 1
+        for position in range(last, last - self.value_digits, -1):
+            digits[:, position] = number % base
+            number //= base
+        if self.value_digits < self.length:
+            mixed = (values ^ self._hash_key) * _MIX
+            mixed ^= mixed >> np.uint64(31)
+            for position in range(self.length - self.value_digits - 1, -1, -1):
+                digits[:, position] = mixed % base
+                mixed //= base
+        codes = self._symbols[digits]
+        return [code.decode('ascii')
+                for code in codes.view(f'S{self.length}').ravel().tolist()]
+
+    def existing(self, codes: List[str]) -> Set[str]:
+        """The `codes` already stored, looked up `check_size` at a time."""
+        if self.model is None:
+            return set()
+        alias = self.using or router.db_for_read(self.model)
+        queryset = self.model._default_manager.using(alias)
+        found = set()
+        for start in range(0, len(codes), self.check_size):
+            batch = codes[start:start + self.check_size]
+            found.update(
+                queryset.filter(**{f'{self.field}__in': batch})
+                .values_list(self.field, flat=True)
+            )
+        return found
+
+    def codes(self, count: int, chunk_size: int = 100000) -> Iterator[List[str]]:
+        """Yield `count` new codes in chunks of at most `chunk_size`."""
+        remaining = count
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            if size > self.remaining:
+                raise ValueError(f'only {self.remaining} codes of length '
+                                 f'{self.length} are left')
+            chunk = self.encode(self.permutation.take(self.index, size))
+            self.index += size
+            taken = self.existing(chunk)
+            if taken:
+                chunk = [code for code in chunk if code not in taken]
+            remaining -= len(chunk)
+            yield chunk
+
+    def generate(self, count: int) -> List[str]:
+        """`count` new codes as one list."""
+        codes = list()
+        for chunk in self.codes(count):
+            codes.extend(chunk)
+        return codes
@@ -0,0 +1,240 @@
+import json
+import os
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional
+)
+
+from django.db import (
+    NotSupportedError,
+    connections,
+    router
+)
+from django.test.utils import CaptureQueriesContext
+
+# Node keys kept in a plan shape; costs and timings vary between runs.
+SHAPE_KEYS = (
+    ('Node Type', 'type'),
+    ('Relation Name', 'relation'),
+    ('Index Name', 'index'),
+    ('Plan Rows', 'rows'),
+)
+SEQUENTIAL_SCAN = 'Seq Scan'
+
+
+def _explain(cursor, sql: str, params=None) -> dict:
+    # `QuerySet.explain` joins the rows into text, losing the JSON document.
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]['Plan']
+
+
+def _postgresql(queryset):
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        raise NotSupportedError('EXPLAIN plans are only compared on PostgreSQL.')
+    return connection
+
+
+def explain_plan(queryset) -> dict:
+    """
+    Root node of `EXPLAIN (FORMAT JSON)` of `queryset`, on PostgreSQL only.
+    Only the main query is explained, not the `prefetch_related` ones; see
+    `explain_queries`.
+    """
+    connection = _postgresql(queryset)
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        return _explain(cursor, sql, params)
+
+
+def explain_queries(queryset) -> List[dict]:
+    """
+    Root nodes of `EXPLAIN (FORMAT JSON)` of every query `queryset` runs
+    when evaluated, on PostgreSQL only: the main query, then the
+    `prefetch_related` ones. `queryset` itself is not evaluated.
+    """
+    connection = _postgresql(queryset)
+    with CaptureQueriesContext(connection) as queries:
+        list(queryset._chain())
+    with connection.cursor() as cursor:
+        # The captured SQL has its parameters inlined.
+        return [_explain(cursor, query['sql'])
+                for query in queries.captured_queries]
+
+
+def plan_shape(plan: dict) -> dict:
+    """
+    The parts of a plan that should only change with the query: total
+    cost, estimated rows and, depth first, the type, relation, index and
+    estimated rows of every node.
+    """
+    nodes = list()
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        nodes.append({key: node[name]
+                      for name, key in SHAPE_KEYS if name in node})
+        pending.extend(reversed(node.get('Plans', ())))
+    return {
+        'total_cost': plan['Total Cost'],
+        'rows': plan['Plan Rows'],
+        'nodes': nodes,
+    }
+
+
+def queryset_shape(queryset) -> dict:
+    """
+    `plan_shape` of the main query of `queryset`, with the shapes of its
+    `prefetch_related` queries under `prefetches`.
+    """
+    main, *prefetches = explain_queries(queryset)
+    shape = plan_shape(main)
+    shape['prefetches'] = [plan_shape(plan) for plan in prefetches]
+    return shape
+
+
+def sequential_scans(shape: dict) -> set:
+    return {node.get('relation') for node in shape['nodes']
+            if node['type'] == SEQUENTIAL_SCAN}
+
+
+def compare_plans(
+        baseline: dict,
+        current: dict,
+        table_rows: Dict[str, int],
+        cost_growth: float = 1.5,
+        large_table: int = 10000
+) -> List[str]:
+    """
+    Regressions of plan shape `current` against `baseline`, as messages;
+    empty when the plan is acceptable. The `prefetches` of the shapes are
+    compared one by one, and an added query is a regression.
+
+    PARAMS
+    ------
+    baseline: dict
+        checked-in `queryset_shape` or `plan_shape`.
+    current: dict
+        `queryset_shape` or `plan_shape` of the queryset now.
+    table_rows: Dict[str, int]
+        estimated rows per table, see `table_rows`.
+    cost_growth: float = 1.5
+        ratio of the total costs above which the plan is a regression.
+    large_table: int = 10000
+        rows from which a new sequential scan of a table is a regression.
+    """
+    problems = list()
+    added = sequential_scans(current) - sequential_scans(baseline)
+    for relation in sorted(added, key=str):
+        rows = table_rows.get(relation, 0)
+        if rows >= large_table:
+            problems.append(f'sequential scan on {relation} ({rows} rows) '
+                            f'is not in the baseline')
+    if current['total_cost'] > baseline['total_cost'] * cost_growth:
+        problems.append(
+            f'total cost grew from {baseline["total_cost"]} '
+            f'to {current["total_cost"]} (more than {cost_growth}x)'
+        )
+    before = baseline.get('prefetches', ())
+    after = current.get('prefetches', ())
+    if len(after) > len(before):
+        problems.append(f'runs {len(after)} prefetch queries, '
+                        f'{len(before)} in the baseline')
+    for index, (old, new) in enumerate(zip(before, after), 1):
+        problems.extend(
+            f'prefetch query {index}: {problem}'
+            for problem in compare_plans(old, new, table_rows, cost_growth,
+                                         large_table)
+        )
+    return problems
+
+
+def table_rows(using: str = 'default') -> Dict[str, int]:
+    """Planner row estimate (`pg_class.reltuples`) of every table."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT relname, reltuples FROM pg_class "
+                       "WHERE relkind IN ('r', 'p')")
+        return {name: int(rows) for name, rows in cursor.fetchall()}
+
+
+def analyze_tables(*models, using: str = None) -> None:
+    """Refresh the planner statistics of `models`' tables, on PostgreSQL."""
+    using = using or router.db_for_write(models[0])
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for model in models:
+            table = connection.ops.quote_name(model._meta.db_table)
+            cursor.execute(f'ANALYZE {table}')
+
+
+class PlanBaselines:
+    """
+    Checked-in `queryset_shape`s, one `<name>.json` file per queryset in
+    `directory`.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.json')
+
+    def names(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return list()
+        return sorted(file[:-len('.json')]
+                      for file in os.listdir(self.directory)
+                      if file.endswith('.json'))
+
+    def read(self, name: str) -> Optional[dict]:
+        path = self.path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path) as baseline:
+            return json.load(baseline)
+
+    def write(self, name: str, shape: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(name), 'w') as baseline:
+            json.dump(shape, baseline, indent=2, sort_keys=True)
+            baseline.write('\n')
+
+    def check(
+            self, querysets: Dict[str, object], **thresholds
+    ) -> Dict[str, List[str]]:
+        """
+        Regressions of every queryset in `querysets`, by name; a queryset
+        without a baseline is one. `thresholds` are passed to
+        `compare_plans`.
+        """
+        regressions = dict()
+        rows = None
+        for name, queryset in querysets.items():
+            baseline = self.read(name)
+            if baseline is None:
+                regressions[name] = ['no baseline, run `manage.py '
+                                     'update_plan_baselines --yes`']
+                continue
+            if rows is None:
+                rows = table_rows(queryset.db)
+            current = queryset_shape(queryset)
+            problems = compare_plans(baseline, current, rows, **thresholds)
+            if problems:
+                regressions[name] = problems
+        return regressions
+
+    def update(self, querysets: Dict[str, object]) -> Iterable[str]:
+        """
+        Write the current `queryset_shape` of every queryset, yielding the
+        names written.
+        """
+        for name, queryset in querysets.items():
+            self.write(name, queryset_shape(queryset))
+            yield name
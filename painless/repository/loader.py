@@ -0,0 +1,242 @@
+import datetime
+import decimal
+import io
+import uuid
+from functools import partial
+from itertools import islice
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence
+)
+
+from django.db import (
+    connections,
+    router,
+    transaction
+)
+
+from .cache import invalidate_models
+
+
+def _copy_text(value) -> str:
+    """One value in the text format of PostgreSQL's `COPY`."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float, decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if hasattr(value, 'dumps') and hasattr(value, 'adapted'):
+        # psycopg2's `Json` adapter, returned for JSONField values.
+        value = value.dumps(value.adapted)
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+class BulkLoader:
+    """
+    Stream model instances into their table, one batch at a time.
+
+    On PostgreSQL each batch reserves its primary keys with one `nextval`
+    call over `generate_series` and is written with `COPY ... FROM STDIN`;
+    on other backends it is written with a multi-row `bulk_create`. Only one
+    batch is held in memory, so `objs` may be a lazy generator of any
+    length. Like `bulk_create`, `save()` is not called and no signals are
+    sent; field defaults and `auto_now(_add)` values are applied. The
+    `row_cache` of the model is invalidated after every batch.
+
+    Objects may bring their own pks. On PostgreSQL the sequence is then
+    moved past the largest one written, like `loaddata` does, unless it is
+    already further; with several processes writing explicit pks at once,
+    call `reset_sequences` once they are all done.
+
+        loader = BulkLoader(User)
+        for pks in loader.load(users):
+            ...
+
+    `load` is lazy: nothing is written until it is iterated. `write` runs it
+    to the end and returns the number of rows.
+
+    PARAMS
+    ------
+    model: Model
+        the model whose table is loaded.
+    batch_size: int = 5000
+        rows per `COPY` / `INSERT`.
+    using: str = None
+        database alias, default the router's write database of `model`.
+    raw: bool = False
+        write the attribute values as they are, like fixture loading:
+        `auto_now(_add)` fields keep their value. Every object needs its pk.
+    keep: Sequence[str] = ()
+        names of `auto_now(_add)` fields written with the value every
+        object sets, e.g. a spread of `created` times. Other backends than
+        PostgreSQL restore them with one `bulk_update` per batch.
+    """
+
+    def __init__(self, model, batch_size: int = 5000, using: str = None,
+                 raw: bool = False, keep: Sequence[str] = ()):
+        self.model = model
+        self.batch_size = batch_size
+        self.using = using or router.db_for_write(model)
+        self.raw = raw
+        self.keep = tuple(keep)
+        self.fields = list(model._meta.concrete_fields)
+        self.pk = model._meta.pk
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def uses_copy(self) -> bool:
+        return self.connection.vendor == 'postgresql' and self.pk.db_returning
+
+    def load(self, objs: Iterable) -> Iterator[List]:
+        """
+        Write `objs` batch by batch, yielding the primary keys of each
+        batch.
+        """
+        objs = iter(objs)
+        while True:
+            batch = list(islice(objs, self.batch_size))
+            if not batch:
+                return
+            with transaction.atomic(using=self.using, savepoint=False):
+                if self.uses_copy or self.raw:
+                    missing = [obj for obj in batch if obj.pk is None]
+                    if len(missing) < len(batch):
+                        self.advance_sequence([obj.pk for obj in batch])
+                    if missing and self.uses_copy:
+                        pks = self.reserve_ids(len(missing))
+                        for obj, pk in zip(missing, pks):
+                            obj.pk = pk
+                    connection = self.connection
+                    self._write_rows([
+                        [field.get_db_prep_save(self._value(field, obj),
+                                                connection)
+                         for field in self.fields]
+                        for obj in batch
+                    ])
+                    for obj in batch:
+                        obj._state.adding = False
+                        obj._state.db = self.using
+                else:
+                    manager = self.model._base_manager.using(self.using)
+                    kept = [[getattr(obj, name) for name in self.keep]
+                            for obj in batch]
+                    manager.bulk_create(batch, batch_size=len(batch))
+                    if self.keep:
+                        # `bulk_create` overwrites them with the current time.
+                        for obj, values in zip(batch, kept):
+                            for name, value in zip(self.keep, values):
+                                setattr(obj, name, value)
+                        manager.bulk_update(batch, self.keep)
+                invalidate_models(self.model)
+            yield [obj.pk for obj in batch]
+
+    def write(self, objs: Iterable) -> int:
+        """Write `objs` and return how many rows were written."""
+        return sum(len(pks) for pks in self.load(objs))
+
+    def prepare_rows(self, columns: Dict[str, list]) -> List[tuple]:
+        """
+        Database-ready rows of `columns`, `{attname: [values]}` covering
+        every concrete field (pk included), for `write_rows`. The values are
+        taken as they are, like `raw=True`.
+        """
+        connection = self.connection
+        prepared = [
+            list(map(partial(field.get_db_prep_save, connection=connection),
+                     columns[field.attname]))
+            for field in self.fields
+        ]
+        return list(zip(*prepared))
+
+    def write_rows(self, rows: List[tuple]) -> int:
+        """Write rows from `prepare_rows` and return how many were written."""
+        pk_index = self.fields.index(self.pk)
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            with transaction.atomic(using=self.using, savepoint=False):
+                self.advance_sequence([row[pk_index] for row in batch])
+                self._write_rows(batch)
+                invalidate_models(self.model)
+        return len(rows)
+
+    def write_columns(self, columns: Dict[str, list]) -> int:
+        """Write rows given as columns without building model instances."""
+        return self.write_rows(self.prepare_rows(columns))
+
+    def reserve_ids(self, count: int) -> List[int]:
+        """`count` values of the primary key sequence, in one query."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT nextval(pg_get_serial_sequence(%s, %s)) '
+                'FROM generate_series(1, %s)',
+                [self.model._meta.db_table, self.pk.column, count]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def advance_sequence(self, pks: List) -> None:
+        """
+        Move the primary key sequence past the largest of `pks`, written
+        explicitly, unless it is already there; PostgreSQL only.
+        """
+        pks = [pk for pk in pks if pk is not None]
+        if not pks or not self.uses_copy:
+            return
+        highest = max(pks)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_get_serial_sequence(%s, %s)',
+                [self.model._meta.db_table, self.pk.column]
+            )
+            sequence = cursor.fetchone()[0]
+            if sequence is None:
+                return
+            # One statement, so a concurrent `nextval` past `highest` is not
+            # moved back.
+            cursor.execute(
+                f'SELECT setval(%s, %s) FROM {sequence} '
+                f'WHERE last_value < %s OR (last_value = %s AND NOT is_called)',
+                [sequence, highest, highest, highest]
+            )
+
+    def _value(self, field, obj):
+        if self.raw or field.name in self.keep:
+            return getattr(obj, field.attname)
+        return field.pre_save(obj, True)
+
+    def _write_rows(self, rows: list) -> None:
+        """Write rows of database-ready values, in `self.fields` order."""
+        connection = self.connection
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        columns = ', '.join(quote(field.column) for field in self.fields)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                buffer = io.StringIO()
+                for row in rows:
+                    buffer.write('\t'.join(map(_copy_text, row)))
+                    buffer.write('\n')
+                buffer.seek(0)
+                cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN', buffer)
+            else:
+                # One prepared INSERT run with `executemany`: the values are
+                # final, so compiling a multi-row INSERT would only add overhead.
+                placeholders = ', '.join(['%s'] * len(self.fields))
+                cursor.executemany(
+                    f'INSERT INTO {table} ({columns}) VALUES ({placeholders})',
+                    rows
+                )
@@ -0,0 +1,391 @@
+import logging
+from datetime import datetime
+from itertools import chain
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple
+)
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from tqdm import tqdm
+
+from painless.repository.base import BaseDataGenerator
+from painless.repository.loader import BulkLoader
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an order line may be refunded.
+REFUNDABLE_STATUSES = ('delivered', 'completed')
+# Fields written besides the foreign keys.
+ORDER_FIELDS = ('status', 'created')
+LINE_FIELDS = ('quantity', 'buy_price', 'cost', 'is_refunded')
+
+
+class OrderHistoryShape(NamedTuple):
+    """
+    Distributions of a generated order history.
+
+    buyer_rate: float
+        share of users with at least one order.
+    orders_exponent: float
+        Zipf exponent of the orders per buyer; the lower, the heavier the
+        tail of frequent buyers. Has to be above 1.
+    max_orders: int
+        orders per buyer at most.
+    lines_mean: float
+        mean number of order lines (`pack_orders`) per order, at least 1.
+    quantity_exponent: float
+        Zipf exponent of the quantity of a line.
+    max_quantity: int
+        quantity of a line at most.
+    refund_rate: float
+        share of the lines of delivered / completed orders refunded.
+    voucher_rate: float
+        share of orders using a voucher.
+    static_voucher_chance: int
+        chance in percent that a used voucher is static rather than code
+        based, see `get_voucher_kind`.
+    brand_exponent: float
+        Zipf exponent of the popularity of brands.
+    color_exponent: float
+        Zipf exponent of the popularity of colors.
+    statuses: Tuple[Tuple[str, float], ...]
+        relative weight per status of `STATUSES`, see
+        `get_random_status_batch`.
+    period: Tuple[datetime, datetime]
+        range of the `created` time of the orders.
+    buy_price: Tuple[int, int]
+        range of the buy price of a line.
+    profit: Tuple[float, float]
+        range of the cost / buy price ratio, see `get_currency_exchange`.
+    currency: str
+        `get_currency_exchange` currency code of the prices.
+    """
+    buyer_rate: float = 0.7
+    orders_exponent: float = 2.0
+    max_orders: int = 500
+    lines_mean: float = 2.5
+    quantity_exponent: float = 2.5
+    max_quantity: int = 20
+    refund_rate: float = 0.03
+    voucher_rate: float = 0.1
+    static_voucher_chance: int = 20
+    brand_exponent: float = 1.2
+    color_exponent: float = 1.0
+    statuses: Tuple[Tuple[str, float], ...] = (
+        ('delivered', 60),
+        ('completed', 15),
+        ('cancelled', 8),
+        ('shipped', 6),
+        ('processing', 5),
+        ('waiting', 4),
+        ('expiring', 2),
+    )
+    period: Tuple[datetime, datetime] = (
+        datetime(2020, 1, 1, tzinfo=timezone.utc),
+        datetime(2023, 1, 1, tzinfo=timezone.utc),
+    )
+    buy_price: Tuple[int, int] = (10000, 5000000)
+    profit: Tuple[float, float] = (1.05, 1.6)
+    currency: str = 'T'
+
+
+class OrderModels(NamedTuple):
+    """
+    The order models and foreign keys the `UserQuerySet` analytics read,
+    found through the relations of the user model (`orders`,
+    `pack_orders`, `pack`, `vouchers`). The orders also need the
+    `ORDER_FIELDS` and the lines the `LINE_FIELDS`.
+    """
+    order: type
+    user_field: str
+    line: type
+    order_field: str
+    pack: type
+    pack_field: str
+    voucher: type
+    through: type
+    through_order_field: str
+    through_voucher_field: str
+
+    @classmethod
+    def resolve(cls, user_model=None) -> 'OrderModels':
+        """
+        Raises `LookupError` when the order apps are not installed or miss
+        a field the history is written with.
+        """
+        user_model = user_model or get_user_model()
+        try:
+            orders = user_model._meta.get_field('orders')
+            order_meta = orders.related_model._meta
+            lines = order_meta.get_field('pack_orders')
+            pack = lines.related_model._meta.get_field('pack')
+            vouchers = order_meta.get_field('vouchers')
+            for name in ORDER_FIELDS:
+                order_meta.get_field(name)
+            for name in LINE_FIELDS:
+                lines.related_model._meta.get_field(name)
+        except FieldDoesNotExist as e:
+            raise LookupError(
+                f'Order history needs the basket, warehouse and voucher apps: {e}'
+            ) from e
+        through = vouchers.remote_field.through
+        through_meta = through._meta
+        return cls(
+            order=orders.related_model,
+            user_field=orders.field.attname,
+            line=lines.related_model,
+            order_field=lines.field.attname,
+            pack=pack.related_model,
+            pack_field=pack.attname,
+            voucher=vouchers.related_model,
+            through=through,
+            through_order_field=through_meta.get_field(
+                vouchers.m2m_field_name()).attname,
+            through_voucher_field=through_meta.get_field(
+                vouchers.m2m_reverse_field_name()).attname,
+        )
+
+
+class OrderHistoryGenerator(BaseDataGenerator):
+    """
+    Generate skewed order histories for existing users, shaped by an
+    `OrderHistoryShape`: Zipf-distributed orders per buyer and quantities,
+    Poisson order lines, packs drawn by the Zipf popularity of their brand
+    and color, weighted statuses, `created` times spread over a period,
+    refunds on delivered lines and voucher use. The history is planned as
+    NumPy columns one chunk of users at a time and streamed through
+    `BulkLoader`, so any number of users fits in the memory of one chunk.
+
+    PARAMS
+    ------
+    shape: OrderHistoryShape = OrderHistoryShape()
+        distributions of the history.
+    locale, seed:
+        as in `BaseDataGenerator`; the same seed and data give the same
+        history.
+    """
+
+    def __init__(self, *args, shape: OrderHistoryShape = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.shape = shape or OrderHistoryShape()
+
+    def zipf_weights(self, count: int, exponent: float) -> np.ndarray:
+        """Weights `1 / rank ** exponent` of `count` values in random order."""
+        ranks = self.rng.permutation(count) + 1
+        return 1.0 / ranks ** exponent
+
+    def pack_weights(self, brands: Sequence, colors: Sequence) -> np.ndarray:
+        """
+        Probability of drawing each pack, the product of the Zipf popularity
+        of its brand and of its color (`None` is a value of its own).
+        """
+        weights = np.ones(len(brands))
+        for values, exponent in (
+                (brands, self.shape.brand_exponent),
+                (colors, self.shape.color_exponent),
+        ):
+            codes = dict()
+            indexes = np.array(
+                [codes.setdefault(value, len(codes)) for value in values],
+                dtype=np.int64
+            )
+            weights *= self.zipf_weights(len(codes), exponent)[indexes]
+        return weights / weights.sum()
+
+    def plan_orders(
+            self, users: int, pack_weights: np.ndarray
+    ) -> Dict[str, Dict[str, list]]:
+        """
+        Columns of the orders of `users` users and of their lines.
+
+        `orders` holds `user` (index of the user), `status`, `created` and
+        `voucher_kind` (`None` when no voucher is used); `lines` holds
+        `order` (index of the order), `pack` (index in `pack_weights`),
+        `quantity`, `buy_price`, `cost` and `is_refunded`.
+        """
+        shape = self.shape
+        rng = self.rng
+        buyers = rng.random(users) < shape.buyer_rate
+        counts = np.minimum(
+            rng.zipf(shape.orders_exponent, users), shape.max_orders
+        ) * buyers
+        order_users = np.repeat(np.arange(users), counts)
+        orders = len(order_users)
+
+        statuses = self.get_random_status_batch(orders, dict(shape.statuses))
+        created = self.get_random_time_between_batch(orders, *shape.period)
+        uses_voucher = rng.random(orders) < shape.voucher_rate
+        kinds = iter(self.get_voucher_kind_batch(
+            int(uses_voucher.sum()), shape.static_voucher_chance
+        ))
+        voucher_kinds = [
+            next(kinds) if used else None for used in uses_voucher.tolist()
+        ]
+
+        line_counts = 1 + rng.poisson(max(shape.lines_mean - 1, 0), orders)
+        line_orders = np.repeat(np.arange(orders), line_counts)
+        lines = len(line_orders)
+        refundable = np.isin(
+            np.array(statuses, dtype=object), REFUNDABLE_STATUSES
+        )
+        buy_prices = self.get_random_number_batch(lines, *shape.buy_price)
+        return {
+            'orders': {
+                'user': order_users.tolist(),
+                'status': statuses,
+                'created': created,
+                'voucher_kind': voucher_kinds,
+            },
+            'lines': {
+                'order': line_orders.tolist(),
+                'pack': rng.choice(
+                    len(pack_weights), size=lines, p=pack_weights
+                ).tolist(),
+                'quantity': np.minimum(
+                    rng.zipf(shape.quantity_exponent, lines), shape.max_quantity
+                ).tolist(),
+                'buy_price': buy_prices,
+                'cost': self.get_currency_exchange_batch(
+                    [shape.currency] * lines, buy_prices,
+                    shape.profit, shape.profit, shape.profit
+                ),
+                'is_refunded': (
+                    refundable[line_orders]
+                    & (rng.random(lines) < shape.refund_rate)
+                ).tolist(),
+            },
+        }
+
+    def create_order_history(
+            self,
+            user_ids: Iterable[int] = None,
+            batch_size: int = 5000,
+            disable_progress_bar: bool = False,
+            models: OrderModels = None
+    ) -> Dict[str, int]:
+        """
+        Generate and load the order history of `user_ids`, by default every
+        user without an order, and return the rows written per table.
+
+        Packs come from the existing packs with their brand and color,
+        vouchers from the existing vouchers, grouped by `kind` when the
+        voucher model has one.
+
+        PARAMS
+        ------
+        user_ids: Iterable[int] = None
+            users to generate orders for, streamed from the database by
+            default.
+        batch_size: int = 5000
+            users planned at once, and rows per `COPY` / `INSERT`.
+        models: OrderModels = None
+            the order models, `OrderModels.resolve()` by default.
+        """
+        models = models or OrderModels.resolve()
+        if user_ids is None:
+            user_ids = (
+                get_user_model().objects.filter(orders__isnull=True)
+                .values_list('pk', flat=True)
+                .iterator(chunk_size=batch_size)
+            )
+        packs = list(models.pack._base_manager.values_list(
+            'pk', 'product__brand', 'color'
+        ))
+        if not packs:
+            raise LookupError('Order history needs packs to order; '
+                              'generate the warehouse data first.')
+        pack_ids, brands, colors = zip(*packs)
+        weights = self.pack_weights(brands, colors)
+        vouchers = self._vouchers_by_kind(models.voucher)
+
+        order_loader = BulkLoader(
+            models.order, batch_size=batch_size, keep=('created',)
+        )
+        line_loader = BulkLoader(models.line, batch_size=batch_size)
+        through_loader = BulkLoader(models.through, batch_size=batch_size)
+        written = {'orders': 0, 'lines': 0, 'vouchers': 0}
+        user_ids = iter(user_ids)
+        with tqdm(disable=disable_progress_bar) as progress:
+            while True:
+                chunk = [
+                    user_id for _, user_id in zip(range(batch_size), user_ids)
+                ]
+                if not chunk:
+                    break
+                plan = self.plan_orders(len(chunk), weights)
+                orders, lines = plan['orders'], plan['lines']
+                order_ids = list(chain.from_iterable(order_loader.load(
+                    models.order(**{
+                        models.user_field: chunk[user],
+                        'status': status,
+                        'created': created,
+                    })
+                    for user, status, created in zip(
+                        orders['user'], orders['status'], orders['created']
+                    )
+                )))
+                written['lines'] += line_loader.write(
+                    models.line(**{
+                        models.order_field: order_ids[order],
+                        models.pack_field: pack_ids[pack],
+                        'quantity': quantity,
+                        'buy_price': buy_price,
+                        'cost': cost,
+                        'is_refunded': is_refunded,
+                    })
+                    for order, pack, quantity, buy_price, cost, is_refunded
+                    in zip(
+                        lines['order'], lines['pack'], lines['quantity'],
+                        lines['buy_price'], lines['cost'], lines['is_refunded']
+                    )
+                )
+                if vouchers:
+                    written['vouchers'] += through_loader.write(
+                        models.through(**{
+                            models.through_order_field: order_id,
+                            models.through_voucher_field: voucher_id,
+                        })
+                        for order_id, voucher_id in zip(
+                            order_ids,
+                            self._pick_vouchers(orders['voucher_kind'], vouchers)
+                        )
+                        if voucher_id is not None
+                    )
+                written['orders'] += len(order_ids)
+                progress.update(len(chunk))
+        logger.debug(f'{written["orders"]} orders with {written["lines"]} '
+                     f'lines created successfully.')
+        return written
+
+    @staticmethod
+    def _vouchers_by_kind(voucher_model) -> Dict[str, List[int]]:
+        try:
+            voucher_model._meta.get_field('kind')
+        except FieldDoesNotExist:
+            ids = list(voucher_model._base_manager.values_list('pk', flat=True))
+            return {None: ids} if ids else dict()
+        vouchers = dict()
+        for pk, kind in voucher_model._base_manager.values_list('pk', 'kind'):
+            vouchers.setdefault(kind, list()).append(pk)
+        return vouchers
+
+    def _pick_vouchers(
+            self, kinds: List[str], vouchers: Dict[str, List[int]]
+    ) -> List[int]:
+        every = list(chain.from_iterable(vouchers.values()))
+        picks = list()
+        for kind in kinds:
+            if kind is None:
+                picks.append(None)
+                continue
+            population = vouchers.get(kind) or vouchers.get(None) or every
+            picks.append(population[int(self.rng.integers(len(population)))])
+        return picks
@@ -0,0 +1,152 @@
+import random
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import (
+    Iterable,
+    List,
+    Sequence,
+    Tuple
+)
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.utils.crypto import RANDOM_STRING_CHARS
+
+from painless.repository.shard import _initialize_worker
+
+
+def pool_passwords(size: int = None, prefix: str = None) -> List[str]:
+    """
+    The `size` known passwords of generated users, `<prefix><n>`; by
+    default both come from the `GENERATED_PASSWORDS` setting.
+    """
+    options = getattr(settings, 'GENERATED_PASSWORDS', dict())
+    size = options.get('POOL_SIZE', 16) if size is None else size
+    prefix = options.get('PREFIX', 'load-test-') if prefix is None else prefix
+    return [f'{prefix}{index}' for index in range(size)]
+
+
+def derive_salt(seed: int, index: int, length: int = 22) -> str:
+    """
+    Salt of the `index`th password of a pool hashed for the dataset `seed`;
+    22 characters, as long as the salts of Django's hashers.
+    """
+    rng = random.Random(f'password-salt:{seed}:{index}')
+    return ''.join(rng.choices(RANDOM_STRING_CHARS, k=length))
+
+
+def _hash(password, hasher, salt=None):
+    return make_password(password, salt=salt, hasher=hasher)
+
+
+class PasswordPool:
+    """
+    A few known passwords, each hashed once with the project's password
+    hasher, shared by any number of generated users.
+
+    Hashing every user's password (PBKDF2 with hundreds of thousands of
+    iterations) would dominate the generation of a large dataset; hashing
+    the pool costs the same whatever the number of users, and checking a
+    password at log in still costs what it does for real users. The
+    password of a user is picked from its phone number, so a load test
+    finds it again with `password_for` without storing anything.
+
+    PARAMS
+    ------
+    passwords: Sequence[str]
+        the known passwords, see `pool_passwords`.
+    hashes: Sequence[str] = None
+        their hashes, in the same order; hashed here when omitted.
+    workers: int = 1
+        processes hashing the passwords when `hashes` is omitted.
+    hasher: str = 'default'
+        name of the hasher in `PASSWORD_HASHERS`.
+    seed: int = None
+        seed of the dataset; the salts derive from it (see `derive_salt`),
+        so the same seed gives the same hashes. Random salts when omitted.
+        The hasher must take a caller's salt, as PBKDF2, Argon2 and scrypt
+        do; bcrypt does not.
+    """
+
+    def __init__(
+            self,
+            passwords: Sequence[str],
+            hashes: Sequence[str] = None,
+            workers: int = 1,
+            hasher: str = 'default',
+            seed: int = None
+    ):
+        if not passwords:
+            raise ValueError('a password pool needs at least one password')
+        self.passwords = list(passwords)
+        if hashes is None:
+            hashes = self.hash_passwords(self.passwords, workers, hasher,
+                                         seed)
+        elif len(hashes) != len(self.passwords):
+            raise ValueError(f'{len(hashes)} hashes given for '
+                             f'{len(self.passwords)} passwords')
+        self.hashes = list(hashes)
+
+    @staticmethod
+    def hash_passwords(
+            passwords: Sequence[str],
+            workers: int = 1,
+            hasher: str = 'default',
+            seed: int = None
+    ) -> List[str]:
+        """
+        Hashes of `passwords`, computed by `workers` processes, salted from
+        `seed` when given.
+        """
+        if seed is None:
+            salts = [None] * len(passwords)
+        else:
+            salts = [derive_salt(seed, index)
+                     for index in range(len(passwords))]
+        if workers <= 1 or len(passwords) <= 1:
+            return [_hash(password, hasher, salt)
+                    for password, salt in zip(passwords, salts)]
+        with ProcessPoolExecutor(
+                max_workers=min(workers, len(passwords)),
+                initializer=_initialize_worker
+        ) as executor:
+            return list(executor.map(_hash, passwords,
+                                     [hasher] * len(passwords), salts))
+
+    def index_for(self, phone_number: str) -> int:
+        return zlib.crc32(str(phone_number).encode()) % len(self.passwords)
+
+    def password_for(self, phone_number: str) -> str:
+        """Plain password of the generated user with `phone_number`."""
+        return self.passwords[self.index_for(phone_number)]
+
+    def hash_for(self, phone_number: str) -> str:
+        """Stored hash of the generated user with `phone_number`."""
+        return self.hashes[self.index_for(phone_number)]
+
+    def hashes_for(self, phone_numbers: Iterable[str]) -> List[str]:
+        return [self.hash_for(phone_number) for phone_number in phone_numbers]
+
+    def credentials(self, phone_numbers: Iterable[str]) -> List[Tuple[str, str]]:
+        """`(phone_number, password)` of generated users, for a load test."""
+        return [(phone_number, self.password_for(phone_number))
+                for phone_number in phone_numbers]
+
+
+@lru_cache(maxsize=None)
+def _pool(passwords, workers, hasher, seed):
+    return PasswordPool(passwords, workers=workers, hasher=hasher, seed=seed)
+
+
+def get_password_pool(
+        size: int = None,
+        prefix: str = None,
+        workers: int = 1,
+        seed: int = None
+) -> PasswordPool:
+    """
+    `PasswordPool` of `pool_passwords(size, prefix)` salted from `seed`,
+    hashed once per process and reused by every later call.
+    """
+    return _pool(tuple(pool_passwords(size, prefix)), workers, 'default', seed)
@@ -0,0 +1,170 @@
+import secrets
+from typing import (
+    Iterable,
+    Iterator,
+    List
+)
+
+import numpy as np
+from django.db import router
+
+PHONE_NUMBER_PREFIX = '09'
+PHONE_NUMBER_DIGITS = 9
+
+_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+class FeistelPermutation:
+    """
+    Keyed bijection of `range(size)` onto itself, evaluated on NumPy arrays.
+
+    A balanced Feistel network permutes the smallest even-bit domain
+    `2 ** (2 * half_bits) >= size`; values falling outside `range(size)`
+    are encrypted again (cycle walking) until they land inside, which keeps
+    the mapping a bijection of `range(size)`. Since the domain is less than
+    four times `size`, a value walks less than four steps on average.
+
+    `permutation.take(start, count)` returns the images of
+    `start, ..., start + count - 1`: distinct values as long as the
+    indexes stay below `size`, with no set to keep and nothing to retry.
+
+    PARAMS
+    ------
+    size: int
+        number of values permuted.
+    key: int = None
+        permutation key; the same key gives the same order, a random key
+        is drawn when omitted.
+    rounds: int = 4
+        Feistel rounds.
+    """
+
+    def __init__(self, size: int, key: int = None, rounds: int = 4):
+        if size < 1:
+            raise ValueError(f'size has to be positive, '
+                             f'however given size is {size}')
+        self.size = size
+        self.key = secrets.randbits(63) if key is None else key
+        self.half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self.mask = np.uint64((1 << self.half_bits) - 1)
+        self.round_keys = np.random.default_rng(self.key).integers(
+            1, 2 ** 63, size=rounds, dtype=np.uint64
+        )
+
+    def _round(self, half: np.ndarray, round_key: np.uint64) -> np.ndarray:
+        mixed = (half ^ round_key) * _MULTIPLIER
+        mixed ^= mixed >> np.uint64(29)
+        return mixed & self.mask
+
+    def _encrypt(self, values: np.ndarray) -> np.ndarray:
+        shift = np.uint64(self.half_bits)
+        left, right = values >> shift, values & self.mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ self._round(right, round_key)
+        return (left << shift) | right
+
+    def permute(self, indexes: Iterable[int]) -> np.ndarray:
+        """Images of `indexes`, each in `range(size)`."""
+        values = self._encrypt(np.asarray(indexes, dtype=np.uint64))
+        outside = values >= self.size
+        while outside.any():
+            values[outside] = self._encrypt(values[outside])
+            outside = values >= self.size
+        return values
+
+    def take(self, start: int, count: int) -> np.ndarray:
+        """Images of the `count` indexes starting at `start`."""
+        if start < 0 or start + count > self.size:
+            raise ValueError(f'indexes {start}..{start + count} are outside '
+                             f'the permuted range of {self.size} values')
+        return self.permute(np.arange(start, start + count, dtype=np.uint64))
+
+
+def format_numbers(values: np.ndarray, prefix: str, digits: int) -> List[str]:
+    """
+    `prefix` followed by each value zero padded to `digits` digits.
+
+    Builds the ASCII bytes of all strings in one array instead of
+    formatting them one by one.
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    powers = np.uint64(10) ** np.arange(digits - 1, -1, -1, dtype=np.uint64)
+    codes = np.empty((len(values), len(prefix) + digits), dtype=np.uint8)
+    codes[:, :len(prefix)] = np.frombuffer(prefix.encode('ascii'),
+                                           dtype=np.uint8)
+    decimal_digits = values[:, None] // powers % np.uint64(10)
+    codes[:, len(prefix):] = decimal_digits + ord('0')
+    rows = codes.view(f'S{codes.shape[1]}').ravel().tolist()
+    return [code.decode('ascii') for code in rows]
+
+
+def existing_phone_numbers(
+        model, field: str = 'phone_number', using: str = None
+) -> np.ndarray:
+    """
+    Sorted subscriber parts of the `09xxxxxxxxx` numbers already stored in
+    `model.field`, read with one range query.
+    """
+    using = using or router.db_for_read(model)
+    low = PHONE_NUMBER_PREFIX + '0' * PHONE_NUMBER_DIGITS
+    high = PHONE_NUMBER_PREFIX + '9' * PHONE_NUMBER_DIGITS
+    numbers = (
+        model._default_manager.using(using)
+        .filter(**{f'{field}__gte': low, f'{field}__lte': high})
+        .values_list(field, flat=True)
+    )
+    subscribers = [
+        int(number[len(PHONE_NUMBER_PREFIX):]) for number in numbers.iterator()
+        if len(number) == len(low) and number.isdigit()
+    ]
+    return np.unique(np.array(subscribers, dtype=np.uint64))
+
+
+def unique_phone_numbers(
+        count: int,
+        key: int = None,
+        start: int = 0,
+        exclude: np.ndarray = None,
+        chunk_size: int = 100000
+) -> Iterator[List[str]]:
+    """
+    Yield `count` distinct Iranian mobile numbers (`09` and 9 digits,
+    matching `RegexPatternEnum.IRAN_PHONE_NUMBER`) in chunks of at most
+    `chunk_size`.
+
+    The numbers are the images of the indexes `start, start + 1, ...` under
+    a keyed permutation of the 10 ** 9 subscriber numbers, so they are
+    unique without keeping a set, and generators with the same `key` and
+    disjoint index ranges never collide. Numbers in `exclude` (see
+    `existing_phone_numbers`) are dropped, which consumes at most
+    `len(exclude)` extra indexes.
+
+    PARAMS
+    ------
+    count: int
+        numbers to generate.
+    key: int = None
+        permutation key, random when omitted.
+    start: int = 0
+        first permutation index used.
+    exclude: np.ndarray = None
+        sorted subscriber parts that must not be returned.
+    chunk_size: int = 100000
+        numbers per yielded list.
+    """
+    permutation = FeistelPermutation(10 ** PHONE_NUMBER_DIGITS, key=key)
+    if exclude is None:
+        exclude = np.empty(0, dtype=np.uint64)
+    remaining, index = count, start
+    while remaining > 0:
+        if index >= permutation.size:
+            raise ValueError(f'the {permutation.size} phone numbers '
+                             f'are exhausted')
+        size = min(chunk_size, remaining)
+        values = permutation.take(index, min(size, permutation.size - index))
+        index += len(values)
+        if len(exclude):
+            values = values[~np.isin(values, exclude, assume_unique=True)]
+        values = values[:remaining]
+        remaining -= len(values)
+        yield format_numbers(values, PHONE_NUMBER_PREFIX, PHONE_NUMBER_DIGITS)
@@ -0,0 +1,86 @@
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    as_completed
+)
+from typing import (
+    Callable,
+    Iterator,
+    List,
+    NamedTuple
+)
+
+import numpy as np
+from django import setup as django_setup
+from django.apps import apps
+from django.db import connections
+
+
+class Shard(NamedTuple):
+    """
+    One slice of a generated dataset.
+
+    index: int
+        position of the shard, 0-based.
+    start: int
+        offset of the shard's first row in the whole dataset.
+    count: int
+        rows in the shard.
+    seed: int
+        seed of the shard, derived from the dataset seed and `index`.
+    """
+    index: int
+    start: int
+    count: int
+    seed: int
+
+
+def derive_seed(seed: int, index: int) -> int:
+    """Independent 63-bit seed of shard `index` under the dataset `seed`."""
+    sequence = np.random.SeedSequence(seed, spawn_key=(index,))
+    state = sequence.generate_state(2, dtype=np.uint32)
+    return (int(state[0]) << 31) ^ int(state[1])
+
+
+def plan_shards(total: int, shard_size: int, seed: int) -> List[Shard]:
+    """
+    Split `total` rows into shards of `shard_size` rows (the last one may
+    be smaller). The plan depends only on its arguments, not on how many
+    workers run it, so a dataset is the same whatever `--workers` is.
+    """
+    return [
+        Shard(index, start, min(shard_size, total - start),
+              derive_seed(seed, index))
+        for index, start in enumerate(range(0, total, shard_size))
+    ]
+
+
+def _initialize_worker():
+    # Forked workers inherit the parent's apps; spawned ones start empty.
+    if not apps.ready:
+        django_setup()
+
+
+def run_shards(
+        function: Callable, shards: List[Shard], workers: int = 1
+) -> Iterator:
+    """
+    Call `function(shard)` for every shard and yield the results in
+    completion order.
+
+    With more than one worker the shards run in a `ProcessPoolExecutor`;
+    `function` must be importable (defined at module level) and open its
+    own database connections, so the parent's connections are closed
+    before the pool starts.
+    """
+    if workers <= 1:
+        for shard in shards:
+            yield function(shard)
+        return
+    connections.close_all()
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_initialize_worker
+    ) as executor:
+        futures = [executor.submit(function, shard) for shard in shards]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,159 @@
+from collections import defaultdict
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Set
+)
+
+from django.db import (
+    connections,
+    router
+)
+from django.utils.text import slugify
+
+# Room kept at the end of a slug for a `-<n>` collision suffix.
+SUFFIX_RESERVE = 10
+
+
+class SlugAllocator:
+    """
+    Derives unique unicode slugs from a source field for a batch of objects.
+
+    Every batch costs one query: the slugs already taken by each base
+    (`base` itself and `base-<n>`) are read at once, then collisions with
+    the database and with every slug given out in the same call are
+    resolved in memory by appending the smallest free `-<n>`, starting at
+    2. The batch size is capped by the database's query parameter limit.
+
+    Two processes allocating the same base at the same time can still both
+    pick the same slug; the unique index rejects the second insert.
+
+    PARAMS
+    ------
+    model: Model
+        the model whose `slug_field` must stay unique.
+    slug_field: str
+        name of the unique slug field.
+    source_field: str
+        name of the field the slug is derived from.
+    """
+
+    def __init__(self, model, slug_field: str = 'slug',
+                 source_field: str = 'title'):
+        self.model = model
+        self.slug_field = slug_field
+        self.source_field = source_field
+        self.max_length = model._meta.get_field(slug_field).max_length
+
+    def base_slug(self, value) -> str:
+        base = slugify(str(value or ''), allow_unicode=True)
+        base = base[:self.max_length - SUFFIX_RESERVE].strip('-')
+        return base or self.model._meta.model_name
+
+    def connection(self, using: str = None):
+        # The concrete model owning the field, for multi-table inheritance.
+        owner = self.model._meta.get_field(self.slug_field).model
+        return connections[using or router.db_for_read(owner)]
+
+    @staticmethod
+    def params_per_base(connection) -> int:
+        return 3 if connection.vendor == 'sqlite' else 2
+
+    def taken(
+            self, bases: Iterable[str], using: str = None
+    ) -> Dict[str, Set[str]]:
+        """
+        Slugs in the database for each base, read with one query.
+
+        The statement is written by hand: building a thousand-term filter
+        through the ORM costs more than running it. Each `base-` prefix is
+        matched in a form the unique index can serve: `LIKE 'prefix%'`
+        on PostgreSQL, through the `varchar_pattern_ops` index Django adds
+        to slug fields, and a binary range on SQLite, whose `LIKE` is case
+        insensitive and skips the index.
+        """
+        bases = sorted(set(bases))
+        if not bases:
+            return dict()
+        field = self.model._meta.get_field(self.slug_field)
+        owner = field.model
+        connection = self.connection(using)
+        qn = connection.ops.quote_name
+        column = qn(field.column)
+        clauses = [f'{column} IN ({", ".join(["%s"] * len(bases))})']
+        params = list(bases)
+        for base in bases:
+            if connection.vendor == 'sqlite':
+                # '.' is the character right after '-'.
+                clauses.append(f'({column} >= %s AND {column} < %s)')
+                params.extend((f'{base}-', f'{base}.'))
+            else:
+                clauses.append(f'{column} LIKE %s')
+                params.append(f'{connection.ops.prep_for_like_query(base)}-%')
+        sql = (f'SELECT {column} FROM {qn(owner._meta.db_table)} '
+               f'WHERE {" OR ".join(clauses)}')
+
+        lookup = set(bases)
+        taken = defaultdict(set)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            for slug, in cursor.fetchall():
+                base, _, suffix = slug.rpartition('-')
+                if slug in lookup:
+                    taken[slug].add(slug)
+                if base in lookup and suffix.isdigit():
+                    taken[base].add(slug)
+        return taken
+
+    def allocate(
+            self, objs: List, using: str = None, batch_size: int = 1000
+    ) -> List:
+        """
+        Set the slug of every object in `objs` that does not have one yet.
+
+        Returns `objs`, so it can wrap the argument of `bulk_create`:
+
+            Product.objects.bulk_create(SlugAllocator(Product).allocate(products))
+        """
+        pending = [obj for obj in objs if not getattr(obj, self.slug_field)]
+        connection = self.connection(using)
+        max_params = connection.features.max_query_params
+        if max_params:
+            per_base = self.params_per_base(connection)
+            batch_size = max(1, min(batch_size, max_params // per_base))
+        # Every slug taken in the database or given out by this call,
+        # whatever its base: 'foo 2' and a second 'foo' both want 'foo-2'.
+        allocated = {getattr(obj, self.slug_field) for obj in objs} - {'', None}
+        counters = dict()
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            bases = [
+                self.base_slug(getattr(obj, self.source_field)) for obj in batch
+            ]
+            allocated.update(*self.taken(bases, using=using).values())
+            for obj, base in zip(batch, bases):
+                slug = base
+                number = counters.get(base, 1)
+                while slug in allocated:
+                    number += 1
+                    slug = f'{base}-{number}'
+                counters[base] = number
+                allocated.add(slug)
+                setattr(obj, self.slug_field, slug)
+        return objs
+
+
+def allocate_slugs(objs: List, using: str = None, batch_size: int = 1000) -> List:
+    """
+    Fill the missing slugs of `objs` (instances of `TitleSlugMixin` models)
+    before a `bulk_create`, with one query per `batch_size` objects.
+    """
+    by_model = defaultdict(list)
+    for obj in objs:
+        by_model[type(obj)].append(obj)
+    for model, instances in by_model.items():
+        SlugAllocator(model).allocate(
+            instances, using=using, batch_size=batch_size
+        )
+    return objs
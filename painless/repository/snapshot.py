@@ -0,0 +1,336 @@
+import datetime
+import json
+import os
+import threading
+import zipfile
+from typing import (
+    Dict,
+    Iterable,
+    List
+)
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    connections,
+    router,
+    transaction
+)
+from django.utils import timezone
+
+from painless.repository.loader import BulkLoader
+from painless.repository.reset import (
+    dependency_order,
+    reset_sequences,
+    reset_tables
+)
+
+# Version of the file layout; bumped when it changes incompatibly.
+SCHEMA_VERSION = 1
+MANIFEST = 'manifest.json'
+
+
+class SnapshotJSONEncoder(DjangoJSONEncoder):
+    """`DjangoJSONEncoder` keeping the microseconds it cuts to milliseconds."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class SnapshotError(Exception):
+    """
+    A snapshot is missing, incompatible with the models, or cannot be loaded.
+    """
+
+
+def snapshot_path(name: str) -> str:
+    """
+    Path of snapshot `name`: a path ending in `.zip` is used as it is,
+    other names are files in the `SNAPSHOT_DIR` setting (relative to
+    `BASE_DIR`).
+    """
+    if name.endswith('.zip'):
+        return name
+    directory = getattr(settings, 'SNAPSHOT_DIR', 'snapshots')
+    if not os.path.isabs(directory):
+        directory = os.path.join(settings.BASE_DIR, directory)
+    return os.path.join(directory, f'{name}.zip')
+
+
+def model_schema(model) -> List[List[str]]:
+    """
+    `[attname, internal type]` of every concrete field, as stored in a
+    snapshot.
+    """
+    return [[field.attname, field.get_internal_type()]
+            for field in model._meta.concrete_fields]
+
+
+def load_order(models: Iterable) -> List:
+    """
+    `models` ordered so that every model comes after the models it references.
+    """
+    models = set(models)
+    return [model for model in reversed(dependency_order(models))
+            if model in models]
+
+
+def dump_snapshot(
+        name: str,
+        models: Iterable,
+        seed: int = None,
+        chunk_size: int = 50000,
+        using: str = None
+) -> dict:
+    """
+    Write the rows of `models` to snapshot `name` and return its manifest.
+
+    A snapshot is a zip archive holding `manifest.json` (schema version,
+    seed, creation time and, per model, its field schema and row count) and
+    the rows as columnar JSON chunks, `<app_label.model>/<n>.json` mapping
+    every attname to a list of `chunk_size` values. Rows are read in pk
+    order with a server-side iterator, so one chunk is in memory at a time.
+
+    PARAMS
+    ------
+    name: str
+        snapshot name or `.zip` path, see `snapshot_path`.
+    models: Iterable[Model]
+        the models to dump; restore order is worked out from their relations.
+    seed: int = None
+        seed the data was generated with, recorded in the manifest.
+    chunk_size: int = 50000
+        rows per chunk file.
+    using: str = None
+        database alias, default the router's read database of each model.
+    """
+    path = snapshot_path(name)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    manifest = {
+        'schema_version': SCHEMA_VERSION,
+        'seed': seed,
+        'created': timezone.now().isoformat(),
+        'models': list(),
+    }
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for model in load_order(models):
+            label = model._meta.label_lower
+            schema = model_schema(model)
+            names = [attname for attname, _ in schema]
+            rows = (
+                model._base_manager.using(using or router.db_for_read(model))
+                .order_by('pk').values_list(*names)
+                .iterator(chunk_size=chunk_size)
+            )
+            total = chunks = 0
+            while True:
+                chunk = [row for _, row in zip(range(chunk_size), rows)]
+                if not chunk:
+                    break
+                columns = dict(zip(names, map(list, zip(*chunk))))
+                archive.writestr(f'{label}/{chunks:05d}.json',
+                                 json.dumps(columns, cls=SnapshotJSONEncoder))
+                total += len(chunk)
+                chunks += 1
+            manifest['models'].append({
+                'label': label,
+                'rows': total,
+                'chunks': chunks,
+                'fields': schema,
+            })
+        archive.writestr(MANIFEST, json.dumps(manifest, indent=2))
+    return manifest
+
+
+def read_manifest(name: str) -> dict:
+    path = snapshot_path(name)
+    if not os.path.exists(path):
+        raise SnapshotError(f'Snapshot `{name}` does not exist at {path}.')
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read(MANIFEST))
+    if manifest.get('schema_version') != SCHEMA_VERSION:
+        raise SnapshotError(f'Snapshot `{name}` has schema version '
+                            f'{manifest.get("schema_version")}, '
+                            f'expected {SCHEMA_VERSION}; dump it again.')
+    for entry in manifest['models']:
+        model = apps.get_model(entry['label'])
+        if entry['fields'] != model_schema(model):
+            raise SnapshotError(f'The fields of {entry["label"]} changed '
+                                f'since snapshot `{name}` was dumped; '
+                                f'dump it again.')
+    return manifest
+
+
+class _Decoded:
+    """
+    Decoded rows of snapshot files, and the same rows prepared for each
+    database they were loaded into, kept for the rest of the process.
+    """
+
+    def __init__(self):
+        self._snapshots = dict()
+        self._rows = dict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Dict[str, dict]:
+        """`{label: {attname: [python values]}}` of snapshot `name`."""
+        path = snapshot_path(name)
+        key = (os.path.abspath(path), os.path.getmtime(path))
+        with self._lock:
+            if key not in self._snapshots:
+                self._snapshots[key] = self._decode(name, path)
+            return self._snapshots[key]
+
+    @staticmethod
+    def _decode(name, path):
+        manifest = read_manifest(name)
+        decoded = dict()
+        with zipfile.ZipFile(path) as archive:
+            for entry in manifest['models']:
+                model = apps.get_model(entry['label'])
+                fields = [_field_by_attname(model, attname)
+                          for attname, _ in entry['fields']]
+                columns = {field.attname: list() for field in fields}
+                for index in range(entry['chunks']):
+                    chunk = json.loads(
+                        archive.read(f'{entry["label"]}/{index:05d}.json')
+                    )
+                    for field in fields:
+                        to_python = field.to_python
+                        columns[field.attname].extend(
+                            None if value is None else to_python(value)
+                            for value in chunk[field.attname]
+                        )
+                decoded[entry['label']] = columns
+        return decoded
+
+    def rows(self, name: str, loader: BulkLoader) -> list:
+        """
+        Rows of `loader.model` in snapshot `name`, prepared for `loader`'s
+        database.
+        """
+        path = snapshot_path(name)
+        label = loader.model._meta.label_lower
+        key = (os.path.abspath(path), os.path.getmtime(path), label,
+               loader.using)
+        rows = self._rows.get(key)
+        if rows is None:
+            rows = loader.prepare_rows(self.get(name)[label])
+            with self._lock:
+                self._rows[key] = rows
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+            self._rows.clear()
+
+
+def _field_by_attname(model, attname):
+    for field in model._meta.concrete_fields:
+        if field.attname == attname:
+            return field
+    raise SnapshotError(f'{model._meta.label} has no field `{attname}`.')
+
+
+decoded_snapshots = _Decoded()
+
+
+def cascaded_tables(models: Iterable, using: str = None) -> List[str]:
+    """
+    Labels of the models outside `models` that `reset_tables(*models)`
+    would also empty and that hold rows.
+    """
+    models = set(models)
+    cascaded = list()
+    for model in dependency_order(models):
+        if model in models:
+            continue
+        alias = using or router.db_for_write(model)
+        tables = connections[alias].introspection.table_names()
+        if model._meta.db_table not in tables:
+            continue
+        if model._base_manager.using(alias).exists():
+            cascaded.append(model._meta.label)
+    return cascaded
+
+
+def load_snapshot(
+        name: str,
+        replace: bool = False,
+        batch_size: int = 5000,
+        using: str = None,
+        cascade: bool = False
+) -> dict:
+    """
+    Restore snapshot `name` with `BulkLoader` (`COPY` on PostgreSQL) and
+    return its manifest. Rows keep their ids and timestamps; the id
+    sequences are moved past them afterwards. Everything runs in one
+    transaction, so a failed load leaves the tables as they were.
+
+    The decoded and prepared rows are kept in memory, so loading the same
+    snapshot again in the process, e.g. for every test class, only costs
+    the inserts.
+
+    PARAMS
+    ------
+    name: str
+        snapshot name or `.zip` path, see `snapshot_path`.
+    replace: bool = False
+        empty the tables first (with `reset_tables`); otherwise they must
+        already be empty.
+    batch_size: int = 5000
+        rows per `COPY` / `INSERT`.
+    using: str = None
+        database alias, default the router's write database of each model.
+    cascade: bool = False
+        with `replace`, also empty the tables referencing the snapshot's
+        models that the snapshot does not restore; without it, `replace`
+        refuses when such a table has rows.
+    """
+    manifest = read_manifest(name)
+    models = [apps.get_model(entry['label']) for entry in manifest['models']]
+    with transaction.atomic(using=using or router.db_for_write(models[0])):
+        if replace:
+            cascaded = cascaded_tables(models, using=using)
+            if cascaded and not cascade:
+                raise SnapshotError(
+                    f'Replacing snapshot `{name}` would also empty '
+                    f'{", ".join(cascaded)}, which it does not restore; '
+                    f'empty them first or pass cascade=True.'
+                )
+            reset_tables(*models, using=using)
+        for model in models:
+            alias = using or router.db_for_write(model)
+            if model._base_manager.using(alias).exists():
+                raise SnapshotError(f'{model._meta.label} is not empty; '
+                                    f'load snapshot `{name}` into empty '
+                                    f'tables or pass replace=True.')
+        for model in models:
+            loader = BulkLoader(model, batch_size=batch_size, using=using,
+                                raw=True)
+            loader.write_rows(decoded_snapshots.rows(name, loader))
+        reset_sequences(*models, using=using)
+    return manifest
+
+
+class SnapshotTestMixin:
+    """
+    `TestCase` mixin restoring snapshot `snapshot` in `setUpTestData`, so it
+    is rolled back with the rest of the class data. The file is read,
+    decoded and prepared once per test session; every class after the
+    first only pays for the inserts.
+
+        class UserQuerysetTest(SnapshotTestMixin, TestCase):
+            snapshot = 'users-1k'
+    """
+    snapshot: str = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        if cls.snapshot is not None:
+            cls.snapshot_manifest = load_snapshot(cls.snapshot)
@@ -0,0 +1,16 @@
+from .worker import BatchWorker
+from .sms import (
+    SMSMessage,
+    send_sms,
+    sms_sender
+)
+from .mail import (
+    QueuedEmailBackend,
+    mail_queue,
+    queue_mail
+)
+from .thumbnail import (
+    ThumbnailSpec,
+    get_thumbnail_url,
+    thumbnail_pipeline
+)
@@ -0,0 +1,235 @@
+"""
+Outgoing email through a background queue.
+
+`queue_mail` (and `QueuedEmailBackend`, for code that uses Django's mail
+API) only puts the message on a queue. `MailQueue` sends queued messages
+in batches from a background thread over one long-lived connection of the
+backend named by `MAIL_QUEUE['BACKEND']`, so a burst of messages costs one
+SMTP handshake instead of one per message. Temporary failures are retried
+with exponential backoff on a fresh connection; a retry is scheduled, not
+waited for, so the messages behind it keep going. Permanent (5xx) SMTP
+errors are not retried.
+
+Configured with the `MAIL_QUEUE` setting:
+    BACKEND: str
+        Backend doing the delivery, `EMAIL_BACKEND` by default.
+    MAX_RETRIES: int
+        Attempts per message after the first failure.
+    BACKOFF: float
+        Seconds before the first retry; doubled on every retry.
+    MAX_BACKOFF: float
+        Upper bound of the retry delay.
+    IDLE_TIMEOUT: float
+        Seconds without mail before the connection is closed.
+"""
+import heapq
+import itertools
+import logging
+import random
+import smtplib
+import threading
+import time
+from typing import List
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import (
+    EmailMessage,
+    get_connection
+)
+from django.core.mail.backends.base import BaseEmailBackend
+from django.utils.module_loading import import_string
+
+from .worker import BatchWorker
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue(BatchWorker):
+    """Send queued messages over a reused connection, with retries."""
+    name = 'mail-queue'
+    batch_size = 50
+    max_delay = 1.0
+    idle_interval = 5
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._connection = None
+        self._connection_backend = None
+        self._last_activity = time.monotonic()
+        self._metrics_lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.busy_seconds = 0.0
+        # (due, order, attempt, message) of the scheduled retries
+        self._retries = list()
+        self._order = itertools.count()
+        self._scheduled = 0
+
+    @property
+    def config(self) -> dict:
+        return getattr(settings, 'MAIL_QUEUE', dict())
+
+    def process(self, batch: List[EmailMessage]) -> None:
+        started = time.monotonic()
+        for message in batch:
+            self._send(message)
+        self._send_due_retries()
+        self._last_activity = time.monotonic()
+        with self._metrics_lock:
+            self.busy_seconds += self._last_activity - started
+
+    def on_idle(self) -> None:
+        self._send_due_retries()
+        idle_timeout = self.config.get('IDLE_TIMEOUT', 30)
+        if self._connection is not None and \
+                time.monotonic() - self._last_activity >= idle_timeout:
+            self.close_connection()
+
+    def wait_timeout(self):
+        if self._retries:
+            due = self._retries[0][0] - time.monotonic()
+            return max(0.0, min(due, self.idle_interval))
+        return self.idle_interval
+
+    def flush(self) -> None:
+        """Block until every submitted message has been sent or given up on."""
+        super().flush()
+        while (self._scheduled and self._thread is not None
+               and self._thread.is_alive()):
+            time.sleep(0.01)
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        # One last attempt for the retries still waiting.
+        while self._retries:
+            _, _, attempt, message = heapq.heappop(self._retries)
+            self._send(message, attempt=None)
+            self._scheduled -= 1
+        self.close_connection()
+
+    def close_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                logger.debug('Closing the mail connection failed.', exc_info=True)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats.update({
+            'sent': self.sent,
+            'failed': self.failed,
+            'retries': self.retries,
+            'connections_opened': self.connections_opened,
+            'messages_per_second': (
+                self.sent / self.busy_seconds if self.busy_seconds else 0.0
+            ),
+        })
+        return stats
+
+    @property
+    def backend(self) -> str:
+        backend = self.config.get('BACKEND') or settings.EMAIL_BACKEND
+        if issubclass(import_string(backend), QueuedEmailBackend):
+            raise ImproperlyConfigured(
+                'MAIL_QUEUE["BACKEND"] has to name the backend delivering the '
+                'mail when EMAIL_BACKEND is QueuedEmailBackend.'
+            )
+        return backend
+
+    def _get_connection(self):
+        backend = self.backend
+        if self._connection is not None and self._connection_backend != backend:
+            self.close_connection()
+        if self._connection is None:
+            self._connection = get_connection(backend, fail_silently=False)
+            self._connection_backend = backend
+            # Opened here and kept open: `send_messages` only closes
+            # connections it opened itself.
+            self._connection.open()
+            self.connections_opened += 1
+        return self._connection
+
+    def _send(self, message: EmailMessage, attempt: int = 0) -> None:
+        """
+        Send `message` once and schedule a retry on a temporary failure;
+        `attempt=None` never schedules one.
+        """
+        reused = self._connection is not None
+        try:
+            sent = self._get_connection().send_messages([message])
+        except Exception as error:
+            # The connection may be half-broken, start over with a new one.
+            self.close_connection()
+            if reused and not _is_permanent(error):
+                # Most likely the server dropped an idle connection.
+                return self._send(message, attempt)
+            self._schedule_retry(message, attempt, error)
+            return
+        self.sent += sent or 0
+
+    def _schedule_retry(
+            self, message: EmailMessage, attempt, error: Exception
+    ) -> None:
+        max_retries = self.config.get('MAX_RETRIES', 5)
+        if attempt is None or attempt >= max_retries or _is_permanent(error):
+            self.failed += 1
+            logger.error('Giving up on mail to %s: %s', message.to, error,
+                         exc_info=(type(error), error, error.__traceback__))
+            return
+        backoff = self.config.get('BACKOFF', 1.0)
+        max_backoff = self.config.get('MAX_BACKOFF', 60.0)
+        delay = min(backoff * 2 ** attempt, max_backoff)
+        delay *= random.uniform(0.5, 1.0)
+        heapq.heappush(
+            self._retries,
+            (time.monotonic() + delay, next(self._order), attempt + 1, message)
+        )
+        self._scheduled += 1
+        self.retries += 1
+        logger.warning('Sending mail to %s failed, retry %d in %.1fs.',
+                       message.to, attempt + 1, delay)
+
+    def _send_due_retries(self) -> None:
+        now = time.monotonic()
+        while self._retries and self._retries[0][0] <= now:
+            _, _, attempt, message = heapq.heappop(self._retries)
+            try:
+                self._send(message, attempt)
+            finally:
+                self._scheduled -= 1
+
+
+def _is_permanent(error: Exception) -> bool:
+    """Whether retrying cannot help: a 5xx SMTP reply or a configuration error."""
+    if isinstance(error, ImproperlyConfigured):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+mail_queue = MailQueue()
+
+
+def queue_mail(message: EmailMessage) -> bool:
+    """Queue `message` for background delivery; `False` if the queue is full."""
+    return mail_queue.submit(message)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """
+    Email backend that hands messages to `mail_queue`.
+
+    Set `EMAIL_BACKEND` to this class and `MAIL_QUEUE['BACKEND']` to the
+    backend doing the delivery.
+    """
+
+    def send_messages(self, email_messages):
+        return sum(1 for message in email_messages if queue_mail(message))
@@ -0,0 +1,117 @@
+"""
+Outgoing SMS.
+
+Request code calls `send_sms`, which only queues the message. `SMSSender`
+hands queued messages to the transport named by the `SMS_TRANSPORT`
+setting in batches, from a background thread.
+
+A transport is any class with a `send_messages(messages)` method, the same
+shape as Django's email backends. `LocMemSMSTransport` keeps messages in
+`painless.services.sms.outbox` for tests.
+"""
+import logging
+import sys
+import threading
+from typing import (
+    List,
+    NamedTuple,
+    Optional
+)
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from .worker import BatchWorker
+
+logger = logging.getLogger(__name__)
+
+outbox: List['SMSMessage'] = list()
+
+
+class SMSMessage(NamedTuple):
+    to: str
+    body: str
+    from_number: Optional[str] = None
+
+
+class BaseSMSTransport:
+    """Base class for SMS transports."""
+
+    def send_messages(self, messages: List[SMSMessage]) -> int:
+        """Send `messages` and return the number sent."""
+        raise NotImplementedError('subclasses of BaseSMSTransport must provide '
+                                  'a send_messages() method')
+
+
+class ConsoleSMSTransport(BaseSMSTransport):
+    """Write messages to stdout instead of sending them."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def send_messages(self, messages: List[SMSMessage]) -> int:
+        with self._lock:
+            for message in messages:
+                self.stream.write(f'SMS from {message.from_number} to '
+                                  f'{message.to}: {message.body}\n')
+            self.stream.flush()
+        return len(messages)
+
+
+class LocMemSMSTransport(BaseSMSTransport):
+    """Append messages to the module-level `outbox`, for tests."""
+
+    def send_messages(self, messages: List[SMSMessage]) -> int:
+        outbox.extend(messages)
+        return len(messages)
+
+
+class SMSSender(BatchWorker):
+    """Deliver queued messages through the configured transport in batches."""
+    name = 'sms-sender'
+
+    def __init__(self, transport: BaseSMSTransport = None, **kwargs):
+        super().__init__(**kwargs)
+        self._transport = transport
+
+    @property
+    def transport(self) -> BaseSMSTransport:
+        if self._transport is not None:
+            return self._transport
+        return get_transport()
+
+    def process(self, batch: List[SMSMessage]) -> None:
+        sent = self.transport.send_messages(batch)
+        logger.debug('%d of %d SMS messages sent.', sent, len(batch))
+
+
+_transports = dict()
+
+
+def get_transport(path: str = None) -> BaseSMSTransport:
+    """
+    Return a shared instance of the transport class at `path`. Raises
+    `ImproperlyConfigured` when no transport is set, rather than falling
+    back to one that would print or drop the messages.
+    """
+    path = path or getattr(settings, 'SMS_TRANSPORT', None)
+    if not path:
+        raise ImproperlyConfigured('SMS_TRANSPORT is not set; name the '
+                                   'transport of the SMS provider.')
+    if path not in _transports:
+        _transports[path] = import_string(path)()
+    return _transports[path]
+
+
+sms_sender = SMSSender()
+
+
+def send_sms(to: str, body: str, from_number: str = None) -> bool:
+    """Queue a text message; return `False` if the queue is full."""
+    # Fails in the caller when no transport is set, not later in the sender
+    # thread.
+    sms_sender.transport
+    from_number = from_number or getattr(settings, 'SMS_FROM_NUMBER', None)
+    return sms_sender.submit(SMSMessage(to, body, from_number))
@@ -0,0 +1,235 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import (
+    connections,
+    transaction
+)
+from django.db.models.signals import (
+    class_prepared,
+    post_save
+)
+from django.dispatch import receiver
+from sorl.thumbnail import get_thumbnail
+
+from .worker import BatchWorker
+
+logger = logging.getLogger(__name__)
+
+WEBP = 'WEBP'
+
+
+class ThumbnailSpec(NamedTuple):
+    """
+    A thumbnail a model wants ready as soon as its picture is saved.
+
+    PARAMS
+    ------
+    name: str
+        key used by `get_thumbnail_url`.
+    geometry: str
+        sorl geometry, e.g. `'100x100'`.
+    crop: str
+        sorl crop option.
+    quality: int
+        encoder quality of the main variant.
+    format: str
+        format of the main variant, `None` uses `THUMBNAIL_FORMAT`.
+    webp_quality: int
+        quality of the extra WebP variant, `None` skips it.
+    """
+    name: str
+    geometry: str
+    crop: str = 'center'
+    quality: int = 85
+    format: Optional[str] = None
+    webp_quality: Optional[int] = 80
+
+    def variants(self) -> List[Tuple[str, int]]:
+        """`(format, quality)` pairs to render for this spec."""
+        main = self.format or getattr(settings, 'THUMBNAIL_FORMAT', 'JPEG')
+        variants = [(main, self.quality)]
+        if self.webp_quality is not None and main != WEBP:
+            variants.append((WEBP, self.webp_quality))
+        return variants
+
+    def render(self, picture, fmt: str, quality: int):
+        return get_thumbnail(picture, self.geometry, crop=self.crop,
+                             quality=quality, format=fmt)
+
+
+def get_config() -> dict:
+    return getattr(settings, 'THUMBNAIL_PIPELINE', dict())
+
+
+def manifest_key(instance) -> str:
+    """
+    Cache key of the manifest of `instance`.
+
+    The picture name is part of the key, so replacing the picture starts
+    from an empty manifest instead of serving stale thumbnails.
+    """
+    digest = hashlib.md5(instance.picture.name.encode()).hexdigest()
+    return f'thumbnail:{instance._meta.label_lower}:{instance.pk}:{digest}'
+
+
+def get_manifest_cache():
+    return caches[get_config().get('CACHE', 'default')]
+
+
+class ThumbnailPipeline(BatchWorker):
+    """
+    Renders the `thumbnail_specs` of saved pictures in the background.
+
+    Saving a model that declares `thumbnail_specs` queues it once the
+    transaction commits. Each batch is spread over a thread pool (Pillow
+    releases the GIL while decoding and encoding), and the URLs of every
+    variant are stored in one manifest per picture, so serving a
+    thumbnail is a single cache read.
+
+    Configured with the `THUMBNAIL_PIPELINE` setting:
+        ENABLED: bool
+            Render on save; when off, thumbnails are rendered on first use.
+        WORKERS: int
+            Size of the rendering thread pool.
+        CACHE: str
+            Cache alias holding the manifests.
+        TIMEOUT: int
+            Seconds a manifest is kept, `None` keeps it forever.
+    """
+    batch_size = 16
+    max_delay = 0.1
+    capacity = 1000
+    name = 'thumbnail-pipeline'
+
+    def __init__(self, *args, workers: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._workers = workers
+        self._executor = None
+
+    @property
+    def enabled(self) -> bool:
+        return get_config().get('ENABLED', False)
+
+    @property
+    def workers(self) -> int:
+        if self._workers is not None:
+            return self._workers
+        return get_config().get('WORKERS', 2)
+
+    def queue(self, instance) -> bool:
+        """Queue the declared thumbnails of `instance`."""
+        return self.submit(
+            (manifest_key(instance), instance.picture, instance.thumbnail_specs)
+        )
+
+    def process(self, batch) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix=self.name
+            )
+        # The same picture saved twice in a batch is rendered once.
+        unique = {job[0]: job for job in batch}
+        results = self._executor.map(self._render_job, unique.values())
+        for key, result in zip(unique, results):
+            if isinstance(result, Exception):
+                logger.error('Rendering thumbnails of %s failed: %s', key, result)
+
+    def _render_job(self, job):
+        try:
+            return self.render(*job)
+        except Exception as e:
+            return e
+        finally:
+            # Only closes the connections opened by this pool thread.
+            connections.close_all()
+
+    @staticmethod
+    def render(key: str, picture, specs) -> Dict[str, Dict[str, str]]:
+        """Render every variant of `specs` and store the manifest under `key`."""
+        manifest = dict()
+        for spec in specs:
+            manifest[spec.name] = {
+                fmt: spec.render(picture, fmt, quality).url
+                for fmt, quality in spec.variants()
+            }
+        get_manifest_cache().set(key, manifest, get_config().get('TIMEOUT'))
+        return manifest
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+thumbnail_pipeline = ThumbnailPipeline()
+
+
+def get_thumbnail_url(instance, name: str, fmt: str = None) -> Optional[str]:
+    """
+    URL of the `name` thumbnail of `instance`.
+
+    Looks the URL up in the manifest. When the pipeline has not rendered
+    it yet, the spec is rendered synchronously, the way sorl does on first
+    use, so a URL is always returned.
+
+    PARAMS
+    ------
+    instance: model instance
+        an instance whose model declares `thumbnail_specs`.
+    name: str
+        name of a `ThumbnailSpec` of the model.
+    fmt: str
+        `'WEBP'` for the WebP variant, `None` for the main one.
+    """
+    if not instance.picture:
+        return None
+    spec = next(
+        (spec for spec in instance.thumbnail_specs if spec.name == name), None
+    )
+    if spec is None:
+        raise KeyError(f'{instance._meta.label} has no thumbnail spec '
+                       f'named {name!r}.')
+    variants = dict(spec.variants())
+    fmt = fmt or spec.variants()[0][0]
+    if fmt not in variants:
+        raise KeyError(f'Thumbnail spec {name!r} has no {fmt} variant.')
+    manifest = get_manifest_cache().get(manifest_key(instance))
+    if manifest is not None and fmt in manifest.get(name, dict()):
+        return manifest[name][fmt]
+    return spec.render(instance.picture, fmt, variants[fmt]).url
+
+
+def queue_thumbnails(sender, instance, raw=False, **kwargs):
+    """
+    Queue the declared thumbnails of a saved picture, once the transaction
+    commits.
+    """
+    if raw or not instance.picture or not thumbnail_pipeline.enabled:
+        return
+    transaction.on_commit(lambda: thumbnail_pipeline.queue(instance))
+
+
+@receiver(class_prepared)
+def connect_thumbnail_specs(sender, **kwargs):
+    """
+    Connect `queue_thumbnails` to the `post_save` of every model, proxies
+    included, that declares `thumbnail_specs`, so saving other models does
+    not go through it.
+    """
+    if getattr(sender, 'thumbnail_specs', None):
+        uid = f'thumbnails-save-{sender._meta.label_lower}'
+        post_save.connect(queue_thumbnails, sender=sender, weak=False,
+                          dispatch_uid=uid)
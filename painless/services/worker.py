@@ -0,0 +1,160 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import (
+    Any,
+    List
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWorker:
+    """
+    Background thread that collects submitted items into batches.
+
+    `submit` only puts the item on a bounded in-memory queue and returns,
+    so request code never waits on the slow side (an SMS gateway, an SMTP
+    server, image encoding...). The worker thread waits for the first item,
+    keeps collecting for at most `max_delay` seconds or until `batch_size`
+    items are in hand, and passes the batch to `process`.
+
+    Subclasses implement `process(batch)`. The thread is started lazily in
+    every process that submits work and pending items are processed at
+    interpreter exit.
+
+    PARAMS
+    ------
+    batch_size: int
+        maximum items per `process` call.
+    max_delay: float
+        seconds to wait for a batch to fill up.
+    capacity: int
+        maximum items waiting; `submit` returns `False` beyond that.
+    """
+    batch_size = 100
+    max_delay = 0.5
+    capacity = 10000
+    # Seconds without work before `on_idle` is called, `None` never calls it.
+    idle_interval = None
+    name = 'batch-worker'
+
+    def __init__(self, batch_size: int = None, max_delay: float = None,
+                 capacity: int = None):
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if max_delay is not None:
+            self.max_delay = max_delay
+        if capacity is not None:
+            self.capacity = capacity
+        self.submitted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=self.capacity)
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def process(self, batch: List[Any]) -> None:
+        raise NotImplementedError('subclasses of BatchWorker must provide a '
+                                  'process() method')
+
+    def on_idle(self) -> None:
+        """
+        Called from the worker thread after `wait_timeout()` seconds without
+        work.
+        """
+
+    def wait_timeout(self):
+        """Seconds the worker waits for an item before calling `on_idle`."""
+        return self.idle_interval
+
+    def submit(self, item: Any) -> bool:
+        """Queue `item` for the worker; return `False` if the queue is full."""
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+            logger.warning('%s queue is full, dropping item.', self.name)
+            return False
+        self.submitted += 1
+        return True
+
+    def flush(self) -> None:
+        """Block until every submitted item has been processed."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def shutdown(self) -> None:
+        """Process what is pending and stop the thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+        self._pid = None
+
+    def stats(self) -> dict:
+        return {
+            'pending': self._queue.qsize(),
+            'submitted': self.submitted,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'batches': self.batches,
+        }
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _collect(self) -> List[Any]:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.wait_timeout())]
+                break
+            except queue.Empty:
+                self.on_idle()
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item in batch if item is not _STOP]
+            try:
+                if items:
+                    self.process(items)
+                    self.processed += len(items)
+                    self.batches += 1
+            except Exception:
+                logger.exception('%s failed to process a batch of %d items.',
+                                 self.name, len(items))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(items) != len(batch):
+                return
+
+
+_STOP = object()